@@ -19,6 +19,24 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     DB_VENDOR: str
+    DB_USE_POOLER: bool = False
+    DB_POOLER_MODE: str = "transaction"  # "transaction" or "session"
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_ECHO: bool = False
+    AUTOSAVE_FLUSH_INTERVAL: float = 2.0
+    AUTOSAVE_MAX_PENDING: int = 2000
+    SESSION_CACHE_URL: str | None = None  # redis:// URL; in-process cache when unset
+    SESSION_CACHE_TTL: int = 30
+    SESSION_SWEEPER_ENABLED: bool = True
+    SESSION_SWEEP_INTERVAL: float = 30.0
+    SESSION_SWEEP_BATCH_SIZE: int = 500
+    ADMISSION_RATE: float = 50.0  # exam starts admitted per second, per exam
+    ADMISSION_BURST: int = 100
+    ADMISSION_MAX_QUEUE: int = 1000
+    ADMISSION_MAX_WAIT: float = 10.0
 
     model_config = SettingsConfigDict(env_file=BASE_DIR / ".env")
 
@@ -0,0 +1,61 @@
+"""add exam, course-semester and student-semester score rollup tables
+
+Revision ID: 0b6d2c8e4f91
+Revises: f19b3e6a0c47
+Create Date: 2026-01-26 16:40:08.215734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6d2c8e4f91'
+down_revision: Union[str, Sequence[str], None] = 'f19b3e6a0c47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def rollup_columns():
+    return [
+        sa.Column('graded_count', sa.Integer(), nullable=False),
+        sa.Column('pass_count', sa.Integer(), nullable=False),
+        sa.Column('score_sum', sa.Float(), nullable=False),
+        sa.Column('score_sq_sum', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('exam_score_rollup',
+    sa.Column('exam_id', sa.UUID(), nullable=False),
+    *rollup_columns(),
+    sa.ForeignKeyConstraint(['exam_id'], ['exam.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('exam_id')
+    )
+    op.create_table('course_semester_score_rollup',
+    sa.Column('course_id', sa.UUID(), nullable=False),
+    sa.Column('semester_id', sa.UUID(), nullable=False),
+    *rollup_columns(),
+    sa.ForeignKeyConstraint(['course_id'], ['course.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['semester_id'], ['semester.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('course_id', 'semester_id')
+    )
+    op.create_table('student_semester_score_rollup',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('semester_id', sa.UUID(), nullable=False),
+    *rollup_columns(),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['semester_id'], ['semester.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'semester_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('student_semester_score_rollup')
+    op.drop_table('course_semester_score_rollup')
+    op.drop_table('exam_score_rollup')
@@ -0,0 +1,29 @@
+"""add per-program grading scale
+
+Revision ID: 3c8e5a1d7f20
+Revises: 0b6d2c8e4f91
+Create Date: 2026-01-28 11:05:42.903126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c8e5a1d7f20'
+down_revision: Union[str, Sequence[str], None] = '0b6d2c8e4f91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('program', sa.Column('grading_scale', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('program', 'grading_scale')
@@ -0,0 +1,48 @@
+"""make pagination sort keys not null
+
+Revision ID: 6f2d8b4a1c93
+Revises: 3c8e5a1d7f20
+Create Date: 2026-02-03 10:12:08.417265
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f2d8b4a1c93'
+down_revision: Union[str, Sequence[str], None] = '3c8e5a1d7f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# keyset pagination compares (column, id) row values, which never match a NULL column
+PAGINATION_KEYS = [
+    ('exam', 'created_at'),
+    ('submission', 'submitted_at'),
+    ('gradelog', 'graded_at'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column in PAGINATION_KEYS:
+        op.execute(f"UPDATE {table} SET {column} = now() WHERE {column} IS NULL")
+        op.alter_column(
+            table, column,
+            existing_type=sa.TIMESTAMP(),
+            existing_server_default=sa.text('now()'),
+            nullable=False,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in PAGINATION_KEYS:
+        op.alter_column(
+            table, column,
+            existing_type=sa.TIMESTAMP(),
+            existing_server_default=sa.text('now()'),
+            nullable=True,
+        )
@@ -0,0 +1,52 @@
+"""backfill score rollups from existing grades
+
+Revision ID: 9d41e7b2c5a8
+Revises: 6f2d8b4a1c93
+Create Date: 2026-02-05 09:41:17.552803
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d41e7b2c5a8'
+down_revision: Union[str, Sequence[str], None] = '6f2d8b4a1c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# same aggregation as AnalyticsRollupService.rebuild, written out so it does not drift with the models
+ROLLUP_KEYS = {
+    'exam_score_rollup': {'exam_id': 'e.id'},
+    'course_semester_score_rollup': {'course_id': 'e.course_id', 'semester_id': 'e.semester_id'},
+    'student_semester_score_rollup': {'user_id': 's.user_id', 'semester_id': 'e.semester_id'},
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("LOCK TABLE gradelog IN SHARE MODE")
+    for table, keys in ROLLUP_KEYS.items():
+        columns = ', '.join(keys.values())
+        op.execute(f"DELETE FROM {table}")
+        op.execute(f"""
+            INSERT INTO {table} ({', '.join(keys)}, graded_count, pass_count, score_sum, score_sq_sum)
+            SELECT {columns},
+                   count(g.score),
+                   count(g.score) FILTER (WHERE g.score >= coalesce(e.pass_mark, 40.0)),
+                   sum(g.score),
+                   sum(g.score * g.score)
+            FROM gradelog g
+            JOIN submission s ON g.submission_id = s.id
+            JOIN exam e ON s.exam_id = e.id
+            WHERE {' AND '.join(f'{column} IS NOT NULL' for column in keys.values())}
+            GROUP BY {columns}
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # the rollups are derived data; leaving them populated is harmless
+    pass
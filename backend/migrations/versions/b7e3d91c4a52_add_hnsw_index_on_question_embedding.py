@@ -0,0 +1,35 @@
+"""add HNSW index on question.embedding
+
+Revision ID: b7e3d91c4a52
+Revises: a1c4e2f7b9d3
+Create Date: 2026-01-12 09:41:07.218334
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3d91c4a52'
+down_revision: Union[str, Sequence[str], None] = 'a1c4e2f7b9d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    # built concurrently so the question bank stays writable during the build
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_question_embedding_ann "
+            "ON question USING hnsw (embedding vector_l2_ops) WITH (m = 16, ef_construction = 64)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_question_embedding_ann")
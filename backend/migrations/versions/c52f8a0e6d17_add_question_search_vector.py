@@ -0,0 +1,53 @@
+"""add question.search_vector with GIN index and maintenance trigger
+
+Revision ID: c52f8a0e6d17
+Revises: b7e3d91c4a52
+Create Date: 2026-01-15 14:03:52.660180
+
+"""
+from typing import Sequence, Union
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c52f8a0e6d17'
+down_revision: Union[str, Sequence[str], None] = 'b7e3d91c4a52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # nullable and filled by trigger, so adding it does not rewrite the table;
+    # existing rows are filled by `python -m src.db.backfill_search_vector`
+    op.add_column('question', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.execute("""
+        CREATE OR REPLACE FUNCTION question_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := to_tsvector('english', coalesce(NEW.text, ''));
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER question_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF text ON question
+        FOR EACH ROW EXECUTE FUNCTION question_search_vector_update()
+    """)
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_question_search_vector "
+            "ON question USING gin (search_vector)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_question_search_vector")
+    op.execute("DROP TRIGGER IF EXISTS question_search_vector_trigger ON question")
+    op.execute("DROP FUNCTION IF EXISTS question_search_vector_update()")
+    op.drop_column('question', 'search_vector')
@@ -0,0 +1,35 @@
+"""add GIN jsonb_path_ops index on question.tags
+
+Revision ID: d83a1f5b2c64
+Revises: c52f8a0e6d17
+Create Date: 2026-01-19 11:26:44.015903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd83a1f5b2c64'
+down_revision: Union[str, Sequence[str], None] = 'c52f8a0e6d17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # jsonb_path_ops only serves @> but is smaller and faster than jsonb_ops,
+    # and containment is the only operator the tag filters use
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_question_tags "
+            "ON question USING gin (tags jsonb_path_ops)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_question_tags")
@@ -0,0 +1,33 @@
+"""add (status, ends_at) index on candidate_exam_session
+
+Revision ID: e4a7c9d2f815
+Revises: d83a1f5b2c64
+Create Date: 2026-01-21 09:12:37.441208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c9d2f815'
+down_revision: Union[str, Sequence[str], None] = 'd83a1f5b2c64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_candidate_exam_session_status_ends_at "
+            "ON candidate_exam_session (status, ends_at)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_candidate_exam_session_status_ends_at")
@@ -0,0 +1,46 @@
+"""add indexes for hot foreign key lookups
+
+Revision ID: f19b3e6a0c47
+Revises: e4a7c9d2f815
+Create Date: 2026-01-22 14:03:51.672930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f19b3e6a0c47'
+down_revision: Union[str, Sequence[str], None] = 'e4a7c9d2f815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ("ix_submission_exam_id_submitted_at", "submission (exam_id, submitted_at, id)", False),
+    ("ix_submission_user_id", "submission (user_id)", False),
+    ("ix_submission_candidate_session_id", "submission (candidate_session_id)", True),
+    ("ix_submission_answer_question_id", "submission_answer (question_id)", False),
+    ("ix_question_exam_id", "question (exam_id)", False),
+    ("ix_candidate_exam_session_exam_id_candidate_ref", "candidate_exam_session (exam_id, candidate_ref)", False),
+    # one-to-one with submission; fails if duplicate grade logs already exist
+    ("ix_gradelog_submission_id", "gradelog (submission_id)", True),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, target, unique in INDEXES:
+            op.execute(
+                f"CREATE {'UNIQUE ' if unique else ''}INDEX CONCURRENTLY IF NOT EXISTS {name} ON {target}"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
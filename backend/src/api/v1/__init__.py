@@ -1,7 +1,11 @@
 from src.api.v1.auth import AuthRouter
 from src.api.v1.user import UserRouter
+from src.api.v1.candidate_exam import CandidateExamRouter
 from src.api.v1.submission import SubmissionRouter
 from src.api.v1.search import SearchRouter
 from src.api.v1.question import QuestionRouter
 from src.api.v1.storage import StorageRouter
-from src.api.v1.exam import ExamRouter
\ No newline at end of file
+from src.api.v1.exam import ExamRouter
+from src.api.v1.semester import SemesterRouter
+from src.api.v1.answer import AnswerRouter
+from src.api.v1.gradelog import GradeLogRouter
@@ -0,0 +1,37 @@
+import logging
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from src.db.database import get_db
+from src.schemas.answer import AnswerRead
+from src.schemas.pagination import CursorPage
+from src.services.answer import AnswerService
+from src.utils.exceptions import ValidationError
+
+class AnswerRouter:
+    def __init__(self):
+        self.logger = logging.getLogger("Answer Router")
+        self.router = APIRouter(prefix="/api/v1/answer", tags=["Answer"])
+
+        self.router.add_api_route(
+            "/all",
+            self.list_answers,
+            methods=["GET"],
+            response_model=CursorPage[AnswerRead],
+            status_code=status.HTTP_200_OK
+        )
+
+    def list_answers(
+            self, limit: int = Query(25, ge=1, le=200), cursor: Optional[str] = None,
+            db: Session = Depends(get_db)
+    ):
+        try:
+            return AnswerService(db).list_answers(limit, cursor)
+        except ValidationError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except Exception as e:
+            self.logger.error(f"Failed to list answers: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal server error"
+            )
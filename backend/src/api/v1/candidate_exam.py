@@ -1,11 +1,15 @@
+import math
 import logging
 from uuid import UUID
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from src.db.database import get_db
-from src.services.candidate_exam import CandidateExamService
-from src.utils.exceptions import NotFoundError, ServiceError
+from fastapi import APIRouter, Depends, HTTPException, Header, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.db.async_database import get_async_db
+from src.dependencies.candidate_session import get_current_candidate_session
+from src.services.admission import admission
+from src.services.candidate_exam import AsyncCandidateExamService
+from src.services.session_state import SessionState
+from src.utils.exceptions import AdmissionRejected, NotFoundError, ServiceError, ValidationError
 from src.schemas.candidate_exam import (
     EnterExamRequest,
     StartExamRequest,
@@ -59,53 +63,78 @@ class CandidateExamRouter:
             status_code=status.HTTP_204_NO_CONTENT,
         )
 
-    def enter_exam(
+    @staticmethod
+    def _check_session(state: SessionState, session_id: UUID):
+        if state.session_id != session_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Token does not belong to this exam session",
+            )
+
+    @staticmethod
+    def _too_many_requests(e: AdmissionRejected):
+        retry_after = max(1, math.ceil(e.retry_after))
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={"message": str(e), "queue_position": e.position, "retry_after": retry_after},
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    async def enter_exam(
         self,
         payload: EnterExamRequest,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
     ):
         try:
-            service = CandidateExamService(db, self.logger)
-            exam = service.enter_exam(payload.exam_code)
-
-            return {
-                "exam_id": exam.id,
-                "title": exam.title,
-                "duration_minutes": exam.duration_minutes,
-            }
+            await admission.admit(("enter", payload.exam_code))
+            service = AsyncCandidateExamService(db, self.logger)
+            return await service.enter_exam(payload.exam_code)
 
+        except AdmissionRejected as e:
+            raise self._too_many_requests(e)
         except ServiceError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=str(e),
             )
 
-    def start_exam(
+    async def start_exam(
         self,
         payload: StartExamRequest,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
     ):
         try:
-            service = CandidateExamService(db, self.logger)
-            return service.start_exam(
+            await admission.admit(("start", payload.exam_id))
+            service = AsyncCandidateExamService(db, self.logger)
+            return await service.start_exam(
                 exam_id=payload.exam_id,
                 candidate_name=payload.candidate_name,
             )
 
+        except AdmissionRejected as e:
+            raise self._too_many_requests(e)
         except ServiceError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=str(e),
             )
 
-    def get_questions(
+    async def get_questions(
         self,
         session_id: UUID,
-        db: Session = Depends(get_db),
+        if_none_match: str | None = Header(None),
+        state: SessionState = Depends(get_current_candidate_session),
+        db: AsyncSession = Depends(get_async_db),
     ):
+        self._check_session(state, session_id)
         try:
-            service = CandidateExamService(db, self.logger)
-            return service.get_questions(session_id)
+            service = AsyncCandidateExamService(db, self.logger)
+            paper = await service.get_paper(state)
+
+            headers = {"ETag": paper.etag, "Cache-Control": "private, no-cache"}
+            if if_none_match == paper.etag:
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+            return Response(content=paper.body, media_type="application/json", headers=headers)
 
         except NotFoundError as e:
             raise HTTPException(
@@ -118,38 +147,52 @@ class CandidateExamRouter:
                 detail=str(e),
             )
 
-    def autosave(
+    async def autosave(
         self,
-        question_id: UUID,
-        answer: str,
-        session: ExamSession = Depends(get_active_session),
-        db: Session = Depends(get_db),
+        session_id: UUID,
+        payload: AutosaveRequest,
+        state: SessionState = Depends(get_current_candidate_session),
+        db: AsyncSession = Depends(get_async_db),
     ):
+        self._check_session(state, session_id)
         try:
-            service = CandidateExamService(db)
-            service.upsert_submission_answer(
-                submission_id=session.submission_id,
-                question_id=question_id,
-                answer_text=answer,
-            )
-            return {"status": "saved"}
+            service = AsyncCandidateExamService(db, self.logger)
+            await service.autosave(state, payload.answers)
+            return None  # 204
 
+        except NotFoundError as e:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=str(e),
+            )
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e),
+            )
         except ServiceError as e:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=str(e),
             )
 
-    def submit_exam(
+    async def submit_exam(
         self,
         session_id: UUID,
-        db: Session = Depends(get_db),
+        state: SessionState = Depends(get_current_candidate_session),
+        db: AsyncSession = Depends(get_async_db),
     ):
+        self._check_session(state, session_id)
         try:
-            service = CandidateExamService(db, self.logger)
-            service.submit_exam(session_id)
+            service = AsyncCandidateExamService(db, self.logger)
+            await service.submit_exam(state)
             return None  # 204
 
+        except NotFoundError as e:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=str(e),
+            )
         except ServiceError as e:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
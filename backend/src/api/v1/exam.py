@@ -1,15 +1,21 @@
 import logging
-from typing import List
+from typing import List, Optional
 from sqlalchemy.orm import Session
 from src.db.database import get_db
+from src.dependencies.candidate_session import get_current_candidate_session
 from uuid import UUID
 from src.schemas.question import QuestionRead
 from src.schemas.candidate_exam import CandidateExamSessionRead
-from src.schemas.exam import ExamCreate, ExamBase, ExamStatsRead, ExamUpdate, ExamRead, ExamResultsRead
+from src.schemas.exam import ExamCreate, ExamBase, ExamStatsRead, ExamSummaryRead, ExamUpdate, ItemAnalysisRead, ExamRead, ExamResultsRead
 from src.services.exam import ExamService
 from src.services.analytics import AnalyticsService
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import JSONResponse
+from src.services.analytics_rollup import AnalyticsRollupService
+from src.services.item_analysis import ItemAnalysisService
+from src.services.grade_export import EXPORT_FORMATS, GradeExportService, stream_export
+from src.schemas.pagination import CursorPage
+from src.utils.exceptions import NotFoundError, ValidationError
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 
 class ExamRouter:
     def __init__(self):
@@ -23,6 +29,13 @@ class ExamRouter:
             response_model=ExamRead,
             status_code=status.HTTP_201_CREATED
         )
+        self.router.add_api_route(
+            "/all",
+            self.list_exams,
+            methods=["GET"],
+            response_model=CursorPage[ExamRead],
+            status_code=status.HTTP_200_OK
+        )
         self.router.add_api_route(
             "/{id}",
             self.get_exam_by_id,
@@ -96,6 +109,26 @@ class ExamRouter:
             response_model=ExamStatsRead,
             status_code=status.HTTP_200_OK
         )
+        self.router.add_api_route(
+            "/{exam_id}/summary",
+            self.get_exam_summary,
+            methods=["GET"],
+            response_model=ExamSummaryRead,
+            status_code=status.HTTP_200_OK
+        )
+        self.router.add_api_route(
+            "/{exam_id}/item-analysis",
+            self.get_item_analysis,
+            methods=["GET"],
+            response_model=ItemAnalysisRead,
+            status_code=status.HTTP_200_OK
+        )
+        self.router.add_api_route(
+            "/{exam_id}/grades/export",
+            self.export_grades,
+            methods=["GET"],
+            status_code=status.HTTP_200_OK
+        )
         self.router.add_api_route(
             "{exam_id}/results/{user_id}",
             self.get_exam_results,
@@ -143,6 +176,22 @@ class ExamRouter:
                 detail="Internal server error"
             )
 
+    def list_exams(
+            self, title: Optional[str] = None, limit: int = Query(50, ge=1, le=200),
+            cursor: Optional[str] = None, db: Session = Depends(get_db)
+    ):
+        try:
+            service = ExamService(db)
+            return service.list_exams(title=title, limit=limit, cursor=cursor)
+        except ValidationError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except Exception as e:
+            self.logger.error(f"Failed to list exams: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal server error"
+            )
+
     def get_exams_by_author(self, instructor_id: UUID, db: Session=Depends(get_db)):
         try:
             service = ExamService(db)
@@ -188,8 +237,11 @@ class ExamRouter:
             service = ExamService(db)
             updated_exam = service.update_exam(
                 exam_id=exam_id,
-                subject=exam_data.subject,
-                title=exam_data.title
+                title=exam_data.title,
+                duration=exam_data.duration,
+                pass_mark=exam_data.pass_mark,
+                course_id=exam_data.course_id,
+                semester_id=exam_data.semester_id
             )
 
             if not updated_exam:
@@ -317,6 +369,8 @@ class ExamRouter:
             service = AnalyticsService(db)
             stats = service.exam_statistics(exam_id)
             return stats
+        except NotFoundError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
         except HTTPException:
             raise
         except Exception as e:
@@ -326,6 +380,52 @@ class ExamRouter:
                 detail="Internal server error"
             )
 
+    def get_exam_summary(self, exam_id: UUID, db: Session=Depends(get_db)):
+        try:
+            return AnalyticsRollupService(db).exam_summary(exam_id)
+        except NotFoundError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except Exception as e:
+            self.logger.error(f"Failed to get summary for exam {exam_id}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal server error"
+            )
+
+    def get_item_analysis(self, exam_id: UUID, db: Session=Depends(get_db)):
+        try:
+            return ItemAnalysisService(db).exam_item_analysis(exam_id)
+        except NotFoundError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except Exception as e:
+            self.logger.error(f"Failed to get item analysis for exam {exam_id}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal server error"
+            )
+
+    def export_grades(
+            self, exam_id: UUID, format: str = Query("csv", pattern="^(csv|parquet)$"),
+            db: Session = Depends(get_db)
+    ):
+        try:
+            statement = GradeExportService(db).export_statement(exam_id=exam_id, fmt=format)
+        except NotFoundError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except ValidationError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except Exception as e:
+            self.logger.error(f"Failed to export grades for exam {exam_id}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal server error"
+            )
+        return StreamingResponse(
+            stream_export(statement, format),
+            media_type=EXPORT_FORMATS[format],
+            headers={"Content-Disposition": f'attachment; filename="grades-{exam_id}.{format}"'},
+        )
+
     def get_exam_results(self, exam_id: UUID, student_id: UUID, db: Session=Depends(get_db)):
         try:
             service = AnalyticsService(db)
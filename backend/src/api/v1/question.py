@@ -1,13 +1,17 @@
 import logging
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, status, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 from src.db.database import get_db
-from src.services.question import QuestionService
+from src.services.question import QuestionService, AsyncQuestionService
+from src.db.async_database import get_async_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.schemas.pagination import CursorPage
+from src.utils.exceptions import ValidationError
 from src.schemas.question import (
     QuestionCreate, QuestionRead, QuestionUpdate, TagRequest,
-    BulkQuestionCreate, BulkQuestionResponse, QuestionSearchRequest
+    BulkQuestionCreate, BulkQuestionResponse, QuestionSearchRequest, TagFacet
 )
 
 class QuestionRouter:
@@ -36,6 +40,25 @@ class QuestionRouter:
             response_model=List[QuestionRead],
             status_code=status.HTTP_200_OK
         )
+        self.router.add_api_route(
+            "/all/",
+            self.list_questions,
+            methods=["GET"],
+            response_model=CursorPage[QuestionRead]
+        )
+        self.router.add_api_route(
+            "/tags/",
+            self.get_questions_by_tags,
+            methods=["POST"],
+            response_model=List[QuestionRead]
+        )
+        self.router.add_api_route(
+            "/tags/facets/",
+            self.get_tag_facets,
+            methods=["GET"],
+            response_model=List[TagFacet]
+        )
+        # registered last so "all" and "tags" are not parsed as a question id
         self.router.add_api_route(
             "/{question_id}/",
             self.get_question_by_id,
@@ -54,18 +77,6 @@ class QuestionRouter:
             methods=["DELETE"],
             response_model=dict
         )
-        self.router.add_api_route(
-            "/all/",
-            self.list_questions,
-            methods=["GET"],
-            response_model=List[QuestionRead]
-        )
-        self.router.add_api_route(
-            "/tags/",
-            self.get_questions_by_tags,
-            methods=["POST"],
-            response_model=List[QuestionRead]
-        )
 
     def create_question(self, payload: QuestionCreate, db: Session = Depends(get_db)):
         service = QuestionService(db)
@@ -84,14 +95,15 @@ class QuestionRouter:
             self.logger.error(f"Bulk store failed: {e}")
             raise HTTPException(status_code=500, detail="Internal server error")
 
-    def hybrid_search(self, payload: QuestionSearchRequest, db: Session = Depends(get_db)):
-        service = QuestionService(db)
+    async def hybrid_search(self, payload: QuestionSearchRequest, db: AsyncSession = Depends(get_async_db)):
+        service = AsyncQuestionService(db)
         try:
-            results = service.hybrid_search(
+            results = await service.hybrid_search(
                 query=payload.query,
                 difficulty=payload.difficulty,
                 tags=payload.tags,
-                top_n=payload.top_n
+                top_n=payload.top_n,
+                recall=payload.recall
             )
             return results
         except Exception as e:
@@ -134,10 +146,15 @@ class QuestionRouter:
             self.logger.error(f"Failed to delete question {question_id}: {e}")
             raise HTTPException(status_code=500, detail="Internal server error")
 
-    def list_questions(self, db: Session = Depends(get_db)):
+    def list_questions(
+            self, limit: int = Query(50, ge=1, le=200), cursor: Optional[str] = None,
+            db: Session = Depends(get_db)
+    ):
         service = QuestionService(db)
         try:
-            return service.list_questions(limit=50)
+            return service.list_questions(limit=limit, cursor=cursor)
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
             self.logger.error(f"Failed to list questions: {e}")
             raise HTTPException(status_code=500, detail="Internal server error")
@@ -149,3 +166,14 @@ class QuestionRouter:
         except Exception as e:
             self.logger.error(f"Failed to get questions by tags: {e}")
             raise HTTPException(status_code=500, detail="Internal server error")
+
+    def get_tag_facets(
+            self, tags: Optional[List[str]] = Query(None), difficulty: Optional[str] = None,
+            db: Session = Depends(get_db)
+    ):
+        service = QuestionService(db)
+        try:
+            return service.tag_facets(tags=tags, difficulty=difficulty)
+        except Exception as e:
+            self.logger.error(f"Failed to count tag facets: {e}")
+            raise HTTPException(status_code=500, detail="Internal server error")
@@ -1,12 +1,13 @@
 import logging
-from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends
-from src.db.database import get_db
-from src.services.question import QuestionService
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException
+from src.db.async_database import get_async_db
+from src.services.question import AsyncQuestionService
 from src.schemas.search import SearchResponse, SearchRequest
+from src.utils.exceptions import ServiceError
 
 class SearchRouter:
-    def __init__(self, db_session: Session = Depends(get_db)):
+    def __init__(self):
         self.router = APIRouter()
         self.logger = logging.getLogger("Search Router")
         self.router.add_api_route(
@@ -27,17 +28,26 @@ class SearchRouter:
             response_model=list[SearchResponse],
             methods=["GET"]
         )
-        self.db = db_session
-        self.question_service = QuestionService(self.db)
 
-    def search_questions_semantically(self, payload: SearchRequest):
+    async def search_questions_semantically(self, payload: SearchRequest, db: AsyncSession = Depends(get_async_db)):
         self.logger.info(f"Semantic search for: {payload.query}")
-        return self.question_service.semantic_search(payload.query, payload.top_n)
+        try:
+            return await AsyncQuestionService(db).semantic_search(payload.query, payload.top_n, payload.recall)
+        except ServiceError as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
-    def search_questions_by_keyword(self, payload: SearchRequest):
+    async def search_questions_by_keyword(self, payload: SearchRequest, db: AsyncSession = Depends(get_async_db)):
         self.logger.info(f"Keyword search for: {payload.query}")
-        return self.question_service.keyword_search(payload.query, payload.tags, payload.difficulty)
+        try:
+            return await AsyncQuestionService(db).keyword_search(payload.query, payload.difficulty, payload.tags)
+        except ServiceError as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
-    def hybrid_search(self, payload: SearchRequest):
+    async def hybrid_search(self, payload: SearchRequest, db: AsyncSession = Depends(get_async_db)):
         self.logger.info(f"Hybrid search for: {payload.query}")
-        return self.question_service.hybrid_search(payload.query, payload.difficulty, payload.tags, payload.top_n)
+        try:
+            return await AsyncQuestionService(db).hybrid_search(
+                payload.query, payload.difficulty, payload.tags, payload.top_n, payload.recall
+            )
+        except ServiceError as e:
+            raise HTTPException(status_code=500, detail=str(e))
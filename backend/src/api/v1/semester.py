@@ -1,12 +1,15 @@
 import logging
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from src.db.database import get_db
 from src.schemas.semester import SemesterCreate, SemesterUpdate, SemesterRead, SemesterBase
 from src.services.semester import SemesterService
+from src.services.grade_export import EXPORT_FORMATS, GradeExportService, stream_export
+from src.schemas.pagination import CursorPage
+from src.utils.exceptions import NotFoundError, ValidationError
 
 class SemesterRouter:
     def __init__(self):
@@ -20,18 +23,19 @@ class SemesterRouter:
             response_model=SemesterRead,
             status_code=status.HTTP_201_CREATED
         )
+        # registered before "/{semester_id}" so "all" is not parsed as an id
         self.router.add_api_route(
-            "/{semester_id}",
-            self.get_semester_by_id,
+            "/all",
+            self.list_semesters,
             methods=["GET"],
-            response_model=SemesterRead,
+            response_model=CursorPage[SemesterRead],
             status_code=status.HTTP_200_OK
         )
         self.router.add_api_route(
-            "/all",
-            self.list_semesters,
+            "/{semester_id}",
+            self.get_semester_by_id,
             methods=["GET"],
-            response_model=List[SemesterBase],
+            response_model=SemesterRead,
             status_code=status.HTTP_200_OK
         )
         self.router.add_api_route(
@@ -47,6 +51,12 @@ class SemesterRouter:
             methods=["DELETE"],
             status_code=status.HTTP_204_NO_CONTENT
         )
+        self.router.add_api_route(
+            "/{semester_id}/grades/export",
+            self.export_grades,
+            methods=["GET"],
+            status_code=status.HTTP_200_OK
+        )
 
 
     def create_semester(self, semester_data: SemesterCreate, db: Session = Depends(get_db)):
@@ -83,14 +93,18 @@ class SemesterRouter:
                 detail="Internal server error"
             )
 
-    def list_semesters(self, db: Session = Depends(get_db)):
+    def list_semesters(
+            self, name: Optional[str] = None, limit: int = Query(50, ge=1, le=200),
+            cursor: Optional[str] = None, db: Session = Depends(get_db)
+    ):
         try:
             service = SemesterService(db)
-            semesters = service.list_semesters()
-
-            if semesters is None:
-                return []
-            return semesters
+            return service.list_semesters(name=name, limit=limit, cursor=cursor)
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
         except Exception as e:
             self.logger.error(f"Failed to list semesters: {e}")
             raise HTTPException(
@@ -142,3 +156,25 @@ class SemesterRouter:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Internal server error"
             )
+
+    def export_grades(
+            self, semester_id: UUID, format: str = Query("csv", pattern="^(csv|parquet)$"),
+            db: Session = Depends(get_db)
+    ):
+        try:
+            statement = GradeExportService(db).export_statement(semester_id=semester_id, fmt=format)
+        except NotFoundError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except ValidationError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except Exception as e:
+            self.logger.error(f"Failed to export grades for semester {semester_id}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal server error"
+            )
+        return StreamingResponse(
+            stream_export(statement, format),
+            media_type=EXPORT_FORMATS[format],
+            headers={"Content-Disposition": f'attachment; filename="grades-{semester_id}.{format}"'},
+        )
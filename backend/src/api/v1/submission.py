@@ -1,13 +1,17 @@
 import logging
 from fastapi import APIRouter, Depends, status, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 from src.db.database import get_db
 from src.services.submission import SubmissionService
+from src.schemas.pagination import CursorPage
+from src.utils.exceptions import NotFoundError, ValidationError
 from src.schemas.submission import (
     CreateSubmissionRequest,
     AddAnswerRequest,
+    BulkAnswerRequest,
+    BulkAnswerResponse,
     SubmissionResponse,
     BasicSubmissionResponse,
     DetailedSubmissionResponse,
@@ -32,6 +36,13 @@ class SubmissionRouter:
             response_model=dict,
             status_code=status.HTTP_200_OK,
         )
+        self.router.add_api_route(
+            "/{submission_id}/answers/bulk",
+            self.add_answers,
+            methods=["POST"],
+            response_model=BulkAnswerResponse,
+            status_code=status.HTTP_200_OK,
+        )
         self.router.add_api_route(
             "/{submission_id}",
             self.get_submission,
@@ -42,13 +53,13 @@ class SubmissionRouter:
             "/exam/{exam_id}/basic",
             self.list_exam_submissions_basic,
             methods=["GET"],
-            response_model=list[BasicSubmissionResponse],
+            response_model=CursorPage[BasicSubmissionResponse],
         )
         self.router.add_api_route(
             "/exam/{exam_id}/detailed",
             self.list_exam_submissions_detailed,
             methods=["GET"],
-            response_model=list[DetailedSubmissionResponse],
+            response_model=CursorPage[DetailedSubmissionResponse],
         )
 
     def create_submission(self, payload: CreateSubmissionRequest, db: Session = Depends(get_db)):
@@ -75,6 +86,21 @@ class SubmissionRouter:
             self.logger.error(f"Failed to add answer: {e}")
             raise HTTPException(status_code=500, detail="Internal server error")
 
+    def add_answers(self, submission_id: UUID, payload: BulkAnswerRequest, db: Session = Depends(get_db)):
+        service = SubmissionService(db)
+        try:
+            saved = service.add_answers(
+                submission_id, [(item.question_id, item.answer_text) for item in payload.answers]
+            )
+            return {"submission_id": submission_id, "saved": saved}
+        except NotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            self.logger.error(f"Failed to add answers to submission {submission_id}: {e}")
+            raise HTTPException(status_code=500, detail="Internal server error")
+
     def get_submission(self, submission_id: UUID, db: Session = Depends(get_db)):
         service = SubmissionService(db)
         try:
@@ -85,23 +111,27 @@ class SubmissionRouter:
             raise HTTPException(status_code=500, detail="Internal server error")
 
     def list_exam_submissions_basic(
-            self, exam_id: UUID, limit: int = Query(25, ge=1), offset: int = Query(0, ge=0),
+            self, exam_id: UUID, limit: int = Query(25, ge=1, le=200), cursor: Optional[str] = None,
             db: Session = Depends(get_db)
     ):
         service = SubmissionService(db)
         try:
-            return service.list_exam_submissions_basic(exam_id, limit, offset)
+            return service.list_exam_submissions_basic(exam_id, limit, cursor)
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
             self.logger.error(f"Failed to fetch basic submissions: {e}")
             raise HTTPException(status_code=500, detail="Internal server error")
 
     def list_exam_submissions_detailed(
-            self, exam_id: UUID, limit: int = Query(25, ge=1), offset: int = Query(0, ge=0),
+            self, exam_id: UUID, limit: int = Query(25, ge=1, le=200), cursor: Optional[str] = None,
             db: Session = Depends(get_db)
     ):
         service = SubmissionService(db)
         try:
-            return service.list_exam_submissions_detailed(exam_id, limit, offset)
+            return service.list_exam_submissions_detailed(exam_id, limit, cursor)
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
             self.logger.error(f"Failed to fetch detailed submissions: {e}")
             raise HTTPException(status_code=500, detail="Internal server error")
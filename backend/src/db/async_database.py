@@ -0,0 +1,12 @@
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from src.db.base import create_async_db_engine
+
+async_engine = create_async_db_engine()
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
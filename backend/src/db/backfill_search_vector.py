@@ -0,0 +1,45 @@
+import logging
+import argparse
+from sqlalchemy import text
+from src.db.database import SessionLocal
+
+logger = logging.getLogger("Search Vector Backfill")
+
+BACKFILL_BATCH = text("""
+    UPDATE question
+    SET search_vector = to_tsvector('english', coalesce(text, ''))
+    WHERE id IN (
+        SELECT id FROM question
+        WHERE search_vector IS NULL
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+""")
+
+def backfill_search_vector(batch_size: int = 5000) -> int:
+    """Fill question.search_vector for rows written before the trigger existed.
+
+    Works in short committed batches so it can run against a live database.
+    """
+    total = 0
+    db = SessionLocal()
+    try:
+        while True:
+            updated = db.execute(BACKFILL_BATCH, {"batch_size": batch_size}).rowcount
+            db.commit()
+            total += updated
+            if not updated:
+                break
+            logger.info(f"Backfilled {total} question search vectors")
+        return total
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill question.search_vector")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+    print(f"Backfilled {backfill_search_vector(args.batch_size)} rows")
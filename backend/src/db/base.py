@@ -1,7 +1,69 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import declarative_base
 import sys, os
 from config import settings
 
 Base = declarative_base()
-engine = create_engine(settings.DATABASE_URL, echo=True)
+
+def database_url(use_pooler: bool | None = None) -> str:
+    if use_pooler is None:
+        use_pooler = settings.DB_USE_POOLER
+    return settings.DATABASE_POOLER_URL if use_pooler else settings.DATABASE_URL
+
+def engine_options(url: str, use_pooler: bool | None = None) -> dict:
+    if use_pooler is None:
+        use_pooler = settings.DB_USE_POOLER
+    driver = make_url(url).drivername
+    options = {"echo": settings.DB_ECHO}
+
+    if driver.startswith("sqlite"):
+        return options
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+    )
+
+    # A transaction pooler hands each transaction to any backend, so named
+    # prepared statements created on one connection are missing on the next.
+    if use_pooler and settings.DB_POOLER_MODE == "transaction":
+        if driver == "postgresql+psycopg":
+            options["connect_args"] = {"prepare_threshold": None}
+        elif driver == "postgresql+asyncpg":
+            options["connect_args"] = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+    return options
+
+def create_db_engine(use_pooler: bool | None = None):
+    url = database_url(use_pooler)
+    return create_engine(url, **engine_options(url, use_pooler))
+
+def async_database_url(url: str) -> tuple[str, dict]:
+    """Rewrite a sync URL for its async driver; returns (url, extra connect_args)."""
+    parsed = make_url(url)
+    connect_args = {}
+    if parsed.drivername.startswith("postgresql"):
+        # asyncpg rejects libpq's sslmode query parameter; it takes ssl= instead
+        sslmode = parsed.query.get("sslmode")
+        if sslmode:
+            parsed = parsed.difference_update_query(["sslmode"])
+            if sslmode != "disable":
+                connect_args["ssl"] = sslmode
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    elif parsed.drivername.startswith("sqlite"):
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False), connect_args
+
+def create_async_db_engine(use_pooler: bool | None = None):
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url, connect_args = async_database_url(database_url(use_pooler))
+    options = engine_options(url, use_pooler)
+    if connect_args:
+        options["connect_args"] = {**options.get("connect_args", {}), **connect_args}
+    return create_async_engine(url, **options)
+
+engine = create_db_engine()
@@ -1,7 +1,9 @@
 import sys, os
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
 from src.db.models.models import (User, Exam, ExamSession, ExamStatus, Feedback, Program, Course, ExamContent, SubmissionAnswer, Submission,
-                                  Semester, Question, QuestionType, Answer, GradeLog, UserType, Uploads)
+                                  Semester, Question, QuestionType, Answer, GradeLog, UserType, Uploads,
+                                  CandidateExamSession, EmbeddingCacheEntry, ExamScoreRollup,
+                                  CourseSemesterScoreRollup, StudentSemesterScoreRollup)
 from sqlalchemy import Text, JSON
 from sqlalchemy.dialects.postgresql import JSONB as PGJSONB
 from pgvector.sqlalchemy import Vector as PGVector
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, Boolean, String, Enum, Text, TIMESTAMP, ForeignKey, Float, func, PrimaryKeyConstraint
+from sqlalchemy import Column, Integer, Boolean, String, Enum, Text, TIMESTAMP, ForeignKey, Float, func, PrimaryKeyConstraint, CheckConstraint, Index, DDL, event
 from sqlalchemy.ext.mutable import MutableList
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
 from pgvector.sqlalchemy import Vector
 from sqlalchemy.orm import relationship, sessionmaker
 from pathlib import Path
@@ -32,6 +32,7 @@ class Program(Base):
     degree_name = Column(String, nullable=False)    # Bachelor of Science
     department = Column(String, nullable=False)
     duration_years = Column(Float, default=4.0)
+    grading_scale = Column(JSONB, nullable=True)    # GradingScale.to_dict(); NULL uses the default scale
 
     courses = relationship("Course", back_populates="program")
     curricula = relationship("Curriculum", back_populates="program")
@@ -101,7 +102,7 @@ class Exam(Base):
     title = Column(String, nullable=False)
     duration = Column(Integer)
     pass_mark = Column(Float, default=40.0)
-    created_at = Column(TIMESTAMP, server_default=func.now())
+    created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
 
     author = relationship("User", back_populates="exams_authored")
@@ -110,6 +111,11 @@ class Exam(Base):
     questions = relationship("Question", back_populates="exam")
     submissions = relationship("Submission", back_populates="exam")
     exam_sessions = relationship("ExamSession", back_populates="exam")
+    candidate_sessions = relationship(
+        "CandidateExamSession",
+        back_populates="exam",
+        cascade="all, delete-orphan"
+    )
 
 class ExamStatus(enum.Enum):
     NOT_STARTED = "not_started"
@@ -134,11 +140,6 @@ class ExamSession(Base):
 
     student = relationship("User", back_populates="exam_sessions")
     exam = relationship("Exam", back_populates="exam_sessions")
-    candidate_sessions = relationship(
-        "CandidateExamSession",
-        back_populates="exam",
-        cascade="all, delete-orphan"
-    )
 
 
 class CandidateExamSession(Base):
@@ -158,6 +159,13 @@ class CandidateExamSession(Base):
 
     exam = relationship("Exam", back_populates="candidate_sessions")
 
+    __table_args__ = (
+        # expiry sweeper: WHERE status = 'IN_PROGRESS' AND ends_at < now()
+        Index("ix_candidate_exam_session_status_ends_at", "status", "ends_at"),
+        # start_exam duplicate check
+        Index("ix_candidate_exam_session_exam_id_candidate_ref", "exam_id", "candidate_ref"),
+    )
+
 
 class QuestionType(enum.Enum):
     MCQ = "mcq"
@@ -176,11 +184,42 @@ class Question(Base):
     difficulty = Column(String)
     tags = Column(MutableList.as_mutable(JSONB), default=list)
     embedding = Column(Vector(1536))
+    search_vector = Column(TSVECTOR)    # maintained by the question_search_vector_trigger trigger
     exam_id = Column(UUID(as_uuid=True), ForeignKey("exam.id"))
 
     exam = relationship("Exam", back_populates="questions")
     answers = relationship("Answer", back_populates="question")
 
+    __table_args__ = (
+        Index(
+            "ix_question_embedding_ann",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_l2_ops"},
+        ),
+        Index("ix_question_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_question_tags", "tags", postgresql_using="gin", postgresql_ops={"tags": "jsonb_path_ops"}),
+        Index("ix_question_exam_id", "exam_id"),
+    )
+
+# mirrors migration c52f8a0e6d17 for databases built with metadata.create_all()
+event.listen(
+    Question.__table__,
+    "after_create",
+    DDL("""
+        CREATE OR REPLACE FUNCTION question_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := to_tsvector('english', coalesce(NEW.text, ''));
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql;
+        CREATE TRIGGER question_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF text ON question
+        FOR EACH ROW EXECUTE FUNCTION question_search_vector_update();
+    """).execute_if(dialect="postgresql")
+)
+
 class Answer(Base):
     __tablename__ = "answer"
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -196,7 +235,7 @@ class Submission(Base):
     __tablename__ = "submission"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    submitted_at = Column(TIMESTAMP, server_default=func.now())
+    submitted_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
     exam_id = Column(
         UUID(as_uuid=True),
         ForeignKey("exam.id"),
@@ -227,6 +266,10 @@ class Submission(Base):
             """,
             name="submission_exactly_one_session"
         ),
+        # exam listings filter on exam_id and page on (submitted_at, id)
+        Index("ix_submission_exam_id_submitted_at", "exam_id", "submitted_at", "id"),
+        Index("ix_submission_user_id", "user_id"),
+        Index("ix_submission_candidate_session_id", "candidate_session_id", unique=True),
     )
 
     # relationships
@@ -255,6 +298,7 @@ class SubmissionAnswer(Base):
 
     __table_args__ = (
         PrimaryKeyConstraint("submission_id", "question_id"),
+        Index("ix_submission_answer_question_id", "question_id"),
     )
 
     submission = relationship("Submission", back_populates="answers")
@@ -290,11 +334,15 @@ class GradeLog(Base):
     score = Column(Float, nullable=False)
     grader = Column(UUID(as_uuid=True), nullable=False)
     details = Column(JSONB)          #rubric breakdown, AI confidence scores, etc.
-    graded_at = Column(TIMESTAMP, server_default=func.now())
+    graded_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
     submission_id = Column(UUID(as_uuid=True), ForeignKey("submission.id"))
 
     submission = relationship("Submission", back_populates="grade_log")
 
+    __table_args__ = (
+        Index("ix_gradelog_submission_id", "submission_id", unique=True),
+    )
+
 class Feedback(Base):
     __tablename__ = "feedback"
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -319,3 +367,34 @@ class ExamContent(Base):
     upload_id = Column(UUID(as_uuid=True), ForeignKey("uploads.id"))
     text = Column(Text, nullable=False)
     created_at = Column(TIMESTAMP, server_default=func.now())
+
+class EmbeddingCacheEntry(Base):
+    __tablename__ = "embedding_cache"
+    key = Column(String(64), primary_key=True)  # sha256(model, input_type, normalized text)
+    model = Column(String, nullable=False)
+    input_type = Column(String, nullable=False)
+    embedding = Column(Vector(1536), nullable=False)
+    created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False, index=True)
+
+
+class ScoreRollupMixin:
+    # additive aggregates only, so a grade change can be applied as a delta
+    graded_count = Column(Integer, nullable=False, default=0)
+    pass_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+    score_sq_sum = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+class ExamScoreRollup(ScoreRollupMixin, Base):
+    __tablename__ = "exam_score_rollup"
+    exam_id = Column(UUID(as_uuid=True), ForeignKey("exam.id", ondelete="CASCADE"), primary_key=True)
+
+class CourseSemesterScoreRollup(ScoreRollupMixin, Base):
+    __tablename__ = "course_semester_score_rollup"
+    course_id = Column(UUID(as_uuid=True), ForeignKey("course.id", ondelete="CASCADE"), primary_key=True)
+    semester_id = Column(UUID(as_uuid=True), ForeignKey("semester.id", ondelete="CASCADE"), primary_key=True)
+
+class StudentSemesterScoreRollup(ScoreRollupMixin, Base):
+    __tablename__ = "student_semester_score_rollup"
+    user_id = Column(UUID(as_uuid=True), ForeignKey("user.id", ondelete="CASCADE"), primary_key=True)
+    semester_id = Column(UUID(as_uuid=True), ForeignKey("semester.id", ondelete="CASCADE"), primary_key=True)
@@ -1,101 +1,78 @@
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError
-from sqlalchemy.orm import Session
 from uuid import UUID
-from config import settings
 from fastapi import Depends, HTTPException, status
-from src.db.database import get_db
-from src.db.models import CandidateExamSession, ExamStatus
-from src.utils.jwt import decode_jwt
-from src.schemas.candidate_exam import CandidateExamToken
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.db.async_database import get_async_db
+from src.db.models import CandidateExamSession, ExamStatus, Submission
+from src.services.candidate_exam import utcnow
+from src.services.session_state import SessionState, session_state_cache
+from src.utils.jwt_handler import JWTHandler
 
 security = HTTPBearer()
 
 
-def get_active_session(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> ExamSession:
-    token = credentials.credentials
-
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        data = CandidateExamToken(**payload)
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid session token")
-
-    session = (
-        db.query(ExamSession)
-        .filter(ExamSession.id == data.exam_session_id)
-        .first()
+async def load_session_state(db: AsyncSession, session_id: UUID) -> SessionState | None:
+    row = (
+        await db.execute(
+            select(CandidateExamSession, Submission.id)
+            .join(Submission, Submission.candidate_session_id == CandidateExamSession.id)
+            .where(CandidateExamSession.id == session_id)
+        )
+    ).first()
+    if not row:
+        return None
+
+    session, submission_id = row
+    return SessionState(
+        session_id=session.id,
+        exam_id=session.exam_id,
+        submission_id=submission_id,
+        status=session.status,
+        ends_at=session.ends_at,
     )
 
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
 
-    if session.status in {ExamStatus.SUBMITTED, ExamStatus.EXPIRED}:
+async def get_current_candidate_session(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db),
+) -> SessionState:
+    payload = JWTHandler().verify_token(credentials.credentials)
+
+    if payload.get("sub") != "candidate":
         raise HTTPException(
-            status_code=403,
-            detail="Exam session is no longer active",
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token scope"
         )
 
-    return session
-
-def get_current_candidate_session(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> CandidateExamSession:
     try:
-        token = credentials.credentials
-        payload = decode_jwt(token)
-
-        if payload.get("sub") != "candidate":
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token scope"
-            )
-
-        session_id = payload.get("session_id")
-        if not session_id:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Session ID missing from token"
-            )
-
-        session = (
-            db.query(CandidateExamSession)
-            .filter(CandidateExamSession.id == UUID(session_id))
-            .one_or_none()
+        session_id = UUID(payload["session_id"])
+    except (KeyError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session ID missing from token"
         )
 
-        if not session:
+    state = await session_state_cache.get(session_id)
+    if state is None:
+        state = await load_session_state(db, session_id)
+        if state is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Exam session not found"
             )
+        await session_state_cache.set(state)
 
-        if session.status != ExamStatus.IN_PROGRESS:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Exam session is not active"
-            )
-
-        if datetime.now(timezone.utc) > session.ends_at:
-            session.status = ExamStatus.TIMED_OUT
-            db.commit()
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Exam session has expired"
-            )
-
-        return session
+    if state.status != ExamStatus.IN_PROGRESS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Exam session is not active"
+        )
 
-    except HTTPException:
-        raise
-    except Exception:
+    if utcnow() > state.ends_at:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Exam session has expired"
         )
 
+    return state
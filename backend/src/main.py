@@ -1,9 +1,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from src.api.v1 import AuthRouter, UserRouter, CandidateExamRouter,SubmissionRouter, SearchRouter, QuestionRouter, StorageRouter, ExamRouter
+from src.api.v1 import AuthRouter, UserRouter, CandidateExamRouter,SubmissionRouter, SearchRouter, QuestionRouter, StorageRouter, ExamRouter, SemesterRouter, AnswerRouter, GradeLogRouter
 from fastapi.exceptions import ResponseValidationError
 from fastapi import Request
 from fastapi.responses import JSONResponse
+from config import settings
+from src.services.autosave import autosave_buffer
+from src.services.session_sweeper import session_sweeper
 
 app = FastAPI()
 
@@ -27,6 +30,9 @@ question_routes = QuestionRouter()
 storage_routes = StorageRouter()
 exam_routes = ExamRouter()
 candidate_exam_routes = CandidateExamRouter()
+semester_routes = SemesterRouter()
+answer_routes = AnswerRouter()
+grade_routes = GradeLogRouter()
 
 app.include_router(user_routes.router)
 app.include_router(auth_routes.router)
@@ -36,6 +42,20 @@ app.include_router(question_routes.router)
 app.include_router(storage_routes.router)
 app.include_router(exam_routes.router)
 app.include_router(candidate_exam_routes.router)
+app.include_router(semester_routes.router)
+app.include_router(answer_routes.router)
+app.include_router(grade_routes.router)
+
+@app.on_event("startup")
+async def start_background_tasks():
+    autosave_buffer.start()
+    if settings.SESSION_SWEEPER_ENABLED:
+        session_sweeper.start()
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    await session_sweeper.stop()
+    await autosave_buffer.stop()
 
 @app.exception_handler(ResponseValidationError)
 async def validation_exception_handler(request: Request, exc: ResponseValidationError):
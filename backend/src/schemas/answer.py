@@ -0,0 +1,9 @@
+from typing import Any, Optional
+from pydantic import BaseModel
+from uuid import UUID
+
+class AnswerRead(BaseModel):
+    answer_id: UUID
+    text: Optional[str] = None
+    options: Optional[Any] = None
+    correct_option: Optional[str] = None
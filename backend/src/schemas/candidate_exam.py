@@ -1,7 +1,8 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from uuid import UUID
 from typing import List, Optional
 from datetime import datetime
+from src.db.models import ExamStatus
 
 # ---------- Requests ----------
 
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from uuid import UUID
 
@@ -59,9 +59,54 @@ class ExamRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 class ExamStatsRead(BaseModel):
+    exam_id: UUID
     exam_title: str
+    submissions: int
+    graded: int
     average_score: float = Field(..., ge=0, le=100)
+    median_score: Optional[float] = None
+    stddev_score: Optional[float] = None
+    min_score: Optional[float] = None
+    max_score: Optional[float] = None
+    pass_mark: float
+    pass_count: int
     pass_rate: float = Field(..., ge=0, le=100)
+    percentiles: Dict[str, Optional[float]] = {}
+
+class ExamSummaryRead(BaseModel):
+    exam_id: UUID
+    graded: int
+    average_score: float
+    stddev_score: Optional[float] = None
+    pass_count: int
+    pass_rate: float
+
+class OptionFrequencyRead(BaseModel):
+    option: str
+    count: int
+    mean_score: Optional[float] = None
+
+class ItemStatisticsRead(BaseModel):
+    question_id: UUID
+    question: Optional[str] = None
+    type: Optional[str] = None
+    responses: int
+    facility: Optional[float] = None
+    discrimination: Optional[float] = None
+    options: Optional[List[OptionFrequencyRead]] = None
+
+class ScoreBinRead(BaseModel):
+    min_score: float
+    max_score: float
+    count: int
+
+class ItemAnalysisRead(BaseModel):
+    exam_id: UUID
+    submissions: int
+    average_score: Optional[float] = None
+    stddev_score: Optional[float] = None
+    score_distribution: List[ScoreBinRead]
+    items: List[ItemStatisticsRead]
 
 class ExamResultsRead(BaseModel):
     title: str
@@ -0,0 +1,11 @@
+from datetime import datetime
+from typing import Any, Optional
+from pydantic import BaseModel
+from uuid import UUID
+
+class GradeLogRead(BaseModel):
+    grade_id: UUID
+    score: float
+    grader: UUID
+    details: Optional[Any] = None
+    graded_at: datetime
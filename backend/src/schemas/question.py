@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Literal, Optional
 from uuid import UUID
 from datetime import datetime
 from src.db.models import QuestionType
@@ -26,6 +26,7 @@ class QuestionSearchRequest(BaseModel):
     top_n: Optional[int] = 5
     difficulty: Optional[str] = None
     tags: Optional[List[str]] = None
+    recall: Literal["fast", "balanced", "accurate"] = "balanced"
 
 
 class QuestionUpdate(BaseModel):
@@ -44,3 +45,7 @@ class BulkQuestionResponse(BaseModel):
 
 class TagRequest(BaseModel):
     tags: List[str]
+
+class TagFacet(BaseModel):
+    tag: str
+    count: int
@@ -1,3 +1,4 @@
+from typing import Literal
 from pydantic import BaseModel
 from uuid import UUID
 
@@ -6,8 +7,12 @@ class SearchRequest(BaseModel):
     top_n: int = 5
     tags: list[str] | None = None
     difficulty: str | None = None
+    recall: Literal["fast", "balanced", "accurate"] = "balanced"
 
 class SearchResponse(BaseModel):
     id: UUID
     text: str
     tags: list[str] | None = None
+    score: float | None = None
+    keyword_score: float | None = None
+    semantic_distance: float | None = None
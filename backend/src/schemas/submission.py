@@ -12,6 +12,17 @@ class AddAnswerRequest(BaseModel):
     question_id: UUID = Field(..., example="ques-123")
     answer_text: str = Field(..., example="The answer to question 1")
 
+class BulkAnswerItem(BaseModel):
+    question_id: UUID
+    answer_text: str
+
+class BulkAnswerRequest(BaseModel):
+    answers: List[BulkAnswerItem] = Field(..., min_length=1, max_length=1000)
+
+class BulkAnswerResponse(BaseModel):
+    submission_id: UUID
+    saved: int
+
 class AnswerItem(BaseModel):
     question_id: UUID
     question: Optional[str] = None
@@ -0,0 +1,83 @@
+import math
+import asyncio
+import time
+from config import settings
+from src.utils.cache import TTLCache
+from src.utils.exceptions import AdmissionRejected
+
+
+class TokenBucket:
+    """Token bucket that hands out reservations, letting tokens go negative.
+
+    A negative balance is the queue: each reservation waits until the bucket
+    has refilled past it, so admissions leave at a steady `rate` per second.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def queued(self) -> int:
+        self._refill()
+        return math.ceil(max(0.0, -self._tokens))
+
+    def delay(self) -> float:
+        """Seconds the next reservation would wait."""
+        self._refill()
+        return max(0.0, (1 - self._tokens) / self.rate)
+
+    def reserve(self) -> float:
+        delay = self.delay()
+        self._tokens -= 1
+        return delay
+
+
+class AdmissionController:
+    """Per-key admission with a bounded wait queue.
+
+    Requests beyond the burst capacity queue behind the bucket; once the queue
+    holds `max_queue` requests or the wait would exceed `max_wait` seconds the
+    request is rejected with its queue position and a retry-after hint.
+    """
+
+    def __init__(self, rate: float = settings.ADMISSION_RATE, burst: int = settings.ADMISSION_BURST,
+                 max_queue: int = settings.ADMISSION_MAX_QUEUE, max_wait: float = settings.ADMISSION_MAX_WAIT,
+                 clock=time.monotonic, sleep=asyncio.sleep):
+        self.rate = rate
+        self.burst = burst
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets = TTLCache(max_size=4096, ttl=3600)
+
+    def _bucket(self, key) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.burst, clock=self._clock)
+            self._buckets.set(key, bucket)
+        return bucket
+
+    async def admit(self, key):
+        bucket = self._bucket(key)
+        delay = bucket.delay()
+
+        if delay > 0:
+            position = bucket.queued() + 1
+            if position > self.max_queue or delay > self.max_wait:
+                raise AdmissionRejected("Too many candidates are starting this exam", position, delay)
+
+        wait = bucket.reserve()
+        if wait > 0:
+            await self._sleep(wait)
+
+
+admission = AdmissionController()
@@ -1,13 +1,17 @@
 import logging
 from datetime import datetime
-from collections import defaultdict
-from numpy.ma.extras import average
-from sqlalchemy import func
+import numpy as np
+from sqlalchemy import Integer, cast, func, select, tuple_
 from uuid import UUID
 from sqlalchemy.orm import Session, joinedload
-from src.db.models import Submission, GradeLog, User, Exam
+from src.db.models import Submission, GradeLog, User, Exam, Course, Program, Semester
 from src.services import exam, course, submission, semester
 from src.utils.exceptions import NotFoundError, ServiceError
+from src.utils.identity_loader import IdentityLoader
+from src.utils.grading import DEFAULT_GRADING_SCALE, GradingScale, grade_cohorts
+
+DEFAULT_PASS_MARK = 40.0
+SCORE_PERCENTILES = (10, 25, 50, 75, 90)
 
 class AnalyticsService:
     def __init__(self, db_session: Session):
@@ -17,6 +21,8 @@ class AnalyticsService:
         self.exam_service = exam.ExamService(db_session)
         self.course_service = course.CourseService(db_session)
         self.submission_service = submission.SubmissionService(db_session)
+        self.loader = IdentityLoader(db_session)
+        self._grading_scales = {}
 
     def student_score_in_exam(self, student_id: UUID, exam_id: UUID):
         try:
@@ -43,53 +49,55 @@ class AnalyticsService:
             raise ServiceError("Failed to get total score for student") from e
 
     def exam_pass_rate(self, exam_id: UUID):
-        try:
-            exam_obj = self.exam_service.get_exam_by_id(exam_id)
-            if not exam_obj:
-                raise NotFoundError("Exam not found")
-
-            submissions = (
-                self.db.query(Submission)
-                .options(joinedload(Submission.grade_log))
-                .filter(Submission.exam_id == exam_id)
-                .all()
-            )
-
-            total = len(submissions)
-            if total == 0:
-                return 0.0
-
-            passed = sum(1 for sub in submissions if sub.grade_log and sub.grade_log.score >= exa_obj.pass_mark)
-            return (passed / total) * 100
-        except NotFoundError:
-            raise
-        except Exception as e:
-            self.logger.error(f"Failed to compute pass rate for exam {exam_id}: {e}")
-            raise ServiceError("Could not compute pass rate") from e
+        return self.exam_statistics(exam_id)["pass_rate"]
 
     def exam_statistics(self, exam_id: UUID):
+        """Score distribution for one exam, computed in a single aggregate query."""
         try:
-            exam_obj = self.exam_service.get_exam_by_id(exam_id)
-            if not exam_obj:
+            score = GradeLog.score
+            pass_mark = func.coalesce(Exam.pass_mark, DEFAULT_PASS_MARK)
+            row = (
+                self.db.query(
+                    Exam.title,
+                    pass_mark.label("pass_mark"),
+                    func.count(Submission.id).label("submissions"),
+                    func.count(score).label("graded"),
+                    func.avg(score).label("average"),
+                    func.stddev_samp(score).label("stddev"),
+                    func.min(score).label("min"),
+                    func.max(score).label("max"),
+                    func.count(score).filter(score >= pass_mark).label("passed"),
+                    *[
+                        func.percentile_cont(p / 100).within_group(score).label(f"p{p}")
+                        for p in SCORE_PERCENTILES
+                    ],
+                )
+                .outerjoin(Submission, Submission.exam_id == Exam.id)
+                .outerjoin(GradeLog, GradeLog.submission_id == Submission.id)
+                .filter(Exam.id == exam_id)
+                .group_by(Exam.id)
+                .one_or_none()
+            )
+            if row is None:
                 raise NotFoundError("Exam not found")
 
-            submissions = self.submission_service.list_exam_submissions(exam_id)
-            if not submissions:
-                return {"average score": 0, "pass rate": 0}
-
-            # Pull scores directly from the relationship
-            scores = [sub.score for sub in submissions if sub.score]
-
-            if not scores:
-                return {"average score": 0, "pass rate": 0}
-
-            average_score = sum(scores) / len(scores)
-            pass_rate = self.exam_pass_rate(exam_id)
+            def number(value):
+                return float(value) if value is not None else None
 
             return {
-                "exam title": exam_obj.title,
-                "average score": average_score,
-                "pass rate": pass_rate
+                "exam_id": exam_id,
+                "exam_title": row.title,
+                "submissions": row.submissions,
+                "graded": row.graded,
+                "average_score": number(row.average) or 0.0,
+                "median_score": number(row.p50),
+                "stddev_score": number(row.stddev),
+                "min_score": number(row.min),
+                "max_score": number(row.max),
+                "pass_mark": float(row.pass_mark),
+                "pass_count": row.passed,
+                "pass_rate": (row.passed / row.graded * 100) if row.graded else 0.0,
+                "percentiles": {f"p{p}": number(getattr(row, f"p{p}")) for p in SCORE_PERCENTILES},
             }
         except NotFoundError:
             raise
@@ -97,151 +105,98 @@ class AnalyticsService:
             self.logger.error(f"Failed to compute exam statistics for exam {exam_id}: {e}")
             raise ServiceError("Could not compute exam statistics") from e
 
-    def course_performance_per_semester(self, course_id: UUID, start_date: datetime, end_date: datetime):
+    def course_performance(self, course_id: UUID, semester_id: UUID):
+        """Per-exam and overall results for a course in one semester, from one GROUP BY ROLLUP query."""
         try:
-            if not isinstance(start_date, datetime) or not isinstance(end_date, datetime):
-                raise TypeError("start_date and end_date must be datetime objects")
-
-            semester = self.semester_service.get_semester_by_date(start_date, end_date)
-            exams = self.exam_service.get_exams_by_course(course_id, semester.id)
-
-            exam_ids = [e.id for e in exams]
-            query = (
-                self.db.query(Submission)
-                .options(joinedload(Submission.grade_log))
-                .filter(
-                    Submission.exam_id.in_(exam_ids)
+            score = GradeLog.score
+            passed = func.count(score).filter(score >= func.coalesce(Exam.pass_mark, DEFAULT_PASS_MARK))
+            rows = (
+                self.db.query(
+                    Exam.id.label("exam_id"),
+                    Exam.title,
+                    func.count(Submission.id).label("submissions"),
+                    func.count(score).label("graded"),
+                    func.avg(score).label("average"),
+                    func.min(score).label("min"),
+                    func.max(score).label("max"),
+                    passed.label("passed"),
+                    func.grouping(Exam.id).label("is_total"),
                 )
+                .outerjoin(Submission, Submission.exam_id == Exam.id)
+                .outerjoin(GradeLog, GradeLog.submission_id == Submission.id)
+                .filter(Exam.course_id == course_id, Exam.semester_id == semester_id)
+                .group_by(func.rollup(tuple_(Exam.id, Exam.title)))
+                .order_by(Exam.title)
+                .all()
             )
 
-            submissions = query.all()
-            total_submissions = query.count()
-            scores = [sub.grade_log.score for sub in submissions]
-            total_score = sum(score for score in scores)
-            exam_stats =[self.exam_statistics(exam_id) for exam_id in exam_ids]
-
-            overall_average_score = total_score / total_submissions
-            overall_pass_rate = sum(stat["pass rate"] for stat in exam_stats) / total_submissions
-
-            return {
-                "course id": course_id,
-                "course name": self.course_service.get_course(course_id).name,
-                "semester": semester.name,
-                "number of exams": len(exam_ids),
-                "number of students": total_submissions,
-                "average score": overall_average_score,
-                "pass rate": overall_pass_rate,
-                "exam breakdown": [
-                    {
-                        "exam": stat["exam title"],
-                        "average score": stat["average score"],
-                        "pass rate": stat["pass rate"]
-                    }
-                    for stat in exam_stats
-                ]
-            }
-        except Exception as e:
-            self.logger.error(f"Failed to compute course performance: {e}")
-            raise ServiceError("Could not compute course performance") from e
-
-
-    def course_performance_per_semester_sql(self, course_id: UUID, start_date: datetime, end_date: datetime):
-        try:
-            semester = self.semester_service.get_semester_by_date(start_date, end_date)
-            exam_ids = [
-                e.id for e in self.exam_service.get_exams_by_course(course_id, semester.id)
-            ]
+            def shape(row):
+                return {
+                    "submissions": row.submissions,
+                    "graded": row.graded,
+                    "average_score": float(row.average) if row.average is not None else 0.0,
+                    "min_score": row.min,
+                    "max_score": row.max,
+                    "pass_count": row.passed,
+                    "pass_rate": (row.passed / row.graded * 100) if row.graded else 0.0,
+                }
 
-            result = (
-                self.db.query(
-                    func.count(Submission.id).label("num_submissions"),
-                    func.avg(GradeLog.score).label("average_score"),
-                    func.sum(
-                        func.case(
-                            (GradeLog.score >= 40, 1), else_=0
-                        )
-                    ).label("pass_count"),
-                )
-                .join(GradeLog, Submission.id == GradeLog.submission_id)
-                .filter(
-                    Submission.exam_id.in_(exam_ids),
-                    Submission.submitted_at >= start_date,
-                    Submission.submitted_at <= end_date,
-                )
-                .one()
-            )
+            exams = [{"exam_id": r.exam_id, "exam_title": r.title, **shape(r)} for r in rows if not r.is_total]
+            total = next((r for r in rows if r.is_total), None)
 
             return {
-                "course id": course_id,
-                "course name": self.course_service.get_course(course_id).name,
-                "semester": semester.name,
-                "number of exams": len(exam_ids),
-                "number of students": result.num_submissions,
-                "average score": float(result.average_score or 0),
-                "pass rate": (
-                    result.pass_count / result.num_submissions
-                    if result.num_submissions > 0 else 0
-                ),
+                "course_id": course_id,
+                "course_name": self.course_service.get_course(course_id).name,
+                "semester_id": semester_id,
+                "number_of_exams": len(exams),
+                **(shape(total) if total else {
+                    "submissions": 0, "graded": 0, "average_score": 0.0, "min_score": None,
+                    "max_score": None, "pass_count": 0, "pass_rate": 0.0,
+                }),
+                "exams": exams,
             }
+        except NotFoundError:
+            raise
         except Exception as e:
-            self.logger.error(f"Failed to compute course performance: {e}")
+            self.logger.error(f"Failed to compute course performance for {course_id}: {e}")
             raise ServiceError("Could not compute course performance") from e
 
-    def grade_from_score(self, score):
-        if score >= 70:
-            return "A"
-        elif score >= 60:
-            return "B"
-        elif score >= 50:
-            return "C"
-        elif score >= 40:
-            return "D"
-        else:
-            return "F"
-
-    def score_to_gpa(self, score):
-        if score >= 90:
-            return 4.0
-        elif score >= 80:
-            return 3.7
-        elif score >= 70:
-            return 3.0
-        elif score >= 60:
-            return 2.0
-        elif score >= 50:
-            return 1.0
-        else:
-            return 0.0
-
-    def compute_improvement_rate(self, progress_data: dict):
-        if len(progress_data) < 2:
-            return 0
-        first = progress_data[0]["average_score"]
-        last = progress_data[-1]["average_score"]
-        return ((last - first) / first) * 100 if first else 0
-
-    def compute_gpa_trend(self, progress_data: dict):
-        return [(s["semester_name"], s["average_score"]) for s in progress_data]
-
-    def find_weakest_course(self, progress_data: dict):
-        all_courses = [c for s in progress_data for c in s["courses"]]
-        return min(all_courses, key=lambda c: c["average_score"])
-
-    def compute_cumulative_gpa(self, progress_data):
+    def course_performance_per_semester(self, course_id: UUID, start_date: datetime, end_date: datetime):
+        if not isinstance(start_date, datetime) or not isinstance(end_date, datetime):
+            raise TypeError("start_date and end_date must be datetime objects")
+
+        semester = self.semester_service.get_semester_by_date(start_date, end_date)
+        performance = self.course_performance(course_id, semester.id)
+        performance["semester"] = semester.name
+        return performance
+
+    def grading_scales(self, program_ids) -> dict:
+        """Custom grading scales of the given programs; programs without one are left out."""
+        scales = {}
+        for program_id, program in self.loader.get_many(Program, set(program_ids)).items():
+            if program is None or not program.grading_scale:
+                continue
+            if program_id not in self._grading_scales:
+                self._grading_scales[program_id] = GradingScale.from_dict(program.grading_scale)
+            scales[program_id] = self._grading_scales[program_id]
+        return scales
+
+    def grading_scale(self, program_ids) -> GradingScale:
+        """The scale shared by `program_ids`, or the default when they span several programs."""
+        program_ids = set(program_ids)
+        if len(program_ids) != 1:
+            return DEFAULT_GRADING_SCALE
+        return self.grading_scales(program_ids).get(program_ids.pop(), DEFAULT_GRADING_SCALE)
+
+    def compute_cumulative_gpa(self, progress_data, scale: GradingScale = DEFAULT_GRADING_SCALE):
         if not progress_data:
             return 0.0
 
-        total_weighted_gpa = 0
-        total_courses = 0
-
-        for semester in progress_data:
-            gpa = score_to_gpa(semester["average_score"])
-            num_courses = semester.get("num_courses", 1)
-            total_weighted_gpa += gpa * num_courses
-            total_courses += num_courses
-
-        cumulative_gpa = total_weighted_gpa / total_courses if total_courses > 0 else 0
-        return round(cumulative_gpa, 2)
+        gpa = scale.cumulative_gpa(
+            [s["average_score"] for s in progress_data],
+            weights=[s.get("num_courses", 1) for s in progress_data],
+        )
+        return round(gpa, 2)
 
     def student_performance_per_semester(self, student_id: UUID, start_date: datetime, end_date: datetime):
         try:
@@ -262,22 +217,26 @@ class AnalyticsService:
             )
 
             results = query.all()
-            overall_avg = sum(r.average_score for r in results) / len(results) if results else 0
+            courses = self.loader.get_many(Course, [r.course_id for r in results])
+            program_ids = [courses[r.course_id].program_id for r in results]
+            scores = np.array([r.average_score for r in results], dtype=float)
+            grades, _ = grade_cohorts(scores, program_ids, self.grading_scales(program_ids))
+            overall_avg = float(scores.mean()) if results else 0
 
             return {
                 "student_id": student_id,
                 "date_range": (start_date, end_date),
                 "num_courses": len(results),
                 "overall_average": overall_avg,
-                "overall_grade": self.grade_from_score(overall_avg),
+                "overall_grade": self.grading_scale(program_ids).band(overall_avg).item(),
                 "courses": [
                 {
                     "course_id": r.course_id,
-                    "course_name": self.course_service.get_course(r.course_id).name,
+                    "course_name": courses[r.course_id].name,
                     "average_score": r.average_score,
-                    "grade": self.grade_from_score(r.average_score),
+                    "grade": grade,
                 }
-                for r in results
+                for r, grade in zip(results, grades.tolist())
                 ],
             }
         except Exception as e:
@@ -288,115 +247,143 @@ class AnalyticsService:
         try:
             semester = self.semester_service.get_semester_by_date(start_date, end_date)
 
-            exam_ids = [e.id for e in self.exam_service.get_exams_by_semester(semester.id)]
-
-            submissions = (self.db.query(Submission)
+            rows = (self.db.query(
+                Submission.exam_id,
+                Exam.course_id,
+                GradeLog.score,
+                Submission.submitted_at,
+            )
             .join(GradeLog, Submission.id == GradeLog.submission_id)
             .join(Exam, Submission.exam_id == Exam.id)
             .filter(
                 Submission.user_id == student_id,
-                Submission.exam_id.in_(exam_ids)
+                Exam.semester_id == semester.id,
             ).all())
 
+            courses = self.loader.get_many(Course, [r.course_id for r in rows])
+            exams = self.loader.get_many(Exam, [r.exam_id for r in rows])
+            program_ids = [courses[r.course_id].program_id for r in rows]
+            scores = np.array([r.score for r in rows], dtype=float)
+            grades, _ = grade_cohorts(scores, program_ids, self.grading_scales(program_ids))
+            pass_marks = np.array([
+                exams[r.exam_id].pass_mark if exams[r.exam_id].pass_mark is not None else DEFAULT_PASS_MARK
+                for r in rows
+            ], dtype=float)
+            passed = scores >= pass_marks
+
             return [{
-                "course_id": sub.exam.course_id,
-                "course_name": sub.exam.course.name,
-                "exam_id": sub.exam_id,
-                "exam_title": sub.exam.title,
-                "score": sub.grade_log.score,
-                "grade": self.grade_from_score(sub.grade_log.score),
-                "status": "passed" if sub.grade_log.score >= 40 else "failed",
-                "submitted_at": sub.submitted_at
-            } for sub in submissions]
+                "course_id": r.course_id,
+                "course_name": courses[r.course_id].name,
+                "exam_id": r.exam_id,
+                "exam_title": exams[r.exam_id].title,
+                "score": r.score,
+                "grade": grade,
+                "status": "passed" if ok else "failed",
+                "submitted_at": r.submitted_at
+            } for r, grade, ok in zip(rows, grades.tolist(), passed.tolist())]
         except Exception as e:
             self.logger.error(f"Failed to compute student performance for semester: {e}")
             raise ServiceError("Could not compute student performance") from e
 
     def student_progress(self, user_id: UUID):
+        """Semester-by-semester transcript for one student, computed from their own graded submissions only."""
         try:
-            results = (
-                query(Exam)
-                .join(Semester)
-                .options(
-                    selectinload(Exam.semester),
-                    selectinload(Exam.submissions).selectinload(Submission.grade_log),
+            score = GradeLog.score
+            course_rows = (
+                select(
+                    Semester.id.label("semester_id"),
+                    Semester.name.label("semester_name"),
+                    Course.id.label("course_id"),
+                    Course.name.label("course_name"),
+                    Course.program_id,
+                    func.avg(score).label("course_avg"),
+                    func.avg(func.avg(score)).over(partition_by=Semester.id).label("semester_avg"),
+                    func.count().over(partition_by=Semester.id).label("num_courses"),
+                    # int4 so the outer query can use a RANGE offset frame over it
+                    cast(func.dense_rank().over(order_by=(Semester.start_date, Semester.id)), Integer)
+                    .label("semester_rank"),
                 )
-                .filter(Exam.user_id == user_id)
-                .all()
+                .select_from(Submission)
+                .join(GradeLog, GradeLog.submission_id == Submission.id)
+                .join(Exam, Submission.exam_id == Exam.id)
+                .join(Semester, Exam.semester_id == Semester.id)
+                .join(Course, Exam.course_id == Course.id)
+                .where(Submission.user_id == user_id, score.isnot(None))
+                .group_by(Semester.id, Semester.name, Semester.start_date, Course.id, Course.name, Course.program_id)
+                .subquery()
             )
 
-            if not results:
-                raise NotFoundError(f"No semesters found for student {user_id}")
-
-            semester_map = defaultdict(list)
-            for exam in results:
-                semester_map[exam.semester].append(exam)
-            #semesters = sorted({result.semester for result in results}, key=lambda s: s.start_date)
-
-            semesters = sorted(semester_map.keys(), key=lambda s: s.start_date)
-
-            progress_data = []
-
-            for semester in semesters:
-                exams = semester_map[semester]
-                exam_scores = []
-
-                for exam in exams:
-                    submission_scores = [
-                        s.grade_log.score
-                        for s in exam.submissions
-                        if s.grade_log and s.grade_log.score is not None
-                    ]
-
-                    if submission_scores:
-                        exam_avg = mean(submission_scores)
-                        exam_scores.append(exam_avg)
-
-                if not exam_scores:
-                    continue  # skip semesters without any scores
+            c = course_rows.c
+            by_semester = {"order_by": c.semester_rank}
+            first_avg = func.first_value(c.semester_avg).over(**by_semester)
+            last_avg = func.last_value(c.semester_avg).over(**by_semester, range_=(None, None))
+            rows = self.db.execute(
+                select(
+                    c.semester_id,
+                    c.semester_name,
+                    c.course_id,
+                    c.course_name,
+                    c.program_id,
+                    c.course_avg,
+                    c.semester_avg,
+                    c.num_courses,
+                    # every row of a semester shares semester_avg, so the 1-preceding range is the previous semester
+                    func.max(c.semester_avg).over(**by_semester, range_=(-1, -1)).label("previous_avg"),
+                    func.coalesce((last_avg - first_avg) / func.nullif(first_avg, 0) * 100, 0).label("improvement"),
+                    (func.row_number().over(order_by=(c.course_avg, c.course_name)) == 1).label("is_weakest"),
+                )
+                .order_by(c.semester_rank, c.course_name)
+            ).all()
 
-                semester_avg = mean(exam_scores)
-                grade = self.score_to_grade(semester_avg)
-                num_courses = len(exams)
+            if not rows:
+                raise NotFoundError(f"No graded exams found for student {user_id}")
 
-                """semester_performance = self.student_performance_per_semester(
-                    user_id, semester.start_date, semester.end_date
-                )"""
+            program_ids = [row.program_id for row in rows]
+            course_grades, _ = grade_cohorts(
+                [row.course_avg for row in rows], program_ids, self.grading_scales(program_ids)
+            )
 
-                progress_data.append({
-                    "semester_name": semester.name,
-                    "average_score": round(semester_avg, 2),
+            progress_data, gpa_trend, semester_avgs, weakest_course = [], [], [], None
+            current_semester = None
+            for row, grade in zip(rows, course_grades.tolist()):
+                course = {
+                    "course_id": row.course_id,
+                    "course_name": row.course_name,
+                    "average_score": round(row.course_avg, 2),
                     "grade": grade,
-                    "num_courses": num_courses,
-                    "courses": [
-                        {
-                            "course_name": exam.course.name,
-                            "average_score": round(mean([
-                                s.grade_log.score for s in exam.submissions
-                                if s.grade_log and s.grade_log.score is not None
-                            ]), 2),
-                            "grade": self.score_to_grade(round(mean([
-                                s.grade_log.score for s in exam.submissions
-                                if s.grade_log and s.grade_log.score is not None
-                            ]), 2))
-                        }
-                        for exam in exams if exam.submissions
-                    ]
-                })
-
-            if not progress_data:
-                raise NotFoundError(f"No valid exam data found for {user_id}")
-
-            improvement_rate = compute_improvement_rate(progress_data)
-            gpa_trend = compute_gpa_trend(progress_data)
-            weakest_course = find_weakest_course(progress_data)
+                }
+                if row.is_weakest:
+                    weakest_course = course
+                # semester names repeat across academic years, so group on the id
+                if row.semester_id != current_semester:
+                    current_semester = row.semester_id
+                    semester_avgs.append(row.semester_avg)
+                    progress_data.append({
+                        "semester_name": row.semester_name,
+                        "average_score": round(row.semester_avg, 2),
+                        "num_courses": row.num_courses,
+                        "courses": [],
+                    })
+                    gpa_trend.append({
+                        "semester_name": row.semester_name,
+                        "average_score": round(row.semester_avg, 2),
+                        "change": round(row.semester_avg - row.previous_avg, 2) if row.previous_avg is not None else None,
+                    })
+                progress_data[-1]["courses"].append(course)
+
+            scale = self.grading_scale(program_ids)
+            for semester_data, trend, grade, gpa in zip(
+                progress_data, gpa_trend, scale.band(semester_avgs).tolist(), scale.gpa(semester_avgs).tolist()
+            ):
+                semester_data["grade"] = grade
+                trend["gpa"] = gpa
 
             return {
                 "student_id": user_id,
                 "total_semesters": len(progress_data),
-                "average_gpa": self.compute_cumulative_gpa(progress_data),
+                "average_gpa": self.compute_cumulative_gpa(progress_data, scale),
                 "gpa_trend": gpa_trend,
-                "improvement_rate": improvement_rate,
+                "improvement_rate": round(rows[0].improvement, 2),
                 "weakest_course": weakest_course,
                 "semester_breakdown": progress_data
             }
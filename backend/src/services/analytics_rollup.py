@@ -0,0 +1,198 @@
+import math
+import logging
+from uuid import UUID
+from sqlalchemy import and_, delete, func, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from src.db.models import (
+    Exam, GradeLog, Submission, ExamScoreRollup, CourseSemesterScoreRollup, StudentSemesterScoreRollup
+)
+from src.utils.exceptions import NotFoundError, ServiceError
+
+DEFAULT_PASS_MARK = 40.0
+
+# rollup table -> the columns that key it, taken from Submission ⨝ Exam
+ROLLUP_KEYS = {
+    ExamScoreRollup: {"exam_id": Exam.id},
+    CourseSemesterScoreRollup: {"course_id": Exam.course_id, "semester_id": Exam.semester_id},
+    StudentSemesterScoreRollup: {"user_id": Submission.user_id, "semester_id": Exam.semester_id},
+}
+
+
+def score_deltas(old_score: float | None, new_score: float | None, pass_mark: float) -> dict:
+    def contribution(score):
+        if score is None:
+            return {"graded_count": 0, "pass_count": 0, "score_sum": 0.0, "score_sq_sum": 0.0}
+        return {
+            "graded_count": 1,
+            "pass_count": int(score >= pass_mark),
+            "score_sum": float(score),
+            "score_sq_sum": float(score) ** 2,
+        }
+
+    old, new = contribution(old_score), contribution(new_score)
+    return {key: new[key] - old[key] for key in new}
+
+
+def summarize(rollup) -> dict:
+    n = rollup.graded_count if rollup else 0
+    if not n:
+        return {"graded": 0, "average_score": 0.0, "stddev_score": None, "pass_count": 0, "pass_rate": 0.0}
+
+    mean = rollup.score_sum / n
+    variance = (rollup.score_sq_sum - n * mean * mean) / (n - 1) if n > 1 else None
+    return {
+        "graded": n,
+        "average_score": mean,
+        "stddev_score": math.sqrt(max(variance, 0.0)) if variance is not None else None,
+        "pass_count": rollup.pass_count,
+        "pass_rate": rollup.pass_count / n * 100,
+    }
+
+
+class AnalyticsRollupService:
+    """Keeps per-exam, per-course-semester and per-student-semester score rollups current.
+
+    Grade writes call `apply_grade` inside their own transaction, so a rollup
+    never disagrees with the committed grade logs. `rebuild` recomputes every
+    rollup from raw rows for backfills, and `rebuild_exam` recomputes the rows
+    one exam feeds after its pass mark, course or semester changes.
+    """
+
+    def __init__(self, db_session: Session):
+        self.db = db_session
+        self.logger = logging.getLogger("Analytics Rollup Service")
+
+    def apply_grade(self, submission_id: UUID, old_score: float | None, new_score: float | None):
+        """Stage the rollup deltas for one grade change; the caller commits."""
+        row = (
+            self.db.query(
+                *[column.label(f"{model.__tablename__}_{key}")
+                  for model, keys in ROLLUP_KEYS.items() for key, column in keys.items()],
+                Exam.pass_mark,
+            )
+            .select_from(Submission)
+            .join(Exam, Submission.exam_id == Exam.id)
+            .filter(Submission.id == submission_id)
+            .one_or_none()
+        )
+        if row is None:
+            raise NotFoundError("Submission not found")
+
+        pass_mark = row.pass_mark if row.pass_mark is not None else DEFAULT_PASS_MARK
+        deltas = score_deltas(old_score, new_score, pass_mark)
+        if not any(deltas.values()):
+            return
+
+        for model, keys in ROLLUP_KEYS.items():
+            key_values = {key: getattr(row, f"{model.__tablename__}_{key}") for key in keys}
+            if any(value is None for value in key_values.values()):
+                continue  # e.g. candidate submissions have no user
+
+            stmt = insert(model).values(**key_values, **deltas)
+            self.db.execute(stmt.on_conflict_do_update(
+                index_elements=list(key_values),
+                set_={
+                    **{column: getattr(model, column) + stmt.excluded[column] for column in deltas},
+                    "updated_at": func.now(),
+                },
+            ))
+
+    def _refill(self, model, rollup_scope=None, source_scope=None):
+        """Replace the rollup rows in `rollup_scope` with aggregates of the grade logs in `source_scope`."""
+        keys = ROLLUP_KEYS[model]
+        score = GradeLog.score
+        passed = func.count(score).filter(score >= func.coalesce(Exam.pass_mark, DEFAULT_PASS_MARK))
+        source = (
+            select(*keys.values(), func.count(score), passed, func.sum(score), func.sum(score * score))
+            .select_from(GradeLog)
+            .join(Submission, GradeLog.submission_id == Submission.id)
+            .join(Exam, Submission.exam_id == Exam.id)
+            .where(*[column.isnot(None) for column in keys.values()])
+            .group_by(*keys.values())
+        )
+        stale = delete(model)
+        if source_scope is not None:
+            source = source.where(source_scope)
+            stale = stale.where(rollup_scope)
+
+        self.db.execute(stale)
+        self.db.execute(insert(model).from_select(
+            [*keys, "graded_count", "pass_count", "score_sum", "score_sq_sum"], source
+        ))
+
+    def rebuild(self):
+        try:
+            # hold off grade writes so no delta lands on a half-rebuilt rollup
+            self.db.execute(text("LOCK TABLE gradelog IN SHARE MODE"))
+            for model in ROLLUP_KEYS:
+                self._refill(model)
+            self.db.commit()
+            self.logger.info("Rebuilt score rollups")
+        except Exception as e:
+            self.db.rollback()
+            self.logger.error(f"Failed to rebuild score rollups: {e}")
+            raise ServiceError("Could not rebuild score rollups") from e
+
+    def rebuild_exam(self, exam_id: UUID, old_course_id: UUID | None, old_semester_id: UUID | None):
+        """Stage a recompute of every rollup row the exam feeds, before and after its update; the caller commits."""
+        self.db.flush()
+        exam = self.db.get(Exam, exam_id)
+        if exam is None:
+            raise NotFoundError("Exam not found")
+
+        pairs = [
+            (course_id, semester_id)
+            for course_id, semester_id in {(old_course_id, old_semester_id), (exam.course_id, exam.semester_id)}
+            if course_id is not None and semester_id is not None
+        ]
+        semesters = [s for s in {old_semester_id, exam.semester_id} if s is not None]
+        users = select(Submission.user_id).where(Submission.exam_id == exam_id, Submission.user_id.isnot(None))
+        scopes = {
+            ExamScoreRollup: (ExamScoreRollup.exam_id == exam_id, Exam.id == exam_id),
+            CourseSemesterScoreRollup: (
+                tuple_(CourseSemesterScoreRollup.course_id, CourseSemesterScoreRollup.semester_id).in_(pairs),
+                tuple_(Exam.course_id, Exam.semester_id).in_(pairs),
+            ),
+            StudentSemesterScoreRollup: (
+                and_(StudentSemesterScoreRollup.semester_id.in_(semesters),
+                     StudentSemesterScoreRollup.user_id.in_(users)),
+                and_(Exam.semester_id.in_(semesters), Submission.user_id.in_(users)),
+            ),
+        }
+
+        self.db.execute(text("LOCK TABLE gradelog IN SHARE MODE"))
+        for model, (rollup_scope, source_scope) in scopes.items():
+            self._refill(model, rollup_scope, source_scope)
+
+    def exam_summary(self, exam_id: UUID) -> dict:
+        if self.db.get(Exam, exam_id) is None:
+            raise NotFoundError("Exam not found")
+        return {"exam_id": exam_id, **summarize(self.db.get(ExamScoreRollup, exam_id))}
+
+    def course_semester_summary(self, course_id: UUID, semester_id: UUID) -> dict:
+        rollup = self.db.get(CourseSemesterScoreRollup, (course_id, semester_id))
+        return {"course_id": course_id, "semester_id": semester_id, **summarize(rollup)}
+
+    def student_semester_summaries(self, user_id: UUID) -> list[dict]:
+        rollups = (
+            self.db.query(StudentSemesterScoreRollup)
+            .filter(StudentSemesterScoreRollup.user_id == user_id)
+            .all()
+        )
+        return [{"semester_id": r.semester_id, **summarize(r)} for r in rollups]
+
+
+if __name__ == "__main__":
+    import argparse
+    from src.db.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Maintain analytics score rollups")
+    parser.add_argument("action", choices=["rebuild"])
+    parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        AnalyticsRollupService(db).rebuild()
+    finally:
+        db.close()
@@ -2,7 +2,8 @@ import logging
 from sqlalchemy.orm import Session
 from uuid import UUID
 from src.db.models import Answer
-from src.services.questions import ServiceError, NotFoundError
+from src.utils.exceptions import ServiceError, NotFoundError, ValidationError
+from src.utils.pagination import paginate
 
 class AnswerService:
     def __init__(self, db: Session):
@@ -51,17 +52,20 @@ class AnswerService:
             self.logger.error(f"Update answer failed: {e}")
             raise ServiceError("Could not update answer") from e
 
-    def list_answers(self, limit: int = 25, offset: int = 0):
+    def list_answers(self, limit: int = 25, cursor: str | None = None):
         try:
-            answers = self.db.query(Answer).limit(limit).offset(offset).all()
+            answers, next_cursor = paginate(self.db.query(Answer), [Answer.id], limit, cursor)
 
-            return [{
+            items = [{
                 "answer_id": answer.id,
                 "text": answer.text,
                 "options": answer.options,
                 "correct_option": answer.correct_option
             } for answer in answers
             ]
+            return {"items": items, "next_cursor": next_cursor}
+        except ValidationError:
+            raise
         except Exception as e:
             self.logger.error(f"List answers failed: {e}")
             raise ServiceError("Could not list answers") from e
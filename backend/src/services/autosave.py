@@ -0,0 +1,164 @@
+import asyncio
+import logging
+from uuid import UUID
+from sqlalchemy.exc import IntegrityError
+from config import settings
+from src.services.submission import answer_upsert_statement
+from src.utils.exceptions import ServiceError
+
+
+async def write_answers(rows: list[dict]):
+    from src.db.async_database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(answer_upsert_statement(rows))
+        await db.commit()
+
+
+class AutosaveBuffer:
+    """Write-behind buffer for candidate answers.
+
+    Autosaves are coalesced per (submission_id, question_id) so only the latest
+    answer is written, and everything pending goes out as one multi-row upsert
+    (split into `chunk_size` row chunks) every `flush_interval` seconds, or in
+    the background once `max_pending` answers are waiting. Only a chunk the
+    database rejects outright is split up, to log and drop the offending rows.
+    Pending answers live in this process only, so submitting takes the
+    candidate's answers with `take` and writes them in the submit transaction.
+    """
+
+    def __init__(self, write=write_answers, flush_interval: float = settings.AUTOSAVE_FLUSH_INTERVAL,
+                 max_pending: int = settings.AUTOSAVE_MAX_PENDING, chunk_size: int = 1000):
+        self.logger = logging.getLogger("Autosave Buffer")
+        self.write = write
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.chunk_size = chunk_size
+        self._pending: dict[tuple[UUID, UUID], str] = {}
+        # guards _pending and _in_flight only; never held across database I/O
+        self._changed = asyncio.Condition()
+        self._in_flight: set[UUID] = set()
+        # one flush at a time, so an older answer never lands after a newer one for the same key
+        self._write_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._size_flush: asyncio.Task | None = None
+
+    def __len__(self):
+        return len(self._pending)
+
+    async def add(self, submission_id: UUID, answers: dict[UUID, str]):
+        for question_id, answer in answers.items():
+            self._pending[(submission_id, question_id)] = answer
+
+        if len(self._pending) >= self.max_pending and (self._size_flush is None or self._size_flush.done()):
+            # flush off the request path; the autosave itself is already buffered
+            self._size_flush = asyncio.create_task(self._flush_quietly())
+
+    async def take(self, submission_id: UUID) -> dict[UUID, str]:
+        """Remove and return a submission's pending answers, for callers that write them themselves.
+
+        Waits only while a flush is writing that submission's rows, so the caller's write lands last.
+        """
+        async with self._changed:
+            await self._changed.wait_for(lambda: submission_id not in self._in_flight)
+            keys = [key for key in self._pending if key[0] == submission_id]
+            return {key[1]: self._pending.pop(key) for key in keys}
+
+    def restore(self, submission_id: UUID, answers: dict[UUID, str]):
+        """Put back answers from `take` whose write failed, without overwriting newer ones."""
+        for question_id, answer in answers.items():
+            self._pending.setdefault((submission_id, question_id), answer)
+
+    def _drain(self, submission_ids) -> dict[tuple[UUID, UUID], str]:
+        if not submission_ids:
+            batch, self._pending = self._pending, {}
+            return batch
+        wanted = set(submission_ids)
+        return {key: self._pending.pop(key) for key in [key for key in self._pending if key[0] in wanted]}
+
+    async def _write_rows(self, rows: list[dict]) -> int:
+        """Write rows as one statement; on a constraint violation, split to find and drop the bad rows."""
+        try:
+            await self.write(rows)
+            return len(rows)
+        except IntegrityError:
+            if len(rows) == 1:
+                row = rows[0]
+                self.logger.error(
+                    f"Dropping autosaved answer for submission {row['submission_id']}, "
+                    f"question {row['question_id']}: rejected by the database"
+                )
+                return 0
+
+        submissions = {row["submission_id"] for row in rows}
+        if len(submissions) > 1:
+            groups = [[row for row in rows if row["submission_id"] == sub_id] for sub_id in submissions]
+        else:
+            groups = [[row] for row in rows]
+        written = 0
+        for group in groups:
+            written += await self._write_rows(group)
+        return written
+
+    async def flush(self, *submission_ids: UUID) -> int:
+        """Write pending answers, for the given submissions or all of them. Returns the rows written."""
+        async with self._write_lock:
+            async with self._changed:
+                batch = self._drain(submission_ids)
+                self._in_flight = {sub_id for sub_id, _ in batch}
+            rows = [
+                {"submission_id": sub_id, "question_id": question_id, "answer": answer}
+                for (sub_id, question_id), answer in batch.items()
+            ]
+
+            written, failed = 0, 0
+            try:
+                for start in range(0, len(rows), self.chunk_size):
+                    chunk = rows[start:start + self.chunk_size]
+                    try:
+                        written += await self._write_rows(chunk)
+                    except Exception as e:
+                        # keep anything newer that arrived while the write was in flight
+                        for row in chunk:
+                            self._pending.setdefault((row["submission_id"], row["question_id"]), row["answer"])
+                        failed += len(chunk)
+                        self.logger.error(f"Failed to flush {len(chunk)} autosaved answers: {e}")
+            finally:
+                async with self._changed:
+                    self._in_flight = set()
+                    self._changed.notify_all()
+
+            if failed:
+                raise ServiceError("Could not save answers")
+            return written
+
+    async def _flush_quietly(self):
+        try:
+            await self.flush()
+        except ServiceError:
+            pass  # answers stay pending and are retried on the next tick
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self._flush_quietly()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._size_flush is not None:
+            await self._size_flush
+            self._size_flush = None
+        await self.flush()
+
+
+autosave_buffer = AutosaveBuffer()
@@ -1,18 +1,49 @@
-from datetime import datetime
-from src.db.models import CandidateExamSession, ExamStatus, Answer
-from src.utils.exceptions import NotFoundError, ServiceError
-
-class CandidateExamService:
-    def __init__(self, db, logger):
+import json
+from uuid import UUID
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, update
+from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.db.models import CandidateExamSession, ExamStatus, Exam, Question, Submission
+from src.schemas.candidate_exam import AnswerInput
+from src.services.autosave import AutosaveBuffer, autosave_buffer
+from src.services.exam_paper import ExamPaper, exam_paper_cache
+from src.services.session_state import SessionState, session_state_cache
+from src.services.submission import answer_upsert_statement
+from src.utils.cache import TTLCache
+from src.utils.jwt_handler import JWTHandler
+from src.utils.exceptions import NotFoundError, ServiceError, ValidationError
+
+# exam code / id -> the fields candidates need before a session exists
+exam_lookup_cache = TTLCache(max_size=4096, ttl=300)
+
+def utcnow() -> datetime:
+    # session timestamps are stored as naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def encode_answer(answer: AnswerInput) -> str:
+    return json.dumps(answer.payload, separators=(",", ":"), sort_keys=True)
+
+def serialize_question(question: Question) -> dict:
+    options = next((a.options for a in question.answers if a.options), None)
+    return {
+        "id": question.id,
+        "type": question.type.value if question.type else None,
+        "prompt": question.text,
+        "options": options,   # MCQ only
+        "required": True,
+    }
+
+class AsyncCandidateExamService:
+    """Candidate exam flow on an AsyncSession: entering, starting, autosaving and submitting."""
+
+    def __init__(self, db: AsyncSession, logger, buffer: AutosaveBuffer | None = None):
         self.db = db
         self.logger = logger
+        self.buffer = buffer if buffer is not None else autosave_buffer
 
-    def _get_active_session(self, session_id):
-        session = (
-            self.db.query(CandidateExamSession)
-            .filter(CandidateExamSession.id == session_id)
-            .one_or_none()
-        )
+    async def _get_active_session(self, session_id):
+        session = await self.db.get(CandidateExamSession, session_id)
 
         if not session:
             raise NotFoundError("Exam session not found")
@@ -20,88 +51,78 @@ class CandidateExamService:
         if session.status != ExamStatus.IN_PROGRESS:
             raise ServiceError("Exam session is not active")
 
-        if datetime.now(datetime.UTC) > session.ends_at:
-            session.status = ExamStatus.TIMED_OUT
-            self.db.commit()
+        # expiry is written by the session sweeper, not on the request path
+        if utcnow() > session.ends_at:
             raise ServiceError("Exam session has expired")
 
         return session
 
-    def upsert_submission_answer(self, submission_id: UUID, question_id: UUID, answer_text: str):
-        record = (
-            self.db.query(SubmissionAnswer)
-            .filter_by(
-                submission_id=submission_id,
-                question_id=question_id,
-            )
-            .first()
-        )
-
-        if record:
-            record.answer = answer_text
-        else:
-            record = SubmissionAnswer(
-                submission_id=submission_id,
-                question_id=question_id,
-                answer=answer_text,
-            )
-            self.db.add(record)
-
-        self.db.commit()
-        return record
-
-    def enter_exam(self, exam_code: str) -> Exam:
-        exam = (
-            self.db.query(Exam)
-            .filter(Exam.exam_code == exam_code)
-            .one_or_none()
-        )
-
+    def _exam_info(self, exam: Exam | None) -> dict | None:
         if not exam:
+            return None
+        info = {"exam_id": exam.id, "title": exam.title, "duration_minutes": exam.duration}
+        exam_lookup_cache.set(("code", exam.exam_code), info)
+        exam_lookup_cache.set(("id", exam.id), info)
+        return info
+
+    async def enter_exam(self, exam_code: str) -> dict:
+        info = exam_lookup_cache.get(("code", exam_code))
+        if info is None:
+            info = self._exam_info((
+                await self.db.execute(select(Exam).where(Exam.exam_code == exam_code))
+            ).scalar_one_or_none())
+
+        if not info:
             raise ServiceError("Invalid exam code")
 
-        return exam
+        return info
 
-    def start_exam(
+    async def start_exam(
             self,
             exam_id: UUID,
             candidate_name: str,
             candidate_ref: str | None = None,
     ):
-        exam = self.db.query(Exam).filter(Exam.id == exam_id).one_or_none()
+        exam = exam_lookup_cache.get(("id", exam_id))
+        if exam is None:
+            exam = self._exam_info(await self.db.get(Exam, exam_id))
         if not exam:
             raise ServiceError("Exam not found")
 
         if candidate_ref:
             existing = (
-                self.db.query(CandidateExamSession)
-                .filter(
-                    CandidateExamSession.exam_id == exam_id,
-                    CandidateExamSession.candidate_ref == candidate_ref,
+                await self.db.execute(
+                    select(CandidateExamSession.id)
+                    .where(
+                        CandidateExamSession.exam_id == exam_id,
+                        CandidateExamSession.candidate_ref == candidate_ref,
+                    )
+                    .limit(1)
                 )
-                .first()
-            )
+            ).first()
             if existing:
                 raise ServiceError("Candidate has already started this exam")
 
-        now = datetime.now(datetime.UTC)
-        ends_at = now + timedelta(minutes=exam.duration_minutes)
+        now = utcnow()
+        ends_at = now + timedelta(minutes=exam["duration_minutes"])
 
         session = CandidateExamSession(
-            exam_id=exam.id,
+            exam_id=exam_id,
             candidate_name=candidate_name,
             candidate_ref=candidate_ref,
             started_at=now,
             ends_at=ends_at,
             status=ExamStatus.IN_PROGRESS,
         )
+        submission = Submission(exam_id=exam_id, candidate_session=session)
 
-        self.db.add(session)
-        self.db.commit()
-        self.db.refresh(session)
+        self.db.add_all([session, submission])
+        await self.db.commit()
 
-        token = create_candidate_jwt(
-            session_id=session.id,
+        token = JWTHandler().create_candidate_jwt(
+            exam_session_id=session.id,
+            submission_id=submission.id,
+            exam_id=exam_id,
             expires_at=ends_at,
         )
 
@@ -111,47 +132,73 @@ class CandidateExamService:
             "token": token,
         }
 
-    def get_questions(self, session_id: UUID) -> list[dict]:
-        session = self._get_active_session(session_id)
-
+    async def _load_questions(self, exam_id: UUID) -> list[dict]:
         questions = (
-            self.db.query(Question)
-            .filter(Question.exam_id == session.exam_id)
-            .all()
-        )
-
-        return [
-            {
-                "id": q.id,
-                "type": q.type,
-                "prompt": q.prompt,
-                "options": q.options,   # MCQ only
-                "required": q.required,
-            }
-            for q in questions
-        ]
-
-    def autosave(self, session_id: UUID, answers: list[AnswerInput]):
-        session = self._get_active_session(session_id)
-
-        for answer in answers:
-            self.upsert_submission_answer(
-                db=self.db,
-                session_id=session.id,
-                question_id=answer.question_id,
-                payload=answer.payload,
+            await self.db.execute(
+                select(Question)
+                .options(selectinload(Question.answers))
+                .where(Question.exam_id == exam_id)
             )
+        ).scalars().all()
+
+        return [serialize_question(q) for q in questions]
 
-        self.db.commit()
+    async def get_questions(self, session_id: UUID) -> list[dict]:
+        session = await self._get_active_session(session_id)
+        return await self._load_questions(session.exam_id)
 
-    def submit_exam(self, session_id: UUID):
-        session = self._get_active_session(session_id)
+    async def get_paper(self, state: SessionState) -> ExamPaper:
+        """The session's question list, pre-serialized and shared by every candidate on the exam."""
+        return await exam_paper_cache.get_or_load(
+            state.exam_id, lambda: self._load_questions(state.exam_id)
+        )
 
-        if datetime.now(datetime.UTC) > session.ends_at:
-            session.status = ExamStatus.EXPIRED
-        else:
-            session.status =ExamStatus.SUBMITTED
+    async def _submission_id(self, session_id: UUID) -> UUID:
+        submission_id = (
+            await self.db.execute(
+                select(Submission.id).where(Submission.candidate_session_id == session_id)
+            )
+        ).scalar()
+        if not submission_id:
+            raise NotFoundError("Submission for exam session not found")
+        return submission_id
+
+    async def autosave(self, state: SessionState, answers: list[AnswerInput]):
+        paper = await self.get_paper(state)
+        unknown = {answer.question_id for answer in answers} - paper.question_ids
+        if unknown:
+            raise ValidationError(
+                f"Questions not in this session's exam: {', '.join(sorted(map(str, unknown)))}"
+            )
 
-        session.submitted_at = datetime.now(datetime.UTC)
-        self.db.commit()
+        await self.buffer.add(
+            state.submission_id,
+            {answer.question_id: encode_answer(answer) for answer in answers},
+        )
 
+    async def submit_exam(self, state: SessionState):
+        session = await self._get_active_session(state.session_id)
+
+        # written in the submit transaction, so they cannot be lost with this process's buffer
+        pending = await self.buffer.take(state.submission_id)
+        try:
+            if pending:
+                await self.db.execute(answer_upsert_statement([
+                    {"submission_id": state.submission_id, "question_id": question_id, "answer": answer}
+                    for question_id, answer in pending.items()
+                ]))
+
+            session.status = ExamStatus.SUBMITTED
+            session.submitted_at = utcnow()
+            await self.db.execute(
+                update(Submission)
+                .where(Submission.id == state.submission_id)
+                .values(submitted_at=session.submitted_at)
+            )
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            self.buffer.restore(state.submission_id, pending)
+            self.logger.error(f"Failed to submit exam session {state.session_id}: {e}")
+            raise ServiceError("Could not submit exam") from e
+        await session_state_cache.delete(session.id)
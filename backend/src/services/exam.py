@@ -2,7 +2,11 @@ import logging
 from uuid import UUID
 from sqlalchemy.orm import Session, joinedload
 from src.db.models import Exam, Question, ExamSession, ExamStatus
-from src.utils.exceptions import NotFoundError, ServiceError
+from src.utils.exceptions import NotFoundError, ServiceError, ValidationError
+from src.utils.pagination import paginate
+from src.services.exam_paper import exam_paper_cache
+from src.services.candidate_exam import exam_lookup_cache
+from src.services.analytics_rollup import AnalyticsRollupService
 
 class ExamService:
     def __init__(self, db_session: Session):
@@ -96,10 +100,13 @@ class ExamService:
             if not question:
                 raise NotFoundError(f"Question {question_id} not found")
 
+            previous_exam_id = question.exam_id
             question.exam_id = exam_id
             self.db.add(question)
             self.db.commit()
             self.db.refresh(question)
+            exam_paper_cache.invalidate(previous_exam_id)
+            exam_paper_cache.invalidate(exam_id)
             return question
         except NotFoundError:
             raise
@@ -122,6 +129,7 @@ class ExamService:
             self.db.add(question)
             self.db.commit()
             self.db.refresh(question)
+            exam_paper_cache.invalidate(exam_id)
             return True
         except Exception as e:
             self.logger.error(f"Failed to add question to exam: {e}")
@@ -129,14 +137,16 @@ class ExamService:
             raise ServiceError(f"Failed to add question to exam: {e}")
 
 
-    def list_exams(self, title: str | None = None, limit: int = 50, offset: int = 0):
+    def list_exams(self, title: str | None = None, limit: int = 50, cursor: str | None = None):
         try:
             query = self.db.query(Exam)
             if title:
                 query = query.filter(Exam.title.ilike(f"%{title}%"))
 
-            exams = query.limit(limit).offset(offset).all()
-            return exams
+            exams, next_cursor = paginate(query, [Exam.created_at, Exam.id], limit, cursor, descending=True)
+            return {"items": exams, "next_cursor": next_cursor}
+        except ValidationError:
+            raise
         except Exception as e:
             self.logger.error(f"Failed to list exams: {e}")
             raise ServiceError(f"Failed to list exams: {e}")
@@ -153,18 +163,36 @@ class ExamService:
             )
             raise ServiceError(f"Failed to fetch exams : {e}")
 
-    def update_exam(self, exam_id: UUID, title: str | None=None):
+    def update_exam(self, exam_id: UUID, title: str | None=None, duration: int | None=None,
+                    pass_mark: float | None=None, course_id: UUID | None=None, semester_id: UUID | None=None):
         try:
             updated_exam = self.db.query(Exam).filter(Exam.id == exam_id).first()
+            if not updated_exam:
+                return None
 
+            rollup_keys = (updated_exam.pass_mark, updated_exam.course_id, updated_exam.semester_id)
             if title:
                 updated_exam.title = title
+            if duration is not None:
+                updated_exam.duration = duration
+            if pass_mark is not None:
+                updated_exam.pass_mark = pass_mark
+            if course_id is not None:
+                updated_exam.course_id = course_id
+            if semester_id is not None:
+                updated_exam.semester_id = semester_id
 
             self.db.add(updated_exam)
+            if (updated_exam.pass_mark, updated_exam.course_id, updated_exam.semester_id) != rollup_keys:
+                # rollups counted passes and grouped scores under the old values
+                _, old_course_id, old_semester_id = rollup_keys
+                AnalyticsRollupService(self.db).rebuild_exam(exam_id, old_course_id, old_semester_id)
             self.db.commit()
             self.db.refresh(updated_exam)
+            exam_lookup_cache.clear()
             return updated_exam
         except Exception as e:
+            self.db.rollback()
             self.logger.error(
                 f"Failed to fetch exam with id: {exam_id} : {e}"
             )
@@ -177,6 +205,7 @@ class ExamService:
             if exam:
                 self.db.delete(exam)
                 self.db.commit()
+                exam_lookup_cache.clear()
                 return True
             return False
         except Exception as e:
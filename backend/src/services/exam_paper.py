@@ -0,0 +1,83 @@
+import asyncio
+import hashlib
+from dataclasses import dataclass
+from typing import List
+from uuid import UUID
+from pydantic import TypeAdapter
+from src.schemas.candidate_exam import QuestionRead
+from src.utils.cache import TTLCache
+
+_question_list = TypeAdapter(List[QuestionRead])
+
+
+@dataclass(frozen=True)
+class ExamPaper:
+    body: bytes
+    etag: str
+    question_ids: frozenset = frozenset()
+
+
+def build_paper(questions: list[dict]) -> ExamPaper:
+    # validate first: dumping plain dicts would skip the schema entirely
+    validated = _question_list.validate_python(questions)
+    body = _question_list.dump_json(validated)
+    return ExamPaper(
+        body=body,
+        etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        question_ids=frozenset(q.id for q in validated),
+    )
+
+
+class ExamPaperCache:
+    """Serialized question lists keyed by (exam_id, version).
+
+    Writes that change a paper call `invalidate`, which bumps the exam's version
+    so stale entries are never read again. Versions are per process, so the TTL
+    bounds how long another worker can serve a paper after it changes.
+    """
+
+    def __init__(self, max_size: int = 256, ttl: float = 300):
+        self._papers = TTLCache(max_size=max_size, ttl=ttl)
+        self._versions: dict[UUID, int] = {}
+        self._loading: dict[UUID, asyncio.Lock] = {}
+
+    def version(self, exam_id: UUID) -> int:
+        return self._versions.get(exam_id, 0)
+
+    def invalidate(self, exam_id: UUID | None):
+        if exam_id is None:
+            return
+        version = self.version(exam_id)
+        self._versions[exam_id] = version + 1
+        self._papers.delete((exam_id, version))
+
+    def clear(self):
+        self._papers.clear()
+        self._versions.clear()
+
+    def get(self, exam_id: UUID) -> ExamPaper | None:
+        return self._papers.get((exam_id, self.version(exam_id)))
+
+    def set(self, exam_id: UUID, version: int, paper: ExamPaper):
+        if version == self.version(exam_id):
+            self._papers.set((exam_id, version), paper)
+
+    async def get_or_load(self, exam_id: UUID, load) -> ExamPaper:
+        """Return the cached paper, running the async `load` at most once per exam concurrently."""
+        paper = self.get(exam_id)
+        if paper is not None:
+            return paper
+
+        lock = self._loading.setdefault(exam_id, asyncio.Lock())
+        async with lock:
+            paper = self.get(exam_id)
+            if paper is None:
+                version = self.version(exam_id)
+                paper = build_paper(await load())
+                self.set(exam_id, version, paper)
+        if self._loading.get(exam_id) is lock and not lock.locked():
+            del self._loading[exam_id]
+        return paper
+
+
+exam_paper_cache = ExamPaperCache()
@@ -0,0 +1,157 @@
+import csv
+import io
+import logging
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from src.db.models import Exam, GradeLog, Semester, Submission, User
+from src.utils.exceptions import NotFoundError, ValidationError
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # parquet export is unavailable, CSV still works
+    pa = pq = None
+
+EXPORT_BATCH_SIZE = 2000
+EXPORT_FORMATS = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+EXPORT_COLUMNS = {
+    "submission_id": Submission.id,
+    "exam_id": Exam.id,
+    "exam_code": Exam.exam_code,
+    "exam_title": Exam.title,
+    "user_id": Submission.user_id,
+    "user_name": User.name,
+    "user_email": User.email,
+    "submitted_at": Submission.submitted_at,
+    "score": GradeLog.score,
+    "grader": GradeLog.grader,
+    "graded_at": GradeLog.graded_at,
+}
+
+
+def parquet_schema():
+    return pa.schema([
+        ("submission_id", pa.string()),
+        ("exam_id", pa.string()),
+        ("exam_code", pa.string()),
+        ("exam_title", pa.string()),
+        ("user_id", pa.string()),
+        ("user_name", pa.string()),
+        ("user_email", pa.string()),
+        ("submitted_at", pa.timestamp("us")),
+        ("score", pa.float64()),
+        ("grader", pa.string()),
+        ("graded_at", pa.timestamp("us")),
+    ])
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back whatever was written since the last `drain`."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def csv_chunks(batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def parquet_chunks(batches):
+    schema = parquet_schema()
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for rows in batches:
+            # one row group per batch, so only a batch is ever held in memory
+            columns = list(zip(*rows))
+            arrays = [
+                [None if v is None else str(v) for v in values] if field.type == pa.string() else list(values)
+                for field, values in zip(schema, columns)
+            ]
+            writer.write_table(pa.table(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+class GradeExportService:
+    """Streams graded submissions of an exam or a semester as CSV or Parquet with a server-side cursor."""
+
+    def __init__(self, db_session: Session):
+        self.db = db_session
+        self.logger = logging.getLogger("Grade Export Service")
+
+    def export_statement(self, exam_id: UUID | None = None, semester_id: UUID | None = None, fmt: str = "csv"):
+        """Validate an export request up front, so errors surface before the response starts streaming."""
+        if (exam_id is None) == (semester_id is None):
+            raise ValidationError("Export either an exam_id or a semester_id")
+        if fmt not in EXPORT_FORMATS:
+            raise ValidationError(f"Unsupported export format: {fmt}")
+        if fmt == "parquet" and pq is None:
+            raise ValidationError("Parquet export needs pyarrow installed")
+
+        if exam_id is not None and self.db.get(Exam, exam_id) is None:
+            raise NotFoundError("Exam not found")
+        if semester_id is not None and self.db.get(Semester, semester_id) is None:
+            raise NotFoundError("Semester not found")
+
+        scope = Exam.id == exam_id if exam_id is not None else Exam.semester_id == semester_id
+        return (
+            select(*EXPORT_COLUMNS.values())
+            .select_from(Submission)
+            .join(GradeLog, GradeLog.submission_id == Submission.id)
+            .join(Exam, Submission.exam_id == Exam.id)
+            .outerjoin(User, Submission.user_id == User.id)  # candidate submissions have no user
+            .where(scope)
+            .order_by(Exam.exam_code, Submission.submitted_at, Submission.id)
+        )
+
+    def stream(self, statement, fmt: str = "csv"):
+        result = self.db.execute(statement.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE))
+        batches = (list(batch) for batch in result.partitions())
+        encode = parquet_chunks if fmt == "parquet" else csv_chunks
+        try:
+            yield from encode(batches)
+        finally:
+            result.close()
+
+
+def stream_export(statement, fmt: str = "csv", session_factory=None):
+    """Run an export in its own session, since the request's session is closed before a streamed body is sent."""
+    if session_factory is None:
+        from src.db.database import SessionLocal
+        session_factory = SessionLocal
+
+    db = session_factory()
+    try:
+        yield from GradeExportService(db).stream(statement, fmt)
+    finally:
+        db.close()
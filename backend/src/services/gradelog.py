@@ -2,21 +2,29 @@ import logging
 from uuid import UUID
 from sqlalchemy.orm import Session
 from src.db.models import GradeLog
-from src.services.questions import ServiceError, NotFoundError
+from src.utils.exceptions import ServiceError, NotFoundError, ValidationError
+from src.utils.pagination import paginate
+from src.services.analytics_rollup import AnalyticsRollupService
 
 class GradeLogService:
     def __init__(self, db: Session):
         self.db = db
         self.logger = logging.getLogger(__name__)
+        self.rollups = AnalyticsRollupService(db)
 
-    def create_grade_log(self, user_id: UUID, exam_id: UUID, grade: float):
+    def create_grade_log(self, submission_id: UUID, score: float, grader: UUID, details: dict | None = None):
         try:
-            grade_log = GradeLog(user_id=user_id, exam_id=exam_id, grade=grade)
+            grade_log = GradeLog(submission_id=submission_id, score=score, grader=grader, details=details)
             self.db.add(grade_log)
+            self.rollups.apply_grade(submission_id, None, score)
             self.db.commit()
             self.db.refresh(grade_log)
             return grade_log
+        except NotFoundError:
+            self.db.rollback()
+            raise
         except Exception as e:
+            self.db.rollback()
             self.logger.error(f"Create grade log failed: {e}")
             raise ServiceError("Could not create grade log") from e
 
@@ -47,22 +55,34 @@ class GradeLogService:
     def update_grade_log(self, grade_log_id: UUID, **kwargs):
         try:
             grade_log = self.get_grade_log(grade_log_id)
+            old_submission_id, old_score = grade_log.submission_id, grade_log.score
             for key, value in kwargs.items():
                 setattr(grade_log, key, value)
+
+            if grade_log.submission_id != old_submission_id:
+                self.rollups.apply_grade(old_submission_id, old_score, None)
+                self.rollups.apply_grade(grade_log.submission_id, None, grade_log.score)
+            elif grade_log.score != old_score:
+                self.rollups.apply_grade(grade_log.submission_id, old_score, grade_log.score)
+
             self.db.commit()
             self.db.refresh(grade_log)
             return grade_log
         except NotFoundError:
+            self.db.rollback()
             raise
         except Exception as e:
+            self.db.rollback()
             self.logger.error(f"Update grade log failed: {e}")
             raise ServiceError("Could not update grade log") from e
 
-    def list_grades(self, limit: int = 25, offset: int = 0):
+    def list_grades(self, limit: int = 25, cursor: str | None = None):
         try:
-            grades = self.db.query(GradeLog).limit(limit).offset(offset).all()
+            grades, next_cursor = paginate(
+                self.db.query(GradeLog), [GradeLog.graded_at, GradeLog.id], limit, cursor, descending=True
+            )
 
-            return [{
+            items = [{
                 "grade_id": grade.id,
                 "score": grade.score,
                 "grader": grade.grader,
@@ -70,6 +90,9 @@ class GradeLogService:
                 "graded_at": grade.graded_at
             } for grade in grades
             ]
+            return {"items": items, "next_cursor": next_cursor}
+        except ValidationError:
+            raise
         except Exception as e:
             self.logger.error(f"List grade logs failed: {e}")
             raise ServiceError("Could not list grade logs") from e
@@ -77,11 +100,14 @@ class GradeLogService:
     def delete_grade_log(self, grade_log_id: UUID):
         try:
             grade_log = self.get_grade_log(grade_log_id)
+            self.rollups.apply_grade(grade_log.submission_id, grade_log.score, None)
             self.db.delete(grade_log)
             self.db.commit()
             return True
         except NotFoundError:
+            self.db.rollback()
             raise
         except Exception as e:
+            self.db.rollback()
             self.logger.error(f"Delete grade log failed: {e}")
             raise ServiceError("Could not delete grade log") from e
@@ -0,0 +1,212 @@
+import json
+import logging
+import numpy as np
+from uuid import UUID
+from sqlalchemy import case, select
+from sqlalchemy.orm import Session
+from src.db.models import Answer, Exam, ExamScoreRollup, GradeLog, Question, Submission, SubmissionAnswer
+from src.utils.cache import TTLCache
+from src.utils.exceptions import NotFoundError, ServiceError
+
+STREAM_BATCH_SIZE = 5000
+SCORE_BINS = np.linspace(0, 100, 11)
+OTHER_OPTION = "other"
+
+# (exam_id, grade version) -> analysis; a grade write changes the version, so entries never go stale
+item_analysis_cache = TTLCache(max_size=256, ttl=3600)
+
+
+def option_labels(options) -> list[str]:
+    if isinstance(options, dict):
+        return [str(key) for key in options]
+    if isinstance(options, list):
+        return [str(o["id"] if isinstance(o, dict) and "id" in o else o) for o in options]
+    return []
+
+
+def chosen_options(answer: str | None) -> list[str]:
+    """Options picked in a stored answer: a JSON payload such as {"option": "B"}, a JSON list, or plain text."""
+    if answer is None:
+        return []
+    try:
+        value = json.loads(answer)
+    except ValueError:
+        return [answer]
+    if isinstance(value, dict):
+        value = next((value[k] for k in ("option", "options", "selected", "answer") if k in value), None)
+    if value is None:
+        return []
+    return [str(v) for v in value] if isinstance(value, list) else [str(value)]
+
+
+def item_statistics(scores: np.ndarray, submission_index: np.ndarray, question_index: np.ndarray,
+                    correct: np.ndarray, num_questions: int) -> dict:
+    """Facility and point-biserial discrimination per question.
+
+    `scores` holds one total score per submission; the other arrays hold one
+    entry per answer. Unanswered questions count as incorrect.
+    """
+    n = len(scores)
+    responses = np.bincount(question_index, minlength=num_questions)
+    if not n:
+        return {"responses": responses, "facility": np.full(num_questions, np.nan),
+                "discrimination": np.full(num_questions, np.nan)}
+
+    right_questions = question_index[correct]
+    facility = np.bincount(right_questions, minlength=num_questions) / n
+    centered = scores - scores.mean()
+    # covariance of each 0/1 item column with the total score, without building the submissions x items matrix
+    covariance = np.bincount(right_questions, weights=centered[submission_index[correct]], minlength=num_questions) / n
+    spread = np.sqrt(facility * (1 - facility)) * scores.std()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        discrimination = np.where(spread > 0, covariance / spread, np.nan)
+    return {"responses": responses, "facility": facility, "discrimination": discrimination}
+
+
+def option_statistics(question_index: np.ndarray, option_index: np.ndarray, scores: np.ndarray,
+                      num_questions: int, num_options: int) -> tuple[np.ndarray, np.ndarray]:
+    """Per (question, option) pick counts and mean total score of the candidates who picked it."""
+    cells = question_index * num_options + option_index
+    size = num_questions * num_options
+    counts = np.bincount(cells, minlength=size)
+    totals = np.bincount(cells, weights=scores, minlength=size)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = np.where(counts > 0, totals / counts, np.nan)
+    return counts.reshape(num_questions, num_options), means.reshape(num_questions, num_options)
+
+
+def optional(value) -> float | None:
+    return None if np.isnan(value) else round(float(value), 4)
+
+
+class ItemAnalysisService:
+    """Classical test theory item analysis for one exam, computed with NumPy over streamed answer rows."""
+
+    def __init__(self, db_session: Session):
+        self.db = db_session
+        self.logger = logging.getLogger("Item Analysis Service")
+
+    def grade_version(self, exam_id: UUID):
+        rollup = self.db.get(ExamScoreRollup, exam_id)
+        return (rollup.graded_count, rollup.updated_at) if rollup else None
+
+    def exam_item_analysis(self, exam_id: UUID) -> dict:
+        try:
+            if self.db.get(Exam, exam_id) is None:
+                raise NotFoundError("Exam not found")
+
+            key = (exam_id, self.grade_version(exam_id))
+            analysis = item_analysis_cache.get(key)
+            if analysis is None:
+                analysis = self._analyse(exam_id)
+                item_analysis_cache.set(key, analysis)
+            return analysis
+        except NotFoundError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Item analysis failed for exam {exam_id}: {e}")
+            raise ServiceError("Could not compute item analysis") from e
+
+    def _analyse(self, exam_id: UUID) -> dict:
+        questions = (
+            self.db.query(Question.id, Question.text, Question.type)
+            .filter(Question.exam_id == exam_id)
+            .order_by(Question.id)
+            .all()
+        )
+        question_pos = {q.id: i for i, q in enumerate(questions)}
+        options = {
+            row.question_id: option_labels(row.options)
+            for row in self.db.query(Answer.question_id, Answer.options)
+            .filter(Answer.question_id.in_(question_pos), Answer.options.isnot(None))
+        }
+        options = {qid: labels for qid, labels in options.items() if labels}
+        option_pos = {qid: {label: i for i, label in enumerate(labels)} for qid, labels in options.items()}
+        num_options = max((len(labels) for labels in options.values()), default=0) + 1  # last slot is "other"
+
+        submission_pos, scores = {}, []
+        graded = self.db.execute(
+            select(Submission.id, GradeLog.score)
+            .join(GradeLog, GradeLog.submission_id == Submission.id)
+            .where(Submission.exam_id == exam_id, GradeLog.score.isnot(None))
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        for batch in graded.partitions():
+            for submission_id, score in batch:
+                submission_pos[submission_id] = len(scores)
+                scores.append(score)
+
+        submission_index, question_index, correct = [], [], []
+        picked_question, picked_option, picked_submission = [], [], []
+        answers = self.db.execute(
+            select(
+                SubmissionAnswer.submission_id,
+                SubmissionAnswer.question_id,
+                SubmissionAnswer.is_correct,
+                # only choice answers are needed, so long free-text answers stay in the database
+                case((SubmissionAnswer.question_id.in_(list(options)), SubmissionAnswer.answer)).label("answer"),
+            )
+            .join(Submission, SubmissionAnswer.submission_id == Submission.id)
+            .where(Submission.exam_id == exam_id)
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        for batch in answers.partitions():
+            for row in batch:
+                s = submission_pos.get(row.submission_id)
+                q = question_pos.get(row.question_id)
+                if s is None or q is None:
+                    continue  # ungraded submission or a question no longer on the exam
+                submission_index.append(s)
+                question_index.append(q)
+                correct.append(bool(row.is_correct))
+                if row.answer is not None:
+                    positions = option_pos[row.question_id]
+                    for label in chosen_options(row.answer):
+                        picked_question.append(q)
+                        picked_option.append(positions.get(label, num_options - 1))
+                        picked_submission.append(s)
+
+        scores = np.asarray(scores, dtype=float)
+        stats = item_statistics(
+            scores,
+            np.asarray(submission_index, dtype=np.intp),
+            np.asarray(question_index, dtype=np.intp),
+            np.asarray(correct, dtype=bool),
+            len(questions),
+        )
+        counts, means = option_statistics(
+            np.asarray(picked_question, dtype=np.intp),
+            np.asarray(picked_option, dtype=np.intp),
+            scores[np.asarray(picked_submission, dtype=np.intp)],
+            len(questions),
+            num_options,
+        )
+        histogram, _ = np.histogram(np.clip(scores, 0, 100), bins=SCORE_BINS)
+
+        items = []
+        for i, question in enumerate(questions):
+            labels = options.get(question.id)
+            items.append({
+                "question_id": question.id,
+                "question": question.text,
+                "type": question.type.value if question.type else None,
+                "responses": int(stats["responses"][i]),
+                "facility": optional(stats["facility"][i]),
+                "discrimination": optional(stats["discrimination"][i]),
+                "options": [
+                    {"option": label, "count": int(counts[i, j]), "mean_score": optional(means[i, j])}
+                    for j, label in [*enumerate(labels), (num_options - 1, OTHER_OPTION)]
+                ] if labels else None,
+            })
+
+        return {
+            "exam_id": exam_id,
+            "submissions": len(scores),
+            "average_score": optional(scores.mean()) if len(scores) else None,
+            "stddev_score": optional(scores.std(ddof=1)) if len(scores) > 1 else None,
+            "score_distribution": [
+                {"min_score": float(low), "max_score": float(high), "count": int(count)}
+                for low, high, count in zip(SCORE_BINS[:-1], SCORE_BINS[1:], histogram)
+            ],
+            "items": items,
+        }
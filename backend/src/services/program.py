@@ -3,6 +3,8 @@ from uuid import UUID
 from sqlalchemy.orm import Session
 from src.db.models import Program
 from src.services.question import ServiceError, NotFoundError
+from src.utils.exceptions import ValidationError
+from src.utils.grading import GradingScale
 
 class ProgramService:
     def __init__(self, db_session: Session):
@@ -34,13 +36,15 @@ class ProgramService:
 
     def update_program(self, program_id: UUID, **kwargs):
         try:
+            if kwargs.get("grading_scale"):
+                kwargs["grading_scale"] = GradingScale.from_dict(kwargs["grading_scale"]).to_dict()
             program = self.get_program(program_id)
             for key, value in kwargs.items():
                 setattr(program, key, value)
             self.db.commit()
             self.db.refresh(program)
             return program
-        except NotFoundError:
+        except (NotFoundError, ValidationError):
             raise
         except Exception as e:
             self.logger.error(f"Update program failed: {e}")
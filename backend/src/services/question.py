@@ -1,13 +1,26 @@
 import json
+import asyncio
 import logging
 from uuid import UUID
 from sqlalchemy import text
-from src.utils.embeddings import generate_embedding
+from src.utils.embeddings import generate_embedding, generate_embeddings, generate_query_embedding
 from src.db.models import Question, QuestionType
+from src.services.vector_index import apply_recall_profile, recall_profile_params, RECALL_SQL
+from src.services.exam_paper import exam_paper_cache
+from src.utils.cache import TTLCache
+from src.utils.pagination import paginate
 from sqlalchemy.orm import Session
-from src.utils.exceptions import ServiceError, NotFoundError
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.utils.exceptions import ServiceError, NotFoundError, ValidationError
+
+# facet counts per filter signature; cleared whenever the question bank changes
+tag_facet_cache = TTLCache(max_size=512, ttl=300)
 
 class QuestionService:
+    RRF_K = 60
+    HYBRID_CANDIDATE_FACTOR = 4
+    HYBRID_MIN_CANDIDATES = 20
+
     def __init__(self, db_session: Session):
         self.logger = logging.getLogger("Question Service")
         self.db = db_session
@@ -24,117 +37,150 @@ class QuestionService:
             if not bulk:
                 self.db.add(question)
                 self.db.commit()
+                tag_facet_cache.clear()
             return question
         except Exception as e:
             self.db.rollback()
             self.logger.error(f"Failed to store question: {e}")
             raise ServiceError("Could not store question")
 
-    def semantic_search(self, query: str, top_n: int = 5):
+    def _vector_param(self, embedding: list[float]) -> str:
+        # pgvector's text format; binds the same way on every driver
+        return "[" + ",".join(str(float(v)) for v in embedding) + "]"
+
+    def _filter_clause(self, params: dict, difficulty: str | None = None, tags: list[str] | None = None) -> str:
+        clause = ""
+        if difficulty:
+            clause += " AND difficulty = :difficulty"
+            params["difficulty"] = difficulty
+        if tags:
+            clause += " AND tags @> (:tags)::jsonb"
+            params["tags"] = json.dumps(tags)
+        return clause
+
+    def _semantic_statement(self, query_embedding: list[float], top_n: int):
+        sql = text("""
+            SELECT 
+                id, 
+                text, 
+                tags,
+                embedding <-> (:embedding)::vector AS similarity
+            FROM question
+            ORDER BY embedding <-> (:embedding)::vector
+            LIMIT :limit;
+        """)
+        return sql, {"embedding": self._vector_param(query_embedding), "limit": top_n}
+
+    def _keyword_statement(self, query: str, difficulty: str | None, tags: list[str] | None, limit: int):
+        params = {"query": query, "limit": limit}
+        sql = text(f"""
+            SELECT id, text, tags,
+                ts_rank_cd(search_vector, plainto_tsquery('english', :query)) AS rank
+            FROM question
+            WHERE search_vector @@ plainto_tsquery('english', :query)
+            {self._filter_clause(params, difficulty, tags)}
+            ORDER BY rank DESC
+            LIMIT :limit
+        """)
+        return sql, params
+
+    def _hybrid_statement(self, query: str, query_embedding: list[float], difficulty: str | None,
+                          tags: list[str] | None, top_n: int, weights: dict | None):
+        """Reciprocal rank fusion of keyword and semantic candidates in one statement.
+
+        Each signal contributes weight / (RRF_K + rank) for the rows it ranked,
+        so rows are matched by id rather than by list position.
+        """
+        if weights is None:
+            weights = {"text": 0.6, "semantic": 0.4}
+
+        params = {
+            "query": query,
+            "embedding": self._vector_param(query_embedding),
+            "candidates": max(top_n * self.HYBRID_CANDIDATE_FACTOR, self.HYBRID_MIN_CANDIDATES),
+            "limit": top_n,
+            "rrf_k": self.RRF_K,
+            "text_weight": float(weights["text"]),
+            "semantic_weight": float(weights["semantic"]),
+        }
+        filters = self._filter_clause(params, difficulty, tags)
+
+        sql = text(f"""
+            WITH keyword AS (
+                SELECT id, keyword_score, row_number() OVER (ORDER BY keyword_score DESC) AS keyword_rank
+                FROM (
+                    SELECT id, ts_rank_cd(search_vector, plainto_tsquery('english', :query)) AS keyword_score
+                    FROM question
+                    WHERE search_vector @@ plainto_tsquery('english', :query) {filters}
+                    ORDER BY keyword_score DESC
+                    LIMIT :candidates
+                ) k
+            ),
+            semantic AS (
+                SELECT id, semantic_distance, row_number() OVER (ORDER BY semantic_distance) AS semantic_rank
+                FROM (
+                    SELECT id, embedding <-> (:embedding)::vector AS semantic_distance
+                    FROM question
+                    WHERE embedding IS NOT NULL {filters}
+                    ORDER BY embedding <-> (:embedding)::vector
+                    LIMIT :candidates
+                ) s
+            ),
+            fused AS (
+                SELECT
+                    COALESCE(k.id, s.id) AS id,
+                    k.keyword_score, k.keyword_rank,
+                    s.semantic_distance, s.semantic_rank,
+                    COALESCE(CAST(:text_weight AS float8) / (CAST(:rrf_k AS integer) + k.keyword_rank), 0)
+                        + COALESCE(CAST(:semantic_weight AS float8) / (CAST(:rrf_k AS integer) + s.semantic_rank), 0)
+                        AS score
+                FROM keyword k
+                FULL OUTER JOIN semantic s ON s.id = k.id
+            )
+            SELECT q.id, q.text, q.tags, q.type, q.difficulty,
+                   f.score, f.keyword_score, f.keyword_rank, f.semantic_distance, f.semantic_rank
+            FROM fused f
+            JOIN question q ON q.id = f.id
+            ORDER BY f.score DESC
+            LIMIT :limit
+        """)
+        return sql, params
+
+    def semantic_search(self, query: str, top_n: int = 5, recall: str | None = None):
         try:
-            query_embedding = generate_embedding(query)
-
-            sql = text("""
-                SELECT 
-                    id, 
-                    text, 
-                    tags,
-                    embedding <-> (:embedding)::vector AS similarity
-                FROM question
-                ORDER BY embedding <-> (:embedding)::vector
-                LIMIT :limit;
-            """)
+            query_embedding = generate_query_embedding(query)
+            apply_recall_profile(self.db, recall, top_n)
 
-            results = self.db.execute(
-                sql,
-                {"embedding": query_embedding, "limit": top_n}
-            ).fetchall()
-            print("Semantic results:", results)
+            sql, params = self._semantic_statement(query_embedding, top_n)
+            results = self.db.execute(sql, params).fetchall()
             return results
         except Exception as e:
             self.logger.error(f"Semantic search failed: {e}")
             raise ServiceError("Could not perform semantic search")
 
-    def keyword_search(self, query:str, difficulty: str | None=None, tags: list[str] | None=None):
+    def keyword_search(self, query:str, difficulty: str | None=None, tags: list[str] | None=None, limit: int = 50):
         try:
-            sql_query = """
-                SELECT id, text, tags,
-                    ts_rank_cd(
-                        to_tsvector('english', text), 
-                        plainto_tsquery(:query)
-                    ) AS rank
-                FROM question
-                where to_tsvector('english', text) @@ plainto_tsquery(:query)
-            """
-
-            if difficulty:
-                sql_query += " AND difficulty = :difficulty"
-
-            if tags:
-                sql_query += " AND tags @> :tags::jsonb"
-
-            sql_query += " ORDER BY rank DESC"
-            sql = text(sql_query)
-
-            params = {"query": query}
-            if difficulty:
-                params["difficulty"] = difficulty
-            if tags:
-                params["tags"] = json.dumps(tags)
-
+            sql, params = self._keyword_statement(query, difficulty, tags, limit)
             text_results = self.db.execute(sql, params).fetchall()
-            print("Keyword results:", text_results)
             return text_results
         except Exception as e:
             self.logger.error(f"Keyword search failed: {e}")
             raise ServiceError("Could not perform keyword search")
 
-    def hybrid_search(self, query: str, difficulty: str | None=None, tags: list[str] | None=None, top_n: int = 5):
+    def hybrid_search(self, query: str, difficulty: str | None=None, tags: list[str] | None=None, top_n: int = 5,
+                      recall: str | None = None, weights: dict | None = None):
         try:
-            text_results = self.keyword_search(query, difficulty, tags)
-            semantic_results = self.semantic_search(query, top_n)
+            query_embedding = generate_query_embedding(query)
+            sql, params = self._hybrid_statement(query, query_embedding, difficulty, tags, top_n, weights)
+            # the semantic leg reads `candidates` rows from the index, not just top_n
+            apply_recall_profile(self.db, recall, params["candidates"])
 
-            text_scores = [row.rank for row in text_results]
-            semantic_scores = [row.similarity for row in semantic_results]
-
-            normalized_text = self.normalize_scores(text_scores)
-            normalized_semantic = self.normalize_scores(semantic_scores)
-
-            merged = [
-                {"id": tr.id, "text": tr.text, "tags": tr.tags,
-                 "score": self.merge_scores(ts,ss, weights={"text": 0.6, "semantic": 0.4})}
-                for tr, ts, ss in zip(text_results, normalized_text, normalized_semantic)
-            ]
-
-            ranked = self.sort_by_score(merged)
-            return ranked
+            rows = self.db.execute(sql, params).fetchall()
+            return [dict(row._mapping) for row in rows]
         except Exception as e:
             self.logger.error(f"Hybrid search failed: {e}")
             raise ServiceError("Could not perform hybrid search")
 
-    def merge_scores(self, text_score, semantic_score, weights=None):
-        if weights is None:
-            weights = {"text": 0.5, "semantic": 0.5}
-        return (
-            text_score * weights["text"]
-            + semantic_score * weights["semantic"]
-        )
-
-    def normalize_scores(self, raw_scores: list[float]) -> list[float]:
-        if not raw_scores:
-            return []
-
-        min_score = min(raw_scores)
-        max_score = max(raw_scores)
-
-        if max_score == min_score:
-            return [0.0 for _ in raw_scores]
-
-        return [(s - min_score) / (max_score - min_score) for s in raw_scores]
-
-    def sort_by_score(self, results: list[dict]) -> list[dict]:
-        return sorted(results, key=lambda r: r["score"], reverse=True)
-
     def get_question_by_id(self, question_id: UUID):
         try:
             question = self.db.query(Question).filter_by(id=question_id).first()
@@ -155,7 +201,34 @@ class QuestionService:
             self.logger.error(f"Get questions by tags failed: {e}")
             raise ServiceError("Could not fetch questions by tags")
 
-    def list_questions(self, tags=None, text=None, difficulty=None, limit=20, offset=0):
+    def tag_facets(self, tags: list[str] | None = None, difficulty: str | None = None, limit: int = 100):
+        try:
+            signature = json.dumps(
+                {"tags": sorted(tags or []), "difficulty": difficulty, "limit": limit}, sort_keys=True
+            )
+            cached = tag_facet_cache.get(signature)
+            if cached is not None:
+                return cached
+
+            params = {"limit": limit}
+            sql = text(f"""
+                SELECT tag, count(*) AS count
+                FROM question, jsonb_array_elements_text(question.tags) AS tag
+                WHERE jsonb_typeof(question.tags) = 'array'
+                {self._filter_clause(params, difficulty, tags)}
+                GROUP BY tag
+                ORDER BY count DESC, tag
+                LIMIT :limit
+            """)
+
+            facets = [{"tag": row.tag, "count": row.count} for row in self.db.execute(sql, params)]
+            tag_facet_cache.set(signature, facets)
+            return facets
+        except Exception as e:
+            self.logger.error(f"Tag facet count failed: {e}")
+            raise ServiceError("Could not count tag facets")
+
+    def list_questions(self, tags=None, text=None, difficulty=None, limit=20, cursor: str | None = None):
         try:
             query = self.db.query(Question)
             if tags:
@@ -167,8 +240,10 @@ class QuestionService:
             if difficulty:
                 query = query.filter(Question.difficulty == difficulty)
 
-            questions = query.limit(limit).offset(offset).all()
-            return questions
+            questions, next_cursor = paginate(query, [Question.id], limit, cursor)
+            return {"items": questions, "next_cursor": next_cursor}
+        except ValidationError:
+            raise
         except Exception as e:
             self.logger.error(f"List questions failed: {e}")
             raise ServiceError("Could not list questions")
@@ -189,6 +264,8 @@ class QuestionService:
             self.db.add(question)
             self.db.commit()
             self.db.refresh(question)
+            tag_facet_cache.clear()
+            exam_paper_cache.invalidate(question.exam_id)
             return True
         except NotFoundError as nf:
             self.logger.warning(str(nf))
@@ -202,8 +279,11 @@ class QuestionService:
         try:
             question = self.db.query(Question).filter(Question.id == question_id).first()
             if question:
+                exam_id = question.exam_id
                 self.db.delete(question)
                 self.db.commit()
+                tag_facet_cache.clear()
+                exam_paper_cache.invalidate(exam_id)
                 return True
             return False
         except Exception as e:
@@ -213,20 +293,77 @@ class QuestionService:
 
     def bulk_store_questions(self, questions: list[dict | Question]):
         try:
-            count = 0
-            stored = []
-            for question in questions:
-                text = question.get("text") if isinstance(question, dict) else question.text
-                tags = question.get("tags") if isinstance(question, dict) else question.tags
-                question = self.store_question(text, tags, bulk=True)
-                stored.append(question)
-                count += 1
+            payloads = [
+                question if isinstance(question, dict) else {
+                    "text": question.text,
+                    "tags": question.tags,
+                    "type": question.type,
+                    "difficulty": question.difficulty,
+                }
+                for question in questions
+            ]
+            embeddings = generate_embeddings([payload.get("text") for payload in payloads])
+
+            stored = [
+                Question(
+                    text=payload.get("text"),
+                    tags=payload.get("tags") or [],
+                    type=payload.get("type") or QuestionType.SHORT_ANSWER,
+                    difficulty=payload.get("difficulty"),
+                    embedding=embedding,
+                )
+                for payload, embedding in zip(payloads, embeddings)
+            ]
             self.db.add_all(stored)
             self.db.commit()
-            return {"message": f"Successfully stored {count} questions!!", "questions": stored}
+            tag_facet_cache.clear()
+            return {"message": f"Successfully stored {len(stored)} questions!!", "questions": stored}
         except Exception as e:
             self.db.rollback()
             self.logger.error(f"Bulk store failed: {e}")
             raise ServiceError("Could not bulk store questions")
 
-    #def get_random_question(self):
\ No newline at end of file
+    #def get_random_question(self):
+
+
+class AsyncQuestionService(QuestionService):
+    """Search paths on an AsyncSession; embedding calls run in a worker thread."""
+
+    def __init__(self, db_session: AsyncSession):
+        super().__init__(db_session)
+        self.logger = logging.getLogger("Async Question Service")
+
+    async def semantic_search(self, query: str, top_n: int = 5, recall: str | None = None):
+        try:
+            query_embedding = await asyncio.to_thread(generate_query_embedding, query)
+            await self.db.execute(RECALL_SQL, recall_profile_params(recall, top_n))
+
+            sql, params = self._semantic_statement(query_embedding, top_n)
+            results = (await self.db.execute(sql, params)).fetchall()
+            return results
+        except Exception as e:
+            self.logger.error(f"Semantic search failed: {e}")
+            raise ServiceError("Could not perform semantic search")
+
+    async def keyword_search(self, query: str, difficulty: str | None = None, tags: list[str] | None = None,
+                             limit: int = 50):
+        try:
+            sql, params = self._keyword_statement(query, difficulty, tags, limit)
+            return (await self.db.execute(sql, params)).fetchall()
+        except Exception as e:
+            self.logger.error(f"Keyword search failed: {e}")
+            raise ServiceError("Could not perform keyword search")
+
+    async def hybrid_search(self, query: str, difficulty: str | None = None, tags: list[str] | None = None,
+                            top_n: int = 5, recall: str | None = None, weights: dict | None = None):
+        try:
+            query_embedding = await asyncio.to_thread(generate_query_embedding, query)
+            sql, params = self._hybrid_statement(query, query_embedding, difficulty, tags, top_n, weights)
+            # the semantic leg reads `candidates` rows from the index, not just top_n
+            await self.db.execute(RECALL_SQL, recall_profile_params(recall, params["candidates"]))
+
+            rows = (await self.db.execute(sql, params)).fetchall()
+            return [dict(row._mapping) for row in rows]
+        except Exception as e:
+            self.logger.error(f"Hybrid search failed: {e}")
+            raise ServiceError("Could not perform hybrid search")
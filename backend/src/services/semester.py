@@ -2,7 +2,8 @@ import logging
 from sqlalchemy.orm import Session
 from src.db.models import Semester
 from uuid import UUID
-from src.utils.exceptions import NotFoundError, ServiceError
+from src.utils.exceptions import NotFoundError, ServiceError, ValidationError
+from src.utils.pagination import paginate
 
 class SemesterService:
     def __init__(self, db_session: Session):
@@ -46,16 +47,18 @@ class SemesterService:
             self.logger.error(f"Failed to fetch semester with id {semester_id}: {e}")
             raise ServiceError(f"Failed to fetch semester {semester_id}")
 
-    def list_semesters(self, name: str | None = None, limit: int = 50, offset: int = 0):
+    def list_semesters(self, name: str | None = None, limit: int = 50, cursor: str | None = None):
         try:
             query = self.db.query(Semester)
 
             if name:
                 query = query.filter(Semester.name.ilike(f"%{name}%"))
 
-            semesters = query.limit(limit).offset(offset).all()
-            return semesters
+            semesters, next_cursor = paginate(query, [Semester.start_date, Semester.id], limit, cursor)
+            return {"items": semesters, "next_cursor": next_cursor}
 
+        except ValidationError:
+            raise
         except Exception as e:
             self.logger.error(f"Failed to list semesters: {e}")
             raise ServiceError(f"Failed to list semesters: {e}")
@@ -116,3 +119,21 @@ class SemesterService:
         except Exception as e:
             self.logger.error(f"Failed to fetch exams for semester {semester_id}: {e}")
             raise ServiceError(f"Failed to fetch exams for semester {semester_id}: {e}")
+
+    def get_semester_by_date(self, start_date, end_date):
+        try:
+            semester = (
+                self.db.query(Semester)
+                .filter(Semester.start_date <= end_date, Semester.end_date >= start_date)
+                .order_by(Semester.start_date)
+                .first()
+            )
+            if not semester:
+                raise NotFoundError(f"No semester between {start_date} and {end_date}")
+            return semester
+
+        except NotFoundError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Failed to fetch semester between {start_date} and {end_date}: {e}")
+            raise ServiceError("Failed to fetch semester by date")
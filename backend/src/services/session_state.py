@@ -0,0 +1,108 @@
+import json
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+from config import settings
+from src.db.models import ExamStatus
+from src.utils.cache import TTLCache
+
+
+@dataclass(frozen=True)
+class SessionState:
+    session_id: UUID
+    exam_id: UUID
+    submission_id: UUID
+    status: ExamStatus
+    ends_at: datetime
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "session_id": str(self.session_id),
+            "exam_id": str(self.exam_id),
+            "submission_id": str(self.submission_id),
+            "status": self.status.value,
+            "ends_at": self.ends_at.isoformat(),
+        })
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> "SessionState":
+        data = json.loads(raw)
+        return cls(
+            session_id=UUID(data["session_id"]),
+            exam_id=UUID(data["exam_id"]),
+            submission_id=UUID(data["submission_id"]),
+            status=ExamStatus(data["status"]),
+            ends_at=datetime.fromisoformat(data["ends_at"]),
+        )
+
+
+class SessionStateCache(ABC):
+    """Short-lived cache of candidate session status, keyed by session id."""
+
+    @abstractmethod
+    async def get(self, session_id: UUID) -> SessionState | None: ...
+
+    @abstractmethod
+    async def set(self, state: SessionState): ...
+
+    @abstractmethod
+    async def delete(self, session_id: UUID): ...
+
+
+class InMemorySessionStateCache(SessionStateCache):
+    def __init__(self, max_size: int = 10_000, ttl: float = settings.SESSION_CACHE_TTL):
+        self._cache = TTLCache(max_size=max_size, ttl=ttl)
+
+    async def get(self, session_id: UUID) -> SessionState | None:
+        return self._cache.get(session_id)
+
+    async def set(self, state: SessionState):
+        self._cache.set(state.session_id, state)
+
+    async def delete(self, session_id: UUID):
+        self._cache.delete(session_id)
+
+
+class RedisSessionStateCache(SessionStateCache):
+    """Works with any client exposing redis.asyncio's awaitable get/set(ex=)/delete."""
+
+    def __init__(self, client, ttl: int = settings.SESSION_CACHE_TTL, prefix: str = "candidate_session:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.logger = logging.getLogger("Session State Cache")
+
+    def _key(self, session_id: UUID) -> str:
+        return f"{self.prefix}{session_id}"
+
+    async def get(self, session_id: UUID) -> SessionState | None:
+        try:
+            raw = await self.client.get(self._key(session_id))
+        except Exception as e:
+            # an unavailable cache falls back to the database
+            self.logger.warning(f"Session cache read failed: {e}")
+            return None
+        return SessionState.from_json(raw) if raw else None
+
+    async def set(self, state: SessionState):
+        try:
+            await self.client.set(self._key(state.session_id), state.to_json(), ex=self.ttl)
+        except Exception as e:
+            self.logger.warning(f"Session cache write failed: {e}")
+
+    async def delete(self, session_id: UUID):
+        # failures here must surface: a stale IN_PROGRESS entry would outlive submit
+        await self.client.delete(self._key(session_id))
+
+
+def _default_session_cache() -> SessionStateCache:
+    if settings.SESSION_CACHE_URL:
+        from redis import asyncio as redis
+
+        return RedisSessionStateCache(redis.Redis.from_url(settings.SESSION_CACHE_URL))
+    return InMemorySessionStateCache()
+
+
+session_state_cache = _default_session_cache()
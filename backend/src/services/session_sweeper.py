@@ -0,0 +1,150 @@
+import asyncio
+import logging
+from sqlalchemy import select, update, insert, exists, func
+from config import settings
+from src.db.models import CandidateExamSession, ExamStatus, Submission
+from src.services.autosave import AutosaveBuffer, autosave_buffer
+from src.services.candidate_exam import utcnow
+from src.services.session_state import session_state_cache
+from src.utils.exceptions import ServiceError
+
+
+class SessionSweeper:
+    """Expires overdue candidate sessions in batches and finalizes their submissions."""
+
+    def __init__(self, session_factory=None, buffer: AutosaveBuffer | None = None,
+                 batch_size: int = settings.SESSION_SWEEP_BATCH_SIZE,
+                 interval: float = settings.SESSION_SWEEP_INTERVAL):
+        self.logger = logging.getLogger("Session Sweeper")
+        self.session_factory = session_factory
+        self.buffer = buffer if buffer is not None else autosave_buffer
+        self.batch_size = batch_size
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    def _sessions(self):
+        if self.session_factory is None:
+            from src.db.async_database import AsyncSessionLocal
+            self.session_factory = AsyncSessionLocal
+        return self.session_factory()
+
+    async def _expire_batch(self) -> list:
+        overdue = (
+            select(CandidateExamSession.id)
+            .where(
+                CandidateExamSession.status == ExamStatus.IN_PROGRESS,
+                CandidateExamSession.ends_at < utcnow(),
+            )
+            .order_by(CandidateExamSession.ends_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+
+        async with self._sessions() as db:
+            expired = (
+                await db.execute(
+                    update(CandidateExamSession)
+                    .where(CandidateExamSession.id.in_(overdue.scalar_subquery()))
+                    .values(status=ExamStatus.EXPIRED, submitted_at=CandidateExamSession.ends_at)
+                    .returning(CandidateExamSession.id)
+                )
+            ).scalars().all()
+            if not expired:
+                return []
+
+            # the submission closes when the time ran out, not when the sweep ran
+            await db.execute(
+                update(Submission)
+                .where(
+                    Submission.candidate_session_id == CandidateExamSession.id,
+                    CandidateExamSession.id.in_(expired),
+                )
+                .values(submitted_at=CandidateExamSession.ends_at)
+            )
+            await db.execute(
+                insert(Submission).from_select(
+                    ["id", "exam_id", "candidate_session_id", "submitted_at"],
+                    select(
+                        func.gen_random_uuid(),
+                        CandidateExamSession.exam_id,
+                        CandidateExamSession.id,
+                        CandidateExamSession.ends_at,
+                    ).where(
+                        CandidateExamSession.id.in_(expired),
+                        ~exists().where(Submission.candidate_session_id == CandidateExamSession.id),
+                    ),
+                )
+            )
+            submission_ids = (
+                await db.execute(
+                    select(Submission.id).where(Submission.candidate_session_id.in_(expired))
+                )
+            ).scalars().all()
+            await db.commit()
+
+        for session_id in expired:
+            await session_state_cache.delete(session_id)
+        # other workers write their buffered answers for these on their own next flush
+        await self.buffer.flush(*submission_ids)
+        return expired
+
+    async def sweep(self) -> int:
+        """Expire every overdue session, one batch per transaction. Returns the number expired."""
+        total = 0
+        try:
+            while True:
+                expired = await self._expire_batch()
+                total += len(expired)
+                if len(expired) < self.batch_size:
+                    break
+        except ServiceError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Session sweep failed after {total} sessions: {e}")
+            raise ServiceError("Could not expire candidate sessions") from e
+
+        if total:
+            self.logger.info(f"Expired {total} candidate sessions")
+        return total
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sweep()
+            except ServiceError:
+                pass  # logged; retried on the next tick
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+session_sweeper = SessionSweeper()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Expire overdue candidate exam sessions")
+    parser.add_argument("--once", action="store_true", help="run a single sweep and exit")
+    parser.add_argument("--interval", type=float, default=settings.SESSION_SWEEP_INTERVAL)
+    parser.add_argument("--batch-size", type=int, default=settings.SESSION_SWEEP_BATCH_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    sweeper = SessionSweeper(batch_size=args.batch_size, interval=args.interval)
+
+    if args.once:
+        print(asyncio.run(sweeper.sweep()))
+    else:
+        asyncio.run(sweeper._run())
@@ -1,10 +1,24 @@
 import logging
 from uuid import UUID
+from sqlalchemy import and_
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.dialects.postgresql import insert
 from src.services.question import QuestionService
 from src.services.user import UserService
-from src.utils.exceptions import ServiceError, NotFoundError
-from src.db.models import Submission, SubmissionAnswer
+from src.utils.exceptions import ServiceError, NotFoundError, ValidationError
+from src.utils.pagination import paginate
+from src.db.models import Submission, SubmissionAnswer, Question
+
+def answer_upsert_statement(rows: list[dict]):
+    """Multi-row INSERT ... ON CONFLICT DO UPDATE on the (submission_id, question_id) key.
+
+    Rows must not repeat a key; Postgres rejects touching the same row twice in one statement.
+    """
+    stmt = insert(SubmissionAnswer).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[SubmissionAnswer.submission_id, SubmissionAnswer.question_id],
+        set_={"answer": stmt.excluded.answer},
+    )
 
 class SubmissionService:
     def __init__(self, db_session: Session):
@@ -57,6 +71,44 @@ class SubmissionService:
             self.logger.error(f"Failed to create submission: {e}")
             raise ServiceError("Could not create submission") from e
 
+    def add_answers(self, submission_id: UUID, answers: list[tuple[UUID, str]]):
+        """Upsert many (question_id, answer_text) pairs for one submission in a single statement."""
+        try:
+            latest = dict(answers)  # a repeated question keeps its last answer
+            if not latest:
+                return 0
+
+            rows = (
+                self.db.query(Submission.id, Question.id)
+                .outerjoin(
+                    Question,
+                    and_(Question.exam_id == Submission.exam_id, Question.id.in_(latest.keys())),
+                )
+                .filter(Submission.id == submission_id)
+                .all()
+            )
+            if not rows:
+                raise NotFoundError("Submission not found")
+
+            unknown = set(latest) - {question_id for _, question_id in rows}
+            if unknown:
+                raise ValidationError(
+                    f"Questions not in this submission's exam: {', '.join(sorted(map(str, unknown)))}"
+                )
+
+            self.db.execute(answer_upsert_statement([
+                {"submission_id": submission_id, "question_id": question_id, "answer": answer_text}
+                for question_id, answer_text in latest.items()
+            ]))
+            self.db.commit()
+            return len(latest)
+        except (NotFoundError, ValidationError):
+            raise
+        except Exception as e:
+            self.db.rollback()
+            self.logger.error(f"Failed to save answers for submission {submission_id}: {e}")
+            raise ServiceError("Could not save answers") from e
+
     def get_submission_by_id(self, submission_id: UUID):
         try:
             submission = self.db.query(Submission).filter(Submission.id == submission_id).first()
@@ -102,16 +154,16 @@ class SubmissionService:
             )
         return query
 
-    def list_exam_submissions_basic(self, exam_id: UUID, limit: int = 25, offset: int = 0):
+    def list_exam_submissions_basic(self, exam_id: UUID, limit: int = 25, cursor: str | None = None):
         try:
-            submissions = (
-                self._base_submission_query(exam_id, detailed=False)
-                .limit(limit)
-                .offset(offset)
-                .all()
+            submissions, next_cursor = paginate(
+                self._base_submission_query(exam_id, detailed=False),
+                [Submission.submitted_at, Submission.id],
+                limit,
+                cursor,
             )
 
-            return [
+            items = [
                 {
                     "submission_id": sub.id,
                     "exam_id": sub.exam_id,
@@ -120,20 +172,23 @@ class SubmissionService:
                 }
                 for sub in submissions
             ]
+            return {"items": items, "next_cursor": next_cursor}
+        except ValidationError:
+            raise
         except Exception as e:
             self.logger.error(f"Failed to fetch basic submissions for exam {exam_id}: {e}")
             raise ServiceError("Could not fetch basic submissions") from e
 
-    def list_exam_submissions_detailed(self, exam_id: UUID, limit: int = 25, offset: int = 0):
+    def list_exam_submissions_detailed(self, exam_id: UUID, limit: int = 25, cursor: str | None = None):
         try:
-            submissions = (
-                self._base_submission_query(exam_id, detailed=True)
-                .limit(limit)
-                .offset(offset)
-                .all()
+            submissions, next_cursor = paginate(
+                self._base_submission_query(exam_id, detailed=True),
+                [Submission.submitted_at, Submission.id],
+                limit,
+                cursor,
             )
 
-            return [
+            items = [
                 {
                     "submission_id": sub.id,
                     "exam_id": sub.exam_id,
@@ -151,6 +206,9 @@ class SubmissionService:
                 }
                 for sub in submissions
             ]
+            return {"items": items, "next_cursor": next_cursor}
+        except ValidationError:
+            raise
         except Exception as e:
             self.logger.error(f"Failed to fetch detailed submissions for exam {exam_id}: {e}")
             raise ServiceError("Could not fetch detailed submissions") from e
@@ -0,0 +1,132 @@
+import logging
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from src.utils.exceptions import ServiceError, ValidationError
+
+QUESTION_EMBEDDING_INDEX = "ix_question_embedding_ann"
+
+# per-query search breadth: higher values trade latency for recall
+RECALL_PROFILES = {
+    "fast": {"ef_search": 40, "probes": 1},
+    "balanced": {"ef_search": 100, "probes": 10},
+    "accurate": {"ef_search": 400, "probes": 40},
+}
+DEFAULT_RECALL = "balanced"
+MAX_EF_SEARCH = 1000  # pgvector rejects larger hnsw.ef_search values
+
+
+RECALL_SQL = text(
+    "SELECT set_config('hnsw.ef_search', :ef_search, true), set_config('ivfflat.probes', :probes, true)"
+)
+
+
+def recall_profile_params(recall: str | None = None, top_n: int = 0) -> dict:
+    profile = RECALL_PROFILES.get(recall or DEFAULT_RECALL)
+    if profile is None:
+        raise ValidationError(f"Unknown recall profile '{recall}'")
+
+    # ef_search below LIMIT silently truncates HNSW results
+    ef_search = min(max(profile["ef_search"], top_n), MAX_EF_SEARCH)
+    return {"ef_search": str(ef_search), "probes": str(profile["probes"])}
+
+
+def apply_recall_profile(db: Session, recall: str | None = None, top_n: int = 0):
+    """Set pgvector's search breadth for the current transaction only."""
+    db.execute(RECALL_SQL, recall_profile_params(recall, top_n))
+
+
+class VectorIndexService:
+    def __init__(self, db_session: Session):
+        self.db = db_session
+        self.logger = logging.getLogger("Vector Index Service")
+
+    def _autocommit(self):
+        # CREATE/REINDEX ... CONCURRENTLY cannot run inside a transaction block
+        return self.db.get_bind().connect().execution_options(isolation_level="AUTOCOMMIT")
+
+    def create_index(self, method: str = "hnsw", m: int = 16, ef_construction: int = 64,
+                     lists: int | None = None, name: str = QUESTION_EMBEDDING_INDEX):
+        try:
+            if method == "hnsw":
+                options = f"m = {int(m)}, ef_construction = {int(ef_construction)}"
+            elif method == "ivfflat":
+                if lists is None:
+                    # pgvector guidance: rows / 1000 up to 1M rows, sqrt(rows) beyond
+                    rows = self.db.execute(text("SELECT count(*) FROM question WHERE embedding IS NOT NULL")).scalar()
+                    lists = max(1, rows // 1000 if rows <= 1_000_000 else int(rows ** 0.5))
+                options = f"lists = {int(lists)}"
+            else:
+                raise ValidationError(f"Unsupported vector index method '{method}'")
+
+            with self._autocommit() as conn:
+                conn.execute(text(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                    f"ON question USING {method} (embedding vector_l2_ops) WITH ({options})"
+                ))
+            self.logger.info(f"Created {method} index {name} ({options})")
+            return {"index": name, "method": method, "options": options}
+        except ValidationError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Failed to create vector index {name}: {e}")
+            raise ServiceError("Could not create vector index") from e
+
+    def rebuild_index(self, name: str = QUESTION_EMBEDDING_INDEX):
+        try:
+            with self._autocommit() as conn:
+                conn.execute(text(f"REINDEX INDEX CONCURRENTLY {name}"))
+            self.logger.info(f"Rebuilt vector index {name}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to rebuild vector index {name}: {e}")
+            raise ServiceError("Could not rebuild vector index") from e
+
+    def drop_index(self, name: str = QUESTION_EMBEDDING_INDEX):
+        try:
+            with self._autocommit() as conn:
+                conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to drop vector index {name}: {e}")
+            raise ServiceError("Could not drop vector index") from e
+
+    def index_info(self, name: str = QUESTION_EMBEDDING_INDEX):
+        try:
+            row = self.db.execute(text("""
+                SELECT indexname, indexdef, pg_size_pretty(pg_relation_size(indexname::regclass)) AS size
+                FROM pg_indexes
+                WHERE tablename = 'question' AND indexname = :name
+            """), {"name": name}).first()
+            if not row:
+                return None
+            return {"index": row.indexname, "definition": row.indexdef, "size": row.size}
+        except Exception as e:
+            self.logger.error(f"Failed to inspect vector index {name}: {e}")
+            raise ServiceError("Could not inspect vector index") from e
+
+
+if __name__ == "__main__":
+    import argparse
+    from src.db.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Manage the question embedding ANN index")
+    parser.add_argument("action", choices=["create", "rebuild", "drop", "info"])
+    parser.add_argument("--method", choices=["hnsw", "ivfflat"], default="hnsw")
+    parser.add_argument("--m", type=int, default=16)
+    parser.add_argument("--ef-construction", type=int, default=64)
+    parser.add_argument("--lists", type=int, default=None)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        service = VectorIndexService(db)
+        if args.action == "create":
+            print(service.create_index(args.method, args.m, args.ef_construction, args.lists))
+        elif args.action == "rebuild":
+            service.rebuild_index()
+        elif args.action == "drop":
+            service.drop_index()
+        else:
+            print(service.index_info())
+    finally:
+        db.close()
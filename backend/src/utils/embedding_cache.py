@@ -0,0 +1,218 @@
+import hashlib
+import logging
+import threading
+import unicodedata
+from datetime import datetime, timedelta, timezone
+from src.utils.cache import TTLCache
+
+logger = logging.getLogger("Embedding Cache")
+
+
+def normalize_text(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text or "")
+    return " ".join(text.split()).casefold()
+
+
+def embedding_cache_key(model: str, input_type: str, text: str) -> str:
+    payload = f"{model}\x1f{input_type}\x1f{normalize_text(text)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DatabaseEmbeddingStore:
+    """Persistent tier backed by the `embedding_cache` table.
+
+    Writes trigger `purge` after every `purge_every` stored rows, so the TTL and
+    `max_rows` cap are enforced without a separate job.
+    """
+
+    def __init__(self, session_factory, ttl_seconds: float | None = None, max_rows: int | None = None,
+                 purge_every: int = 1000):
+        self.session_factory = session_factory
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max_rows
+        self.purge_every = purge_every
+        self._written = 0
+        self._lock = threading.Lock()
+
+    def _cutoff(self):
+        if self.ttl_seconds is None:
+            return None
+        return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=self.ttl_seconds)
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        from src.db.models import EmbeddingCacheEntry
+
+        if not keys:
+            return {}
+        db = self.session_factory()
+        try:
+            query = db.query(EmbeddingCacheEntry.key, EmbeddingCacheEntry.embedding).filter(
+                EmbeddingCacheEntry.key.in_(keys)
+            )
+            cutoff = self._cutoff()
+            if cutoff is not None:
+                query = query.filter(EmbeddingCacheEntry.created_at >= cutoff)
+            return {row.key: list(row.embedding) for row in query.all()}
+        finally:
+            db.close()
+
+    def set_many(self, entries: list[dict]):
+        from sqlalchemy.dialects.postgresql import insert
+        from src.db.models import EmbeddingCacheEntry
+
+        if not entries:
+            return
+        db = self.session_factory()
+        try:
+            stmt = insert(EmbeddingCacheEntry).values(entries)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[EmbeddingCacheEntry.key],
+                set_={
+                    "embedding": stmt.excluded.embedding,
+                    "created_at": stmt.excluded.created_at,
+                },
+            )
+            db.execute(stmt)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        with self._lock:
+            self._written += len(entries)
+            due = self._written >= self.purge_every
+            if due:
+                self._written = 0
+        if due:
+            try:
+                removed = self.purge()
+                if removed:
+                    logger.info(f"Purged {removed} embedding cache rows")
+            except Exception as e:
+                logger.warning(f"Embedding cache purge failed: {e}")
+
+    def purge(self) -> int:
+        """Drop expired rows, then trim the table to `max_rows` (oldest first)."""
+        from sqlalchemy import delete, select
+        from src.db.models import EmbeddingCacheEntry
+
+        removed = 0
+        db = self.session_factory()
+        try:
+            cutoff = self._cutoff()
+            if cutoff is not None:
+                removed += db.execute(
+                    delete(EmbeddingCacheEntry).where(EmbeddingCacheEntry.created_at < cutoff)
+                ).rowcount or 0
+
+            if self.max_rows is not None:
+                keep = (
+                    select(EmbeddingCacheEntry.key)
+                    .order_by(EmbeddingCacheEntry.created_at.desc())
+                    .limit(self.max_rows)
+                )
+                removed += db.execute(
+                    delete(EmbeddingCacheEntry).where(EmbeddingCacheEntry.key.not_in(keep))
+                ).rowcount or 0
+
+            db.commit()
+            return removed
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+class EmbeddingCache:
+    """Two-tier cache: in-process LRU in front of an optional persistent store.
+
+    Failures in the persistent tier are logged and treated as misses so that
+    an unavailable cache table never blocks embedding generation.
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl_seconds: float | None = None, store=None):
+        self.memory = TTLCache(max_size=max_size, ttl=ttl_seconds)
+        self.store = store
+        self._lock = threading.Lock()
+        self.store_hits = 0
+        self.misses = 0
+
+    def get_many(self, model: str, input_type: str, texts: list[str]) -> dict[int, list[float]]:
+        found = {}
+        pending = {}
+        for index, text in enumerate(texts):
+            key = embedding_cache_key(model, input_type, text)
+            vector = self.memory.get(key)
+            if vector is not None:
+                found[index] = vector
+            else:
+                pending.setdefault(key, []).append(index)
+
+        if pending and self.store is not None:
+            try:
+                stored = self.store.get_many(list(pending))
+            except Exception as e:
+                logger.warning(f"Persistent embedding cache lookup failed: {e}")
+                stored = {}
+            for key, vector in stored.items():
+                self.memory.set(key, vector)
+                for index in pending.pop(key):
+                    found[index] = vector
+            with self._lock:
+                self.store_hits += len(stored)
+
+        with self._lock:
+            self.misses += len(pending)
+        return found
+
+    def set_many(self, model: str, input_type: str, texts: list[str], vectors: list[list[float]]):
+        entries = {}
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        for text, vector in zip(texts, vectors):
+            key = embedding_cache_key(model, input_type, text)
+            self.memory.set(key, vector)
+            entries[key] = {
+                "key": key,
+                "model": model,
+                "input_type": input_type,
+                "embedding": vector,
+                "created_at": now,
+            }
+
+        if entries and self.store is not None:
+            try:
+                self.store.set_many(list(entries.values()))
+            except Exception as e:
+                logger.warning(f"Persistent embedding cache write failed: {e}")
+
+    def stats(self) -> dict:
+        memory = self.memory.stats()
+        with self._lock:
+            return {
+                "memory_hits": memory["hits"],
+                "store_hits": self.store_hits,
+                "misses": self.misses,
+                "memory_size": memory["size"],
+                "memory_evictions": memory["evictions"],
+            }
+
+    def clear(self):
+        self.memory.clear()
+
+
+if __name__ == "__main__":
+    import argparse
+    from src.db.database import SessionLocal
+    from src.utils.embeddings import EMBEDDING_CACHE_MAX_ROWS, EMBEDDING_CACHE_TTL
+
+    parser = argparse.ArgumentParser(description="Maintain the persistent embedding cache")
+    parser.add_argument("action", choices=["purge"])
+    parser.parse_args()
+
+    removed = DatabaseEmbeddingStore(
+        SessionLocal, ttl_seconds=EMBEDDING_CACHE_TTL, max_rows=EMBEDDING_CACHE_MAX_ROWS
+    ).purge()
+    print(f"Removed {removed} embedding cache rows")
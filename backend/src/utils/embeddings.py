@@ -1,19 +1,187 @@
 import os
-import cohere
-import requests
+import enum
+import hashlib
+import logging
+import random
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from src.utils.embedding_cache import EmbeddingCache, DatabaseEmbeddingStore
 
 load_dotenv()
 
 cohere_api = os.getenv("COHERE_KEY")
 
-def generate_embedding(text: str) -> list[float]:
-    co = cohere.Client(cohere_api)
-    response = co.embed(
-        texts=[text],
-        model="embed-v4.0",
-        input_type="search_document"
-    )
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "embed-v4.0")
+EMBEDDING_DIMENSION = 1536
+COHERE_BATCH_LIMIT = 96  # max texts per /embed request
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "10000"))
+EMBEDDING_CACHE_TTL = float(os.getenv("EMBEDDING_CACHE_TTL", str(30 * 24 * 3600)))
+EMBEDDING_CACHE_PERSIST = os.getenv("EMBEDDING_CACHE_PERSIST", "1") == "1"
+EMBEDDING_CACHE_MAX_ROWS = int(os.getenv("EMBEDDING_CACHE_MAX_ROWS", "500000"))
 
-    embedding = response.embeddings[0]
-    return embedding
+logger = logging.getLogger("Embeddings")
+
+
+class EmbeddingRole(str, enum.Enum):
+    # values are the provider's input_type and double as the cache namespace
+    DOCUMENT = "search_document"
+    QUERY = "search_query"
+
+
+class EmbeddingBackend(ABC):
+    """Provider interface: embeds one batch (at most `batch_limit` texts) per call."""
+    model: str = EMBEDDING_MODEL
+    batch_limit: int = COHERE_BATCH_LIMIT
+
+    @abstractmethod
+    def embed(self, texts: list[str], input_type: str) -> list[list[float]]:
+        ...
+
+
+class CohereEmbeddingBackend(EmbeddingBackend):
+    def __init__(self, api_key: str | None = cohere_api, model: str = EMBEDDING_MODEL,
+                 max_connections: int = 10, timeout: float = 30.0):
+        # imported lazily so offline runs on the local backend don't need the SDK
+        import cohere
+        import httpx
+
+        self.model = model
+        self.max_connections = max_connections
+        self._http = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=timeout,
+        )
+        self._client = cohere.Client(api_key=api_key, httpx_client=self._http)
+
+    def embed(self, texts: list[str], input_type: str) -> list[list[float]]:
+        response = self._client.embed(
+            texts=texts,
+            model=self.model,
+            input_type=input_type
+        )
+        return response.embeddings
+
+
+class LocalEmbeddingBackend(EmbeddingBackend):
+    """Deterministic, network-free vectors for tests and offline runs.
+
+    Identical texts always map to the same unit vector; the vectors carry no
+    semantic meaning.
+    """
+    model = "local-stub"
+    batch_limit = 512
+
+    def __init__(self, dimension: int = EMBEDDING_DIMENSION):
+        self.dimension = dimension
+
+    def embed(self, texts: list[str], input_type: str) -> list[list[float]]:
+        return [self._vector(text) for text in texts]
+
+    def _vector(self, text: str) -> list[float]:
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+        rng = random.Random(seed)
+        values = [rng.gauss(0.0, 1.0) for _ in range(self.dimension)]
+        norm = sum(v * v for v in values) ** 0.5 or 1.0
+        return [v / norm for v in values]
+
+
+class EmbeddingClient:
+    def __init__(self, backend: EmbeddingBackend, max_concurrency: int = 4, cache: EmbeddingCache | None = None):
+        self.backend = backend
+        self.max_concurrency = max_concurrency
+        self.cache = cache
+
+    def embed(self, texts: list[str], input_type: str = EmbeddingRole.DOCUMENT.value) -> list[list[float]]:
+        input_type = EmbeddingRole(input_type).value
+        if not texts:
+            return []
+        if self.cache is None:
+            return self._embed_uncached(texts, input_type)
+
+        found = self.cache.get_many(self.backend.model, input_type, texts)
+        missing = [i for i in range(len(texts)) if i not in found]
+        if missing:
+            # embed each distinct text once even if it repeats within the request
+            unique = list(dict.fromkeys(texts[i] for i in missing))
+            vectors = self._embed_uncached(unique, input_type)
+            self.cache.set_many(self.backend.model, input_type, unique, vectors)
+            by_text = dict(zip(unique, vectors))
+            for i in missing:
+                found[i] = by_text[texts[i]]
+
+        return [found[i] for i in range(len(texts))]
+
+    def _embed_uncached(self, texts: list[str], input_type: str) -> list[list[float]]:
+        limit = self.backend.batch_limit
+        batches = [texts[i:i + limit] for i in range(0, len(texts), limit)]
+
+        if len(batches) == 1 or self.max_concurrency <= 1:
+            results = [self.backend.embed(batch, input_type) for batch in batches]
+        else:
+            workers = min(self.max_concurrency, len(batches))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(lambda batch: self.backend.embed(batch, input_type), batches))
+
+        embeddings = [vector for batch in results for vector in batch]
+        if len(embeddings) != len(texts):
+            raise RuntimeError(
+                f"Embedding backend returned {len(embeddings)} vectors for {len(texts)} texts"
+            )
+        return embeddings
+
+
+_client: EmbeddingClient | None = None
+_client_lock = threading.Lock()
+
+
+def _default_backend() -> EmbeddingBackend:
+    backend = os.getenv("EMBEDDING_BACKEND", "cohere").lower()
+    if backend == "local":
+        return LocalEmbeddingBackend()
+    if backend == "cohere":
+        return CohereEmbeddingBackend()
+    raise ValueError(f"Unknown EMBEDDING_BACKEND '{backend}'")
+
+
+def _default_cache() -> EmbeddingCache:
+    store = None
+    if EMBEDDING_CACHE_PERSIST:
+        from src.db.database import SessionLocal
+        store = DatabaseEmbeddingStore(
+            SessionLocal, ttl_seconds=EMBEDDING_CACHE_TTL, max_rows=EMBEDDING_CACHE_MAX_ROWS
+        )
+    return EmbeddingCache(max_size=EMBEDDING_CACHE_SIZE, ttl_seconds=EMBEDDING_CACHE_TTL, store=store)
+
+
+def get_embedding_client() -> EmbeddingClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = EmbeddingClient(_default_backend(), cache=_default_cache())
+                logger.info(f"Embedding client ready ({_client.backend.model})")
+    return _client
+
+
+def set_embedding_backend(backend: EmbeddingBackend, cache: EmbeddingCache | None = None) -> EmbeddingClient:
+    global _client
+    with _client_lock:
+        _client = EmbeddingClient(backend, cache=cache)
+    return _client
+
+
+def generate_embeddings(texts: list[str], role: EmbeddingRole = EmbeddingRole.DOCUMENT) -> list[list[float]]:
+    return get_embedding_client().embed(list(texts), EmbeddingRole(role).value)
+
+
+def generate_embedding(text: str, role: EmbeddingRole = EmbeddingRole.DOCUMENT) -> list[float]:
+    return generate_embeddings([text], role)[0]
+
+
+def generate_query_embedding(text: str) -> list[float]:
+    return generate_embedding(text, EmbeddingRole.QUERY)
@@ -3,3 +3,9 @@ class NotFoundError(ServiceError): pass
 class ValidationError(ServiceError): pass
 class AuthError(ServiceError): pass
 class ConflictError(ServiceError): pass
+
+class AdmissionRejected(ServiceError):
+    def __init__(self, message: str, position: int, retry_after: float):
+        super().__init__(message)
+        self.position = position
+        self.retry_after = retry_after
@@ -0,0 +1,89 @@
+import numpy as np
+from numpy.typing import ArrayLike
+from src.utils.exceptions import ValidationError
+
+
+class GradingScale:
+    """Maps scores to letter grades and GPA points with `searchsorted` over band boundaries.
+
+    `grade_boundaries` are the ascending lower bounds of every grade above the
+    lowest, so `grades` has one more entry than it; the same holds for
+    `gpa_boundaries` and `gpa_points`. A score equal to a boundary falls in the
+    higher band.
+    """
+
+    def __init__(self, grade_boundaries, grades, gpa_boundaries, gpa_points):
+        self.grade_boundaries = self._boundaries(grade_boundaries, len(grades), "grade")
+        self.grades = np.asarray(grades, dtype=object)
+        self.gpa_boundaries = self._boundaries(gpa_boundaries, len(gpa_points), "gpa")
+        self.gpa_points = np.asarray(gpa_points, dtype=float)
+
+    @staticmethod
+    def _boundaries(values, num_bands: int, name: str) -> np.ndarray:
+        boundaries = np.asarray(values, dtype=float)
+        if boundaries.ndim != 1 or len(boundaries) != num_bands - 1:
+            raise ValidationError(f"{name} scale needs exactly one boundary fewer than bands")
+        if np.any(np.diff(boundaries) <= 0):
+            raise ValidationError(f"{name} boundaries must be strictly ascending")
+        return boundaries
+
+    @classmethod
+    def from_dict(cls, config: dict) -> "GradingScale":
+        try:
+            return cls(
+                [b["min_score"] for b in config["grades"][1:]],
+                [b["grade"] for b in config["grades"]],
+                [b["min_score"] for b in config["gpa"][1:]],
+                [b["points"] for b in config["gpa"]],
+            )
+        except (KeyError, TypeError) as e:
+            raise ValidationError(f"Invalid grading scale: {e}") from e
+
+    def to_dict(self) -> dict:
+        lower = [0.0, *self.grade_boundaries.tolist()]
+        gpa_lower = [0.0, *self.gpa_boundaries.tolist()]
+        return {
+            "grades": [{"min_score": m, "grade": g} for m, g in zip(lower, self.grades.tolist())],
+            "gpa": [{"min_score": m, "points": p} for m, p in zip(gpa_lower, self.gpa_points.tolist())],
+        }
+
+    def band(self, scores: ArrayLike) -> np.ndarray:
+        index = np.searchsorted(self.grade_boundaries, np.asarray(scores, dtype=float), side="right")
+        return np.asarray(self.grades[index])
+
+    def gpa(self, scores: ArrayLike) -> np.ndarray:
+        index = np.searchsorted(self.gpa_boundaries, np.asarray(scores, dtype=float), side="right")
+        return np.asarray(self.gpa_points[index])
+
+    def cumulative_gpa(self, scores: ArrayLike, weights: ArrayLike | None = None) -> float:
+        scores = np.asarray(scores, dtype=float)
+        if not scores.size:
+            return 0.0
+        return float(np.average(self.gpa(scores), weights=weights))
+
+
+DEFAULT_GRADING_SCALE = GradingScale(
+    grade_boundaries=(40, 50, 60, 70),
+    grades=("F", "D", "C", "B", "A"),
+    gpa_boundaries=(50, 60, 70, 80, 90),
+    gpa_points=(0.0, 1.0, 2.0, 3.0, 3.7, 4.0),
+)
+
+
+def grade_cohorts(scores: ArrayLike, cohorts: ArrayLike, scales: dict, default: GradingScale = DEFAULT_GRADING_SCALE):
+    """Band and GPA-map scores that belong to different cohorts (e.g. programs) in one pass per cohort.
+
+    `cohorts[i]` keys `scales`; cohorts without an entry use `default`.
+    Returns `(grades, gpa)` arrays aligned with `scores`.
+    """
+    scores = np.asarray(scores, dtype=float)
+    keys, inverse = np.unique(np.asarray(cohorts, dtype=object).astype(str), return_inverse=True)
+    lookup = {str(k): v for k, v in scales.items()}
+    grades = np.empty(scores.shape, dtype=object)
+    gpa = np.empty(scores.shape, dtype=float)
+    for index, key in enumerate(keys):
+        mask = inverse == index
+        scale = lookup.get(key, default)
+        grades[mask] = scale.band(scores[mask])
+        gpa[mask] = scale.gpa(scores[mask])
+    return grades, gpa
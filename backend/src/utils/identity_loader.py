@@ -0,0 +1,44 @@
+from collections import defaultdict
+from sqlalchemy.orm import Session
+
+
+class IdentityLoader:
+    """Request-scoped batcher that resolves rows by primary key with one IN query per model.
+
+    Report builders `prime` every id they will need while walking their
+    result rows, then `get`/`get_many` resolve all pending ids of that model
+    at once. Resolved rows (and misses, as None) are remembered for the life
+    of the loader, so create one per request rather than sharing it.
+    """
+
+    def __init__(self, db: Session, chunk_size: int = 1000):
+        self.db = db
+        self.chunk_size = chunk_size
+        self._loaded = defaultdict(dict)
+        self._pending = defaultdict(set)
+
+    def prime(self, model, ids):
+        loaded = self._loaded[model]
+        self._pending[model].update(i for i in ids if i is not None and i not in loaded)
+
+    def get(self, model, id):
+        return self.get_many(model, [id]).get(id)
+
+    def get_many(self, model, ids) -> dict:
+        ids = list(ids)
+        self.prime(model, ids)
+        self._resolve(model)
+        loaded = self._loaded[model]
+        return {i: loaded.get(i) for i in ids}
+
+    def resolve_all(self):
+        for model in list(self._pending):
+            self._resolve(model)
+
+    def _resolve(self, model):
+        pending = list(self._pending.pop(model, ()))
+        loaded = self._loaded[model]
+        for start in range(0, len(pending), self.chunk_size):
+            chunk = pending[start:start + self.chunk_size]
+            loaded.update(dict.fromkeys(chunk))
+            loaded.update({row.id: row for row in self.db.query(model).filter(model.id.in_(chunk))})
@@ -29,15 +29,22 @@ class JWTHandler:
             exam_session_id: UUID,
             submission_id: UUID,
             exam_id: UUID,
+            expires_at: datetime | None = None,
     ) -> str:
-        payload = CandidateExamToken(
-            exam_session_id=exam_session_id,
-            submission_id=submission_id,
-            exam_id=exam_id,
-            exp=datetime.now(datetime.UTC) + timedelta(minutes=self.session_ttl_minutes),
-        )
+        if expires_at is None:
+            expires_at = datetime.now(timezone.utc) + timedelta(minutes=self.session_ttl_minutes)
+        elif expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
 
-        return jwt.encode(payload.model_dump(), self.secret_key, self.algorithm)
+        payload = {
+            "sub": "candidate",
+            "session_id": str(exam_session_id),
+            "submission_id": str(submission_id),
+            "exam_id": str(exam_id),
+            "exp": int(expires_at.timestamp()),
+        }
+
+        return jwt.encode(payload, self.secret_key, self.algorithm)
 
     def verify_token(self, token: str) -> dict:
         try:
@@ -0,0 +1,96 @@
+import json
+import base64
+from uuid import UUID
+from datetime import datetime, date
+from sqlalchemy import tuple_
+from src.utils.exceptions import ValidationError
+
+MAX_PAGE_SIZE = 200
+
+
+def _encode_value(value):
+    if isinstance(value, UUID):
+        return {"uuid": str(value)}
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if "uuid" in value:
+            return UUID(value["uuid"])
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+    return value
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _column_type(column):
+    try:
+        return column.type.python_type
+    except (AttributeError, NotImplementedError):
+        return None
+
+
+def _matches(value, expected: type | None) -> bool:
+    if value is None or isinstance(value, (bool, dict, list)):
+        return False
+    if expected is None:
+        return True
+    if expected is float:
+        return isinstance(value, (int, float))
+    if expected is date and isinstance(value, datetime):
+        return False
+    return isinstance(value, expected)
+
+
+def decode_cursor(cursor: str, expected_length: int | None = None, expected_types: list | None = None) -> list:
+    """Decode a cursor, rejecting payloads that are not a list of scalars of the expected length and types."""
+    if expected_types is not None:
+        expected_length = len(expected_types)
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(raw, list):
+            raise ValueError("cursor payload is not a list")
+        values = [_decode_value(v) for v in raw]
+    except Exception as e:
+        raise ValidationError("Invalid pagination cursor") from e
+    if expected_length is not None and len(values) != expected_length:
+        raise ValidationError("Invalid pagination cursor")
+    types = expected_types or [None] * len(values)
+    if not all(_matches(value, expected) for value, expected in zip(values, types)):
+        raise ValidationError("Invalid pagination cursor")
+    return values
+
+
+def paginate(query, order_by: list, limit: int, cursor: str | None = None, descending: bool = False):
+    """Keyset pagination over `order_by` columns, which must be NOT NULL and end in a unique column.
+
+    Returns (items, next_cursor); next_cursor is None on the last page.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    if cursor:
+        values = decode_cursor(cursor, expected_types=[_column_type(col) for col in order_by])
+        key, after = tuple_(*order_by), tuple_(*values)
+        query = query.filter(key < after if descending else key > after)
+
+    query = query.order_by(*[col.desc() if descending else col.asc() for col in order_by])
+    rows = query.limit(limit + 1).all()
+
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, col.key) for col in order_by])
+    return items, next_cursor
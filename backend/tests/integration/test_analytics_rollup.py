@@ -0,0 +1,68 @@
+import os
+import uuid
+import pytest
+from datetime import datetime
+from src.db.models.models import (
+    AcademicYear, Course, CourseSemesterScoreRollup, Curriculum, Exam, GradeLog, Program, Semester, Submission, User,
+)
+from src.services.analytics_rollup import AnalyticsRollupService
+from src.services.exam import ExamService
+from src.utils.exceptions import NotFoundError
+from tests.conftest import test_db_session
+
+# rollups are maintained with ON CONFLICT upserts and LOCK TABLE
+pytestmark = pytest.mark.skipif(
+    not os.getenv("TEST_DATABASE_URL", "").startswith("postgresql"),
+    reason="score rollups need a Postgres TEST_DATABASE_URL",
+)
+
+@pytest.fixture
+def graded_exam(test_db_session):
+    program = Program(name="Computer Science", code="CS", degree_title="BSc",
+                      degree_name="Bachelor of Science", department="Computing")
+    curriculum = Curriculum(program=program, name="BSc CS 2025", version="2025", start_year=2025, end_year=2029)
+    year = AcademicYear(curriculum=curriculum, year_number=1, name="Year 1")
+    semesters = [
+        Semester(academic_year=year, name=f"Semester {i}",
+                 start_date=datetime(2025, 4 * i, 1), end_date=datetime(2025, 4 * i + 3, 1))
+        for i in (1, 2)
+    ]
+    course = Course(code="CS101", name="Programming I", program=program, semester=semesters[0])
+    test_db_session.add_all([course, semesters[1]])
+    test_db_session.flush()
+
+    exam = Exam(exam_code="CS101-A", title="Midterm", course_id=course.id, semester_id=semesters[0].id,
+                duration=60, pass_mark=40.0)
+    user = User(name="Ada", email="ada@example.com", password="secret")
+    test_db_session.add_all([exam, user])
+    for score in (35, 45, 55):
+        submission = Submission(exam=exam, user=user, submitted_at=datetime(2025, 5, 1))
+        test_db_session.add(GradeLog(score=score, grader=uuid.uuid4(), submission=submission))
+    test_db_session.commit()
+    AnalyticsRollupService(test_db_session).rebuild()
+    return exam, semesters, user
+
+def test_pass_mark_change_recounts_passes(test_db_session, graded_exam):
+    exam, _, _ = graded_exam
+    rollups = AnalyticsRollupService(test_db_session)
+    assert rollups.exam_summary(exam.id)["pass_count"] == 2
+
+    ExamService(test_db_session).update_exam(exam.id, pass_mark=50.0)
+
+    summary = rollups.exam_summary(exam.id)
+    assert summary["graded"] == 3
+    assert summary["pass_count"] == 1
+
+def test_semester_change_moves_course_rollup(test_db_session, graded_exam):
+    exam, (first, second), user = graded_exam
+
+    ExamService(test_db_session).update_exam(exam.id, semester_id=second.id)
+
+    assert test_db_session.get(CourseSemesterScoreRollup, (exam.course_id, first.id)) is None
+    assert test_db_session.get(CourseSemesterScoreRollup, (exam.course_id, second.id)).graded_count == 3
+    students = AnalyticsRollupService(test_db_session).student_semester_summaries(user.id)
+    assert [s["semester_id"] for s in students] == [second.id]
+
+def test_summary_of_unknown_exam_is_not_found(test_db_session):
+    with pytest.raises(NotFoundError):
+        AnalyticsRollupService(test_db_session).exam_summary(uuid.uuid4())
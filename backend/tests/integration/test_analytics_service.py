@@ -0,0 +1,164 @@
+import os
+import uuid
+import pytest
+from datetime import datetime, timedelta
+from src.services.analytics import AnalyticsService
+from src.utils.exceptions import NotFoundError
+from src.db.models.models import (
+    AcademicYear, CandidateExamSession, Course, Curriculum, Exam, ExamStatus, GradeLog, Program, Semester,
+    Submission, User,
+)
+from tests.conftest import test_db_session
+
+# percentile_cont, FILTER and ROLLUP are Postgres features
+pytestmark = pytest.mark.skipif(
+    not os.getenv("TEST_DATABASE_URL", "").startswith("postgresql"),
+    reason="analytics queries need a Postgres TEST_DATABASE_URL",
+)
+
+@pytest.fixture
+def analytics_service(test_db_session):
+    return AnalyticsService(test_db_session)
+
+@pytest.fixture
+def sample_course(test_db_session):
+    program = Program(name="Computer Science", code="CS", degree_title="BSc",
+                      degree_name="Bachelor of Science", department="Computing")
+    curriculum = Curriculum(program=program, name="BSc CS 2025", version="2025", start_year=2025, end_year=2029)
+    year = AcademicYear(curriculum=curriculum, year_number=1, name="Year 1")
+    semester = Semester(academic_year=year, name="Semester 1",
+                        start_date=datetime(2025, 9, 1), end_date=datetime(2025, 12, 20))
+    course = Course(code="CS101", name="Programming I", program=program, semester=semester)
+    test_db_session.add(course)
+    test_db_session.commit()
+    return course
+
+def add_semester_course(db, course, code, name, start):
+    semester = Semester(academic_year=course.semester.academic_year, name=name,
+                        start_date=start, end_date=start + timedelta(days=100))
+    other = Course(code=code, name=f"Course {code}", program=course.program, semester=semester)
+    db.add(other)
+    db.commit()
+    return other
+
+def add_student_grades(db, user, course, code, scores):
+    exam = Exam(exam_code=code, title=f"Exam {code}", course_id=course.id, semester_id=course.semester_id, duration=60)
+    db.add(exam)
+    for score in scores:
+        submission = Submission(exam=exam, user=user, submitted_at=datetime(2025, 10, 1))
+        db.add(GradeLog(score=score, grader=uuid.uuid4(), submission=submission))
+    db.commit()
+    return exam
+
+def add_exam(db, course, code, scores, pass_mark=40.0):
+    exam = Exam(exam_code=code, title=f"Exam {code}", course_id=course.id, semester_id=course.semester_id,
+                duration=60, pass_mark=pass_mark)
+    db.add(exam)
+    db.flush()
+    for score in scores:
+        session = CandidateExamSession(
+            exam_id=exam.id, candidate_name="Candidate", started_at=datetime(2025, 10, 1),
+            ends_at=datetime(2025, 10, 1) + timedelta(hours=1), status=ExamStatus.SUBMITTED,
+        )
+        submission = Submission(exam_id=exam.id, candidate_session=session, submitted_at=datetime(2025, 10, 1))
+        db.add_all([session, submission])
+        if score is not None:
+            db.add(GradeLog(score=score, grader=uuid.uuid4(), submission=submission))
+    db.commit()
+    return exam
+
+def test_exam_statistics(analytics_service, test_db_session, sample_course):
+    exam = add_exam(test_db_session, sample_course, "CS101-A", [30, 50, 70, 90, None], pass_mark=50)
+
+    stats = analytics_service.exam_statistics(exam.id)
+
+    assert stats["submissions"] == 5
+    assert stats["graded"] == 4
+    assert stats["average_score"] == pytest.approx(60)
+    assert stats["median_score"] == pytest.approx(60)
+    assert stats["min_score"] == 30
+    assert stats["max_score"] == 90
+    assert stats["pass_count"] == 3
+    assert stats["pass_rate"] == pytest.approx(75)
+    assert stats["percentiles"]["p25"] == pytest.approx(45)
+
+def test_exam_statistics_without_submissions(analytics_service, test_db_session, sample_course):
+    exam = add_exam(test_db_session, sample_course, "CS101-B", [])
+
+    stats = analytics_service.exam_statistics(exam.id)
+
+    assert stats["submissions"] == 0
+    assert stats["average_score"] == 0
+    assert stats["pass_rate"] == 0
+
+def test_exam_statistics_unknown_exam(analytics_service):
+    with pytest.raises(NotFoundError):
+        analytics_service.exam_statistics(uuid.uuid4())
+
+def test_course_performance_rolls_up_exams(analytics_service, test_db_session, sample_course):
+    add_exam(test_db_session, sample_course, "CS101-C", [30, 50], pass_mark=40)
+    add_exam(test_db_session, sample_course, "CS101-D", [60, 80, 100], pass_mark=70)
+
+    result = analytics_service.course_performance(sample_course.id, sample_course.semester_id)
+
+    assert result["number_of_exams"] == 2
+    assert result["submissions"] == 5
+    assert result["average_score"] == pytest.approx(64)
+    assert result["pass_count"] == 3
+    assert [e["pass_count"] for e in result["exams"]] == [1, 2]
+    assert result["exams"][1]["average_score"] == pytest.approx(80)
+
+def test_student_performance_uses_each_exams_pass_mark(analytics_service, test_db_session, sample_course):
+    student = User(name="Ada", email="ada@example.com", password="secret")
+    test_db_session.add(student)
+    add_student_grades(test_db_session, student, sample_course, "CS101-P1", [60])
+    strict = add_student_grades(test_db_session, student, sample_course, "CS101-P2", [60])
+    strict.pass_mark = 70.0
+    test_db_session.commit()
+
+    results = analytics_service.student_performance_per_course(
+        student.id, datetime(2025, 9, 1), datetime(2025, 12, 20)
+    )
+
+    status = {r["exam_id"]: r["status"] for r in results}
+    assert status[strict.id] == "failed"
+    assert sorted(status.values()) == ["failed", "passed"]
+
+def test_student_progress_uses_only_the_students_submissions(analytics_service, test_db_session, sample_course):
+    student = User(name="Ada", email="ada@example.com", password="secret")
+    classmate = User(name="Bob", email="bob@example.com", password="secret")
+    test_db_session.add_all([student, classmate])
+    later_course = add_semester_course(test_db_session, sample_course, "CS201", "Semester 2", datetime(2026, 1, 10))
+    other_course = add_semester_course(test_db_session, sample_course, "CS202", "Semester 3", datetime(2026, 5, 1))
+    add_student_grades(test_db_session, student, sample_course, "CS101-P1", [40, 60])
+    add_student_grades(test_db_session, classmate, sample_course, "CS101-P2", [100])
+    add_student_grades(test_db_session, student, later_course, "CS201-P1", [80])
+    add_student_grades(test_db_session, student, other_course, "CS202-P1", [60])
+
+    progress = analytics_service.student_progress(student.id)
+
+    assert progress["total_semesters"] == 3
+    first, second, _ = progress["semester_breakdown"]
+    assert first["average_score"] == 50
+    assert first["courses"][0]["course_name"] == "Programming I"
+    assert second["average_score"] == 80
+    assert [t["change"] for t in progress["gpa_trend"]] == [None, 30, -20]
+    assert progress["improvement_rate"] == pytest.approx(20)
+    assert progress["weakest_course"]["course_name"] == "Programming I"
+
+def test_student_progress_keeps_same_named_semesters_apart(analytics_service, test_db_session, sample_course):
+    student = User(name="Ada", email="ada@example.com", password="secret")
+    test_db_session.add(student)
+    next_year = add_semester_course(test_db_session, sample_course, "CS301", "Semester 1", datetime(2026, 9, 1))
+    add_student_grades(test_db_session, student, sample_course, "CS101-P1", [50])
+    add_student_grades(test_db_session, student, next_year, "CS301-P1", [70])
+
+    progress = analytics_service.student_progress(student.id)
+
+    assert progress["total_semesters"] == 2
+    assert [s["average_score"] for s in progress["semester_breakdown"]] == [50, 70]
+    assert [t["change"] for t in progress["gpa_trend"]] == [None, 20]
+
+def test_student_progress_without_grades(analytics_service):
+    with pytest.raises(NotFoundError):
+        analytics_service.student_progress(uuid.uuid4())
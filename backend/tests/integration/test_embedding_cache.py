@@ -0,0 +1,40 @@
+import os
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy.orm import sessionmaker
+from src.db.models import EmbeddingCacheEntry
+from src.utils.embedding_cache import DatabaseEmbeddingStore
+from tests.conftest import test_db_session
+
+# on_conflict upserts and pgvector columns are Postgres features
+pytestmark = pytest.mark.skipif(
+    not os.getenv("TEST_DATABASE_URL", "").startswith("postgresql"),
+    reason="the embedding cache table needs a Postgres TEST_DATABASE_URL",
+)
+
+def entries(start, count, created_at):
+    return [
+        {"key": f"key-{i}", "model": "m", "input_type": "search_document",
+         "embedding": [0.0] * 1536, "created_at": created_at + timedelta(seconds=i)}
+        for i in range(start, start + count)
+    ]
+
+def test_row_cap_holds_under_writes(test_db_session):
+    factory = sessionmaker(bind=test_db_session.get_bind())
+    store = DatabaseEmbeddingStore(factory, max_rows=5, purge_every=3)
+    now = datetime(2026, 1, 1)
+
+    for batch in range(4):
+        store.set_many(entries(batch * 3, 3, now))
+
+    keys = {key for (key,) in test_db_session.query(EmbeddingCacheEntry.key)}
+    assert len(keys) <= 5
+    assert "key-11" in keys
+
+def test_purge_drops_expired_rows(test_db_session):
+    factory = sessionmaker(bind=test_db_session.get_bind())
+    store = DatabaseEmbeddingStore(factory, ttl_seconds=60, purge_every=1000)
+    store.set_many(entries(0, 2, datetime(2000, 1, 1)))
+
+    assert store.purge() == 2
+    assert test_db_session.query(EmbeddingCacheEntry).count() == 0
@@ -123,8 +123,8 @@ def test_list_exams(exam_service, test_db_session):
     math_exams = exam_service.list_exams(subject="Math")
     end_of_sem_exams = exam_service.list_exams(title="End of Semester Exam")
     assert math_exams is not None
-    assert len(math_exams) == 3
-    assert len(end_of_sem_exams) == 5
+    assert len(math_exams["items"]) == 3
+    assert len(end_of_sem_exams["items"]) == 5
 
 def test_update_exam(exam_service, test_db_session):
     course_semester = instantiate_course_semester(test_db_session)
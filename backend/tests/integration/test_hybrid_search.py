@@ -0,0 +1,51 @@
+import os
+import pytest
+from src.db.models import Question, QuestionType
+from src.services.question import QuestionService
+from src.utils.embeddings import LocalEmbeddingBackend, set_embedding_backend
+from tests.conftest import test_db_session
+
+# tsvector, pgvector and FULL OUTER JOIN fusion are Postgres features
+pytestmark = pytest.mark.skipif(
+    not os.getenv("TEST_DATABASE_URL", "").startswith("postgresql"),
+    reason="hybrid search needs a Postgres TEST_DATABASE_URL",
+)
+
+QUERY = "database normalization"
+
+@pytest.fixture
+def backend():
+    backend = LocalEmbeddingBackend()
+    set_embedding_backend(backend)
+    return backend
+
+def test_rows_ranked_by_both_signals_come_first(test_db_session, backend):
+    query_vector = backend.embed([QUERY], "search_query")[0]
+    both = Question(text="Explain database normalization up to 3NF", type=QuestionType.ESSAY,
+                    embedding=query_vector)
+    keyword_only = Question(text="Why does normalization reduce database anomalies?", type=QuestionType.ESSAY,
+                            embedding=backend.embed(["unrelated"], "search_document")[0])
+    semantic_only = Question(text="Describe the relational model", type=QuestionType.ESSAY,
+                             embedding=[v * 0.99 for v in query_vector])
+    test_db_session.add_all([both, keyword_only, semantic_only])
+    test_db_session.commit()
+
+    results = QuestionService(test_db_session).hybrid_search(QUERY, top_n=2)
+
+    assert len(results) == 2
+    assert results[0]["id"] == both.id
+    assert results[0]["keyword_rank"] == 1 and results[0]["semantic_rank"] == 1
+    assert results[0]["score"] == pytest.approx(0.6 / 61 + 0.4 / 61)
+    assert results[0]["score"] >= results[1]["score"]
+
+def test_semantic_only_rows_are_still_returned(test_db_session, backend):
+    query_vector = backend.embed([QUERY], "search_query")[0]
+    semantic_only = Question(text="Describe the relational model", type=QuestionType.ESSAY,
+                             embedding=query_vector)
+    test_db_session.add(semantic_only)
+    test_db_session.commit()
+
+    results = QuestionService(test_db_session).hybrid_search(QUERY, top_n=5)
+
+    assert [r["id"] for r in results] == [semantic_only.id]
+    assert results[0]["keyword_rank"] is None
@@ -0,0 +1,58 @@
+import os
+import uuid
+import pytest
+from datetime import datetime
+from src.db.models.models import Answer, Exam, GradeLog, Question, QuestionType, Submission, SubmissionAnswer
+from src.services.gradelog import GradeLogService
+from src.services.item_analysis import ItemAnalysisService, item_analysis_cache
+from tests.conftest import test_db_session
+
+# the grade version comes from the rollup upserts, which use ON CONFLICT
+pytestmark = pytest.mark.skipif(
+    not os.getenv("TEST_DATABASE_URL", "").startswith("postgresql"),
+    reason="item analysis needs a Postgres TEST_DATABASE_URL",
+)
+
+@pytest.fixture
+def mcq_exam(test_db_session):
+    item_analysis_cache.clear()
+    exam = Exam(exam_code="PHY-1", title="Mechanics", duration=30)
+    question = Question(exam=exam, text="Unit of force?", type=QuestionType.MCQ)
+    test_db_session.add_all([exam, question, Answer(question=question, options=["N", "J", "W"], correct_option="N")])
+    test_db_session.flush()
+    for score, picked in [(90, "N"), (80, "N"), (30, "J")]:
+        submission = Submission(exam=exam, submitted_at=datetime(2025, 10, 1))
+        test_db_session.add_all([
+            submission,
+            SubmissionAnswer(submission=submission, question_id=question.id,
+                             answer=f'{{"option":"{picked}"}}', is_correct=picked == "N"),
+        ])
+        test_db_session.flush()
+        GradeLogService(test_db_session).create_grade_log(submission.id, score, uuid.uuid4())
+    return exam, question
+
+def test_analysis_of_a_choice_question(test_db_session, mcq_exam):
+    exam, question = mcq_exam
+
+    analysis = ItemAnalysisService(test_db_session).exam_item_analysis(exam.id)
+
+    assert analysis["submissions"] == 3
+    item = analysis["items"][0]
+    assert item["question_id"] == question.id
+    assert item["facility"] == pytest.approx(2 / 3, abs=1e-4)
+    assert item["discrimination"] > 0
+    counts = {o["option"]: o["count"] for o in item["options"]}
+    assert counts == {"N": 2, "J": 1, "W": 0, "other": 0}
+    assert sum(b["count"] for b in analysis["score_distribution"]) == 3
+
+def test_grade_write_invalidates_cached_analysis(test_db_session, mcq_exam):
+    exam, _ = mcq_exam
+    service = ItemAnalysisService(test_db_session)
+    assert service.exam_item_analysis(exam.id)["submissions"] == 3
+
+    submission = Submission(exam=exam, submitted_at=datetime(2025, 10, 2))
+    test_db_session.add(submission)
+    test_db_session.flush()
+    GradeLogService(test_db_session).create_grade_log(submission.id, 50, uuid.uuid4())
+
+    assert service.exam_item_analysis(exam.id)["submissions"] == 4
@@ -0,0 +1,50 @@
+import os
+import json
+import uuid
+import pytest
+from sqlalchemy import text
+from tests.conftest import test_db_session
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("TEST_DATABASE_URL", "").startswith("postgresql"),
+    reason="query plans need a Postgres TEST_DATABASE_URL",
+)
+
+HOT_QUERIES = [
+    (
+        "ix_submission_exam_id_submitted_at",
+        "SELECT * FROM submission WHERE exam_id = :id ORDER BY submitted_at, id LIMIT 25",
+    ),
+    ("ix_submission_user_id", "SELECT * FROM submission WHERE user_id = :id"),
+    ("ix_submission_candidate_session_id", "SELECT id FROM submission WHERE candidate_session_id = :id"),
+    ("ix_gradelog_submission_id", "SELECT * FROM gradelog WHERE submission_id = :id"),
+    ("ix_question_exam_id", "SELECT * FROM question WHERE exam_id = :id"),
+    ("ix_submission_answer_question_id", "SELECT * FROM submission_answer WHERE question_id = :id"),
+    (
+        "ix_candidate_exam_session_exam_id_candidate_ref",
+        "SELECT id FROM candidate_exam_session WHERE exam_id = :id AND candidate_ref = 'ref-1' LIMIT 1",
+    ),
+    (
+        "ix_candidate_exam_session_status_ends_at",
+        "SELECT id FROM candidate_exam_session WHERE status = 'IN_PROGRESS' AND ends_at < now() ORDER BY ends_at",
+    ),
+]
+
+
+def plan_indexes(node: dict) -> set[str]:
+    found = {node["Index Name"]} if "Index Name" in node else set()
+    for child in node.get("Plans", []):
+        found |= plan_indexes(child)
+    return found
+
+
+@pytest.mark.parametrize("index_name, sql", HOT_QUERIES, ids=[name for name, _ in HOT_QUERIES])
+def test_hot_query_uses_index(test_db_session, index_name, sql):
+    # empty test tables would otherwise always plan a sequential scan
+    test_db_session.execute(text("SET LOCAL enable_seqscan = off"))
+    raw = test_db_session.execute(
+        text(f"EXPLAIN (FORMAT JSON) {sql}"), {"id": uuid.uuid4()}
+    ).scalar()
+    plan = raw if isinstance(raw, list) else json.loads(raw)
+
+    assert index_name in plan_indexes(plan[0]["Plan"])
@@ -192,7 +192,7 @@ def test_get_questions_by_tags(question_service, test_db_session, sample_questio
 
 
 def test_list_questions_with_filters(question_service, sample_question):
-    results = question_service.list_questions(tags=["geography"], difficulty="easy")
+    results = question_service.list_questions(tags=["geography"], difficulty="easy")["items"]
     assert len(results) >= 1
     assert results[0].difficulty == "easy"
 
@@ -211,6 +211,34 @@ def test_update_question(question_service, test_db_session, sample_question):
     assert updated.type == QuestionType.TRUE_FALSE
 
 
+def test_tag_facets_count_questions_per_tag(question_service, test_db_session):
+    test_db_session.add_all([
+        Question(text="Capital of Ghana?", type=QuestionType.MCQ, difficulty="easy", tags=["facets", "africa"]),
+        Question(text="Capital of Kenya?", type=QuestionType.MCQ, difficulty="easy", tags=["facets", "africa"]),
+        Question(text="Capital of Peru?", type=QuestionType.MCQ, difficulty="easy", tags=["facets", "americas"]),
+        Question(text="Capital of Chile?", type=QuestionType.MCQ, difficulty="hard", tags=["facets", "americas"]),
+    ])
+    test_db_session.commit()
+
+    facets = question_service.tag_facets(tags=["facets"], difficulty="easy")
+
+    assert facets == [
+        {"tag": "facets", "count": 3},
+        {"tag": "africa", "count": 2},
+        {"tag": "americas", "count": 1},
+    ]
+
+
+def test_tag_facets_refresh_after_tags_change(question_service, sample_question):
+    before = {f["tag"]: f["count"] for f in question_service.tag_facets(tags=["geography"])}
+    assert "capitals" not in before
+
+    question_service.update_question(sample_question.id, tags=["capitals"])
+
+    after = {f["tag"]: f["count"] for f in question_service.tag_facets(tags=["geography"])}
+    assert after["capitals"] == 1
+
+
 def test_delete_question(question_service, test_db_session, sample_question):
     deleted = question_service.delete_question(sample_question.id)
     assert deleted is True
@@ -2,8 +2,8 @@ import pytest
 from src.services.submission import SubmissionService
 from src.services.user import UserService
 from src.services.question import QuestionService
-from src.utils.exceptions import ServiceError, NotFoundError
-from src.db.models import Submission, SubmissionAnswer, QuestionType, Exam, UserType
+from src.utils.exceptions import ServiceError, NotFoundError, ValidationError
+from src.db.models import Submission, SubmissionAnswer, Question, QuestionType, Exam, UserType
 from tests.conftest import test_db_session
 
 @pytest.fixture
@@ -142,14 +142,14 @@ def test_get_submission_not_found(submission_service):
 
 
 def test_list_exam_submissions_basic(submission_service, sample_submission):
-    results = submission_service.list_exam_submissions_basic(exam_id=sample_submission.exam_id)
+    results = submission_service.list_exam_submissions_basic(exam_id=sample_submission.exam_id)["items"]
     assert any(sub["submission_id"] == sample_submission.id for sub in results)
     assert "user_id" in results[0]
     assert "submitted_at" in results[0]
 
 
 def test_list_exam_submissions_detailed(submission_service, sample_submission):
-    results = submission_service.list_exam_submissions_detailed(exam_id=sample_submission.exam_id)
+    results = submission_service.list_exam_submissions_detailed(exam_id=sample_submission.exam_id)["items"]
     assert isinstance(results, list)
     assert all("submission_id" in r for r in results)
     assert all("exam_id" in r for r in results)
@@ -173,3 +173,41 @@ def test_list_exam_submissions_detailed_error(monkeypatch, submission_service):
 
     with pytest.raises(ServiceError):
         submission_service.list_exam_submissions_detailed(exam_id="0488cf2b-adab-453a-88c6-d622db8656c2")
+
+
+@pytest.fixture
+def exam_questions(test_db_session, sample_exam):
+    questions = [
+        Question(text=f"Question {i}", tags=["physics"], type=QuestionType.ESSAY, exam_id=sample_exam.id)
+        for i in range(3)
+    ]
+    test_db_session.add_all(questions)
+    test_db_session.commit()
+    return questions
+
+
+def test_add_answers_bulk(submission_service, sample_submission, exam_questions):
+    saved = submission_service.add_answers(
+        sample_submission.id,
+        [(q.id, f"Answer {i}") for i, q in enumerate(exam_questions)] + [(exam_questions[0].id, "Revised")],
+    )
+    assert saved == 3
+
+    answers = {
+        a.question_id: a.answer
+        for a in submission_service.db.query(SubmissionAnswer).filter_by(submission_id=sample_submission.id)
+    }
+    assert answers[exam_questions[0].id] == "Revised"
+    assert answers[exam_questions[2].id] == "Answer 2"
+
+
+def test_add_answers_rejects_questions_outside_exam(submission_service, sample_submission, sample_question):
+    with pytest.raises(ValidationError):
+        submission_service.add_answers(sample_submission.id, [(sample_question.id, "Wrong exam")])
+
+
+def test_add_answers_nonexistent_submission(submission_service, exam_questions):
+    with pytest.raises(NotFoundError):
+        submission_service.add_answers(
+            "0488cf2b-adab-453a-88c6-d622db8656c2", [(exam_questions[0].id, "No submission")]
+        )
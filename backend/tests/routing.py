@@ -0,0 +1,25 @@
+import importlib.util
+from pathlib import Path
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.db.async_database import get_async_db
+from src.db.database import get_db
+
+V1 = Path(__file__).resolve().parents[1] / "src" / "api" / "v1"
+
+
+def load_router_module(name):
+    """Load one router module on its own rather than through src.api.v1, which imports every router."""
+    spec = importlib.util.spec_from_file_location(f"src.api.v1.{name}", V1 / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def client_for(router) -> TestClient:
+    """A TestClient for one router, with the database dependencies stubbed out."""
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db] = lambda: None
+    app.dependency_overrides[get_async_db] = lambda: None
+    return TestClient(app)
@@ -0,0 +1,56 @@
+import asyncio
+import pytest
+from src.services.admission import AdmissionController, TokenBucket
+from src.utils.exceptions import AdmissionRejected
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_bucket_allows_burst_then_spaces_reservations():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=2, clock=clock)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1)
+    assert bucket.reserve() == pytest.approx(0.2)
+    assert bucket.queued() == 2
+
+    clock.now = 1.0
+    assert bucket.delay() == 0
+    assert bucket.queued() == 0
+
+def test_controller_queues_then_rejects_with_position():
+    clock = FakeClock()
+    waits = []
+
+    async def sleep(seconds):
+        waits.append(seconds)
+
+    controller = AdmissionController(rate=10, burst=1, max_queue=2, max_wait=60, clock=clock, sleep=sleep)
+
+    async def run():
+        for _ in range(3):
+            await controller.admit("exam")
+        await controller.admit("exam")
+
+    with pytest.raises(AdmissionRejected) as exc:
+        asyncio.run(run())
+
+    assert waits == [pytest.approx(0.1), pytest.approx(0.2)]
+    assert exc.value.position == 3
+    assert exc.value.retry_after == pytest.approx(0.3)
+
+def test_controller_keeps_separate_buckets_per_exam():
+    clock = FakeClock()
+    controller = AdmissionController(rate=1, burst=1, max_queue=0, max_wait=0, clock=clock)
+
+    asyncio.run(controller.admit("first"))
+    asyncio.run(controller.admit("second"))
+
+    with pytest.raises(AdmissionRejected):
+        asyncio.run(controller.admit("first"))
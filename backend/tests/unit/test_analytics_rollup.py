@@ -0,0 +1,40 @@
+import math
+import pytest
+from types import SimpleNamespace
+from src.services.analytics_rollup import score_deltas, summarize
+
+def rollup(scores, pass_mark=40.0):
+    totals = {"graded_count": 0, "pass_count": 0, "score_sum": 0.0, "score_sq_sum": 0.0}
+    for score in scores:
+        for key, delta in score_deltas(None, score, pass_mark).items():
+            totals[key] += delta
+    return SimpleNamespace(**totals)
+
+def test_new_grade_adds_its_contribution():
+    assert score_deltas(None, 50, 40) == {"graded_count": 1, "pass_count": 1, "score_sum": 50.0, "score_sq_sum": 2500.0}
+
+def test_regrade_moves_pass_count_without_changing_graded_count():
+    deltas = score_deltas(50, 30, 40)
+
+    assert deltas["graded_count"] == 0
+    assert deltas["pass_count"] == -1
+    assert deltas["score_sum"] == -20
+
+def test_removed_grade_reverses_its_contribution():
+    assert score_deltas(70, None, 40) == {"graded_count": -1, "pass_count": -1, "score_sum": -70.0, "score_sq_sum": -4900.0}
+
+def test_summarize_matches_direct_statistics():
+    scores = [30, 50, 70, 90]
+    summary = summarize(rollup(scores, pass_mark=50))
+
+    mean = sum(scores) / len(scores)
+    stddev = math.sqrt(sum((s - mean) ** 2 for s in scores) / (len(scores) - 1))
+    assert summary["graded"] == 4
+    assert summary["average_score"] == pytest.approx(mean)
+    assert summary["stddev_score"] == pytest.approx(stddev)
+    assert summary["pass_count"] == 3
+    assert summary["pass_rate"] == pytest.approx(75)
+
+def test_summarize_empty_rollup():
+    assert summarize(None)["graded"] == 0
+    assert summarize(rollup([60]))["stddev_score"] is None
@@ -0,0 +1,221 @@
+import asyncio
+import uuid
+import pytest
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from src.db.models import ExamStatus
+from src.schemas.candidate_exam import AnswerInput
+from src.services.autosave import AutosaveBuffer
+from src.services.candidate_exam import AsyncCandidateExamService
+from src.services.exam_paper import build_paper, exam_paper_cache
+from src.services.session_state import SessionState
+from src.utils.exceptions import ServiceError, ValidationError
+
+class RecordingWriter:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    async def __call__(self, rows):
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        self.batches.append(rows)
+
+def test_repeated_answers_are_coalesced_into_one_row():
+    writer = RecordingWriter()
+    buffer = AutosaveBuffer(write=writer, max_pending=100)
+    submission_id, question_id = uuid.uuid4(), uuid.uuid4()
+
+    async def run():
+        for i in range(5):
+            await buffer.add(submission_id, {question_id: f"draft {i}"})
+        return await buffer.flush()
+
+    assert asyncio.run(run()) == 1
+    assert writer.batches == [[{"submission_id": submission_id, "question_id": question_id, "answer": "draft 4"}]]
+
+def test_size_threshold_triggers_flush():
+    writer = RecordingWriter()
+    buffer = AutosaveBuffer(write=writer, max_pending=3)
+    submission_id = uuid.uuid4()
+
+    async def run():
+        await buffer.add(submission_id, {uuid.uuid4(): "a" for _ in range(3)})
+        assert writer.batches == []  # the request does not wait for the write
+        await buffer.stop()
+
+    asyncio.run(run())
+
+    assert len(writer.batches) == 1
+    assert len(writer.batches[0]) == 3
+    assert len(buffer) == 0
+
+def test_flush_for_one_submission_leaves_others_pending():
+    writer = RecordingWriter()
+    buffer = AutosaveBuffer(write=writer, max_pending=100)
+    first, second = uuid.uuid4(), uuid.uuid4()
+
+    async def run():
+        await buffer.add(first, {uuid.uuid4(): "a"})
+        await buffer.add(second, {uuid.uuid4(): "b"})
+        return await buffer.flush(first)
+
+    assert asyncio.run(run()) == 1
+    assert writer.batches[0][0]["submission_id"] == first
+    assert len(buffer) == 1
+
+def test_failed_flush_keeps_answers_pending():
+    writer = RecordingWriter(fail=True)
+    buffer = AutosaveBuffer(write=writer, max_pending=100)
+
+    asyncio.run(buffer.add(uuid.uuid4(), {uuid.uuid4(): "a"}))
+    with pytest.raises(ServiceError):
+        asyncio.run(buffer.flush())
+
+    assert len(buffer) == 1
+
+class RejectingWriter(RecordingWriter):
+    """Fails any batch containing a row for one of the `bad` question ids, like a foreign key violation."""
+
+    def __init__(self, bad):
+        super().__init__()
+        self.bad = set(bad)
+
+    async def __call__(self, rows):
+        if any(row["question_id"] in self.bad for row in rows):
+            raise IntegrityError("INSERT INTO submission_answer", {}, Exception("foreign key violation"))
+        self.batches.append(rows)
+
+def test_all_submissions_go_out_in_one_statement():
+    writer = RecordingWriter()
+    buffer = AutosaveBuffer(write=writer, max_pending=100)
+
+    async def run():
+        for _ in range(3):
+            await buffer.add(uuid.uuid4(), {uuid.uuid4(): "a", uuid.uuid4(): "b"})
+        return await buffer.flush()
+
+    assert asyncio.run(run()) == 6
+    assert [len(batch) for batch in writer.batches] == [6]
+
+def test_large_flushes_are_chunked():
+    writer = RecordingWriter()
+    buffer = AutosaveBuffer(write=writer, max_pending=100, chunk_size=4)
+
+    async def run():
+        await buffer.add(uuid.uuid4(), {uuid.uuid4(): "a" for _ in range(10)})
+        return await buffer.flush()
+
+    assert asyncio.run(run()) == 10
+    assert [len(batch) for batch in writer.batches] == [4, 4, 2]
+
+def test_rejected_rows_are_dropped_and_the_rest_written():
+    bad = uuid.uuid4()
+    writer = RejectingWriter([bad])
+    buffer = AutosaveBuffer(write=writer, max_pending=100)
+    first, second = uuid.uuid4(), uuid.uuid4()
+
+    async def run():
+        await buffer.add(first, {bad: "a", uuid.uuid4(): "b"})
+        await buffer.add(second, {uuid.uuid4(): "c"})
+        return await buffer.flush()
+
+    assert asyncio.run(run()) == 2
+    written = [row for batch in writer.batches for row in batch]
+    assert len(written) == 2
+    assert bad not in {row["question_id"] for row in written}
+    assert len(buffer) == 0
+
+def test_failed_size_triggered_flush_does_not_fail_the_autosave():
+    buffer = AutosaveBuffer(write=RecordingWriter(fail=True), max_pending=2)
+
+    async def run():
+        await buffer.add(uuid.uuid4(), {uuid.uuid4(): "a", uuid.uuid4(): "b"})
+        with pytest.raises(ServiceError):
+            await buffer.stop()
+
+    asyncio.run(run())
+
+    assert len(buffer) == 2
+
+class BlockingWriter(RecordingWriter):
+    def __init__(self):
+        super().__init__()
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def __call__(self, rows):
+        self.started.set()
+        await self.release.wait()
+        self.batches.append(rows)
+
+def test_take_waits_for_its_submissions_in_flight_write():
+    submission_id, question_id = uuid.uuid4(), uuid.uuid4()
+
+    async def run():
+        writer = BlockingWriter()
+        buffer = AutosaveBuffer(write=writer, max_pending=100)
+        await buffer.add(submission_id, {question_id: "old"})
+        flush = asyncio.create_task(buffer.flush())
+        await writer.started.wait()
+
+        await buffer.add(submission_id, {question_id: "new"})
+        take = asyncio.create_task(buffer.take(submission_id))
+        await asyncio.sleep(0)
+        assert not take.done()
+
+        writer.release.set()
+        await flush
+        return await take
+
+    assert asyncio.run(run()) == {question_id: "new"}
+
+def test_take_does_not_wait_for_other_submissions():
+    submission_id, question_id = uuid.uuid4(), uuid.uuid4()
+
+    async def run():
+        writer = BlockingWriter()
+        buffer = AutosaveBuffer(write=writer, max_pending=100)
+        await buffer.add(uuid.uuid4(), {uuid.uuid4(): "a"})
+        flush = asyncio.create_task(buffer.flush())
+        await writer.started.wait()
+
+        await buffer.add(submission_id, {question_id: "b"})
+        taken = await asyncio.wait_for(buffer.take(submission_id), timeout=1)
+        writer.release.set()
+        await flush
+        return taken
+
+    assert asyncio.run(run()) == {question_id: "b"}
+
+def test_take_removes_one_submissions_answers():
+    buffer = AutosaveBuffer(write=RecordingWriter(), max_pending=100)
+    first, second, question_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    async def run():
+        await buffer.add(first, {question_id: "a"})
+        await buffer.add(second, {uuid.uuid4(): "b"})
+        return await buffer.take(first)
+
+    assert asyncio.run(run()) == {question_id: "a"}
+    assert len(buffer) == 1
+
+    buffer.restore(first, {question_id: "a"})
+    assert len(buffer) == 2
+
+def test_autosave_rejects_questions_from_another_exam():
+    exam_id = uuid.uuid4()
+    question_id = uuid.uuid4()
+    exam_paper_cache.set(exam_id, exam_paper_cache.version(exam_id), build_paper([
+        {"id": question_id, "type": "essay", "prompt": "Why?", "options": None, "required": True}
+    ]))
+    buffer = AutosaveBuffer(write=RecordingWriter(), max_pending=100)
+    service = AsyncCandidateExamService(db=None, logger=None, buffer=buffer)
+    state = SessionState(uuid.uuid4(), exam_id, uuid.uuid4(), ExamStatus.IN_PROGRESS, datetime(2030, 1, 1))
+
+    with pytest.raises(ValidationError):
+        asyncio.run(service.autosave(state, [AnswerInput(question_id=uuid.uuid4(), payload={"text": "x"})]))
+    assert len(buffer) == 0
+
+    asyncio.run(service.autosave(state, [AnswerInput(question_id=question_id, payload={"text": "x"})]))
+    assert len(buffer) == 1
@@ -0,0 +1,116 @@
+import pytest
+from src.utils.cache import TTLCache
+from src.utils.embedding_cache import DatabaseEmbeddingStore, EmbeddingCache, embedding_cache_key
+from src.utils.embeddings import EmbeddingBackend, EmbeddingClient
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class DictStore:
+    def __init__(self):
+        self.rows = {}
+
+    def get_many(self, keys):
+        return {k: self.rows[k] for k in keys if k in self.rows}
+
+    def set_many(self, entries):
+        for entry in entries:
+            self.rows[entry["key"]] = entry["embedding"]
+
+class CountingBackend(EmbeddingBackend):
+    model = "counting"
+    batch_limit = 10
+
+    def __init__(self):
+        self.embedded = []
+
+    def embed(self, texts, input_type):
+        self.embedded.extend(texts)
+        return [[float(len(text))] for text in texts]
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+def test_ttl_cache_expires_entries():
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl=5, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 4
+    assert cache.get("a") == 1
+    clock.now = 6
+    assert cache.get("a") is None
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+def test_cache_key_normalizes_text_but_not_model_or_input_type():
+    key = embedding_cache_key("m", "search_query", "Normal  Form ")
+    assert key == embedding_cache_key("m", "search_query", "normal form")
+    assert key != embedding_cache_key("m", "search_document", "normal form")
+    assert key != embedding_cache_key("other", "search_query", "normal form")
+
+def test_repeated_queries_skip_the_backend():
+    backend = CountingBackend()
+    client = EmbeddingClient(backend, cache=EmbeddingCache(max_size=10))
+
+    client.embed(["recursion", "normal form"])
+    client.embed(["Recursion", "recursion", "joins"])
+
+    assert backend.embedded == ["recursion", "normal form", "joins"]
+    stats = client.cache.stats()
+    assert stats["memory_hits"] == 2
+    assert stats["misses"] == 3
+
+def test_persistent_tier_backfills_memory():
+    store = DictStore()
+    warm = EmbeddingClient(CountingBackend(), cache=EmbeddingCache(store=store))
+    warm.embed(["recursion"])
+
+    backend = CountingBackend()
+    cold = EmbeddingClient(backend, cache=EmbeddingCache(store=store))
+    assert cold.embed(["recursion"]) == [[9.0]]
+    assert cold.embed(["recursion"]) == [[9.0]]
+
+    assert backend.embedded == []
+    assert cold.cache.stats()["store_hits"] == 1
+    assert cold.cache.stats()["memory_hits"] == 1
+
+def test_database_store_purges_after_enough_writes():
+    class PurgeCountingStore(DatabaseEmbeddingStore):
+        def __init__(self):
+            super().__init__(session_factory=None, max_rows=10, purge_every=5)
+            self.purges = 0
+
+        def purge(self):
+            self.purges += 1
+            return 0
+
+    class NullSession:
+        def execute(self, stmt): pass
+        def commit(self): pass
+        def rollback(self): pass
+        def close(self): pass
+
+    store = PurgeCountingStore()
+    store.session_factory = NullSession
+    entry = {"key": "k", "model": "m", "input_type": "search_query", "embedding": [0.0], "created_at": None}
+    for _ in range(4):
+        store.set_many([entry])
+    assert store.purges == 0
+
+    store.set_many([entry])
+    store.set_many([entry] * 6)
+    assert store.purges == 2
@@ -0,0 +1,83 @@
+import pytest
+import sqlalchemy.ext.asyncio
+from src.db import base
+from src.db.base import create_async_db_engine, create_db_engine, database_url, engine_options
+
+DIRECT = "postgresql+psycopg://u:p@db.example.com:5432/exams"
+POOLER = "postgresql+psycopg://u:p@pooler.example.com:6543/exams"
+
+@pytest.fixture
+def settings(monkeypatch):
+    for name, value in {
+        "DATABASE_URL": DIRECT, "DATABASE_POOLER_URL": POOLER, "DB_USE_POOLER": False,
+        "DB_POOLER_MODE": "transaction", "DB_POOL_SIZE": 7, "DB_MAX_OVERFLOW": 3,
+        "DB_POOL_TIMEOUT": 11, "DB_POOL_RECYCLE": 600, "DB_ECHO": False,
+    }.items():
+        monkeypatch.setattr(base.settings, name, value)
+    return base.settings
+
+class RecordingFactory:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, url, **options):
+        self.calls.append((url, options))
+        return object()
+
+def test_pooler_url_is_chosen_by_flag(settings, monkeypatch):
+    assert database_url() == DIRECT
+    assert database_url(use_pooler=True) == POOLER
+
+    monkeypatch.setattr(settings, "DB_USE_POOLER", True)
+    assert database_url() == POOLER
+
+def test_pool_settings_are_passed_through(settings):
+    options = engine_options(DIRECT)
+
+    assert options == {
+        "echo": False, "pool_size": 7, "max_overflow": 3, "pool_timeout": 11, "pool_recycle": 600,
+        "pool_pre_ping": True,
+    }
+
+def test_echo_follows_db_echo(settings, monkeypatch):
+    monkeypatch.setattr(settings, "DB_ECHO", True)
+
+    assert engine_options(DIRECT)["echo"] is True
+    assert engine_options("sqlite:///:memory:") == {"echo": True}
+
+def test_transaction_pooler_disables_psycopg_prepared_statements(settings):
+    assert engine_options(POOLER, use_pooler=True)["connect_args"] == {"prepare_threshold": None}
+    assert "connect_args" not in engine_options(DIRECT, use_pooler=False)
+
+def test_transaction_pooler_disables_asyncpg_statement_caches(settings):
+    options = engine_options("postgresql+asyncpg://u:p@pooler.example.com:6543/exams", use_pooler=True)
+
+    assert options["connect_args"] == {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+
+def test_session_pooler_keeps_prepared_statements(settings, monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOLER_MODE", "session")
+
+    assert "connect_args" not in engine_options(POOLER, use_pooler=True)
+
+def test_create_db_engine_uses_pooler_url_and_options(settings, monkeypatch):
+    factory = RecordingFactory()
+    monkeypatch.setattr(base, "create_engine", factory)
+
+    create_db_engine(use_pooler=True)
+
+    (url, options), = factory.calls
+    assert url == POOLER
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"] == {"prepare_threshold": None}
+
+def test_async_engine_merges_ssl_with_pooler_connect_args(settings, monkeypatch):
+    factory = RecordingFactory()
+    monkeypatch.setattr(sqlalchemy.ext.asyncio, "create_async_engine", factory)
+    monkeypatch.setattr(settings, "DATABASE_POOLER_URL", "postgresql://u:p@pooler.example.com:6543/exams?sslmode=require")
+
+    create_async_db_engine(use_pooler=True)
+
+    (url, options), = factory.calls
+    assert url == "postgresql+asyncpg://u:p@pooler.example.com:6543/exams"
+    assert options["connect_args"] == {"statement_cache_size": 0, "prepared_statement_cache_size": 0, "ssl": "require"}
+    assert options["pool_size"] == 7
@@ -0,0 +1,81 @@
+import pytest
+from src.utils.embeddings import (
+    EmbeddingBackend, EmbeddingClient, LocalEmbeddingBackend, EMBEDDING_DIMENSION
+)
+
+class CountingBackend(EmbeddingBackend):
+    model = "counting"
+    batch_limit = 3
+
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, texts, input_type):
+        self.calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+@pytest.fixture
+def local_backend():
+    return LocalEmbeddingBackend()
+
+def test_local_backend_is_deterministic(local_backend):
+    first = local_backend.embed(["recursion"], "search_document")[0]
+    second = local_backend.embed(["recursion"], "search_document")[0]
+    other = local_backend.embed(["normal form"], "search_document")[0]
+
+    assert first == second
+    assert first != other
+    assert len(first) == EMBEDDING_DIMENSION
+    assert sum(v * v for v in first) == pytest.approx(1.0)
+
+def test_client_packs_texts_into_provider_batches():
+    backend = CountingBackend()
+    client = EmbeddingClient(backend, max_concurrency=1)
+
+    texts = ["a", "bb", "ccc", "dddd", "eeeee", "ffffff", "g"]
+    vectors = client.embed(texts)
+
+    assert [len(call) for call in backend.calls] == [3, 3, 1]
+    assert vectors == [[float(len(text))] for text in texts]
+
+def test_client_preserves_order_with_concurrent_batches():
+    backend = CountingBackend()
+    client = EmbeddingClient(backend, max_concurrency=4)
+
+    texts = [str(i) * (i + 1) for i in range(10)]
+    vectors = client.embed(texts)
+
+    assert len(backend.calls) == 4
+    assert vectors == [[float(len(text))] for text in texts]
+
+def test_client_skips_backend_for_empty_input():
+    backend = CountingBackend()
+    client = EmbeddingClient(backend)
+
+    assert client.embed([]) == []
+    assert backend.calls == []
+
+def test_query_and_document_roles_use_separate_cache_namespaces():
+    from src.utils.embedding_cache import EmbeddingCache
+    from src.utils.embeddings import EmbeddingRole
+
+    backend = CountingBackend()
+    client = EmbeddingClient(backend, cache=EmbeddingCache(max_size=10))
+
+    client.embed(["recursion"], EmbeddingRole.DOCUMENT)
+    client.embed(["recursion"], EmbeddingRole.QUERY)
+    client.embed(["recursion"], EmbeddingRole.QUERY)
+
+    assert len(backend.calls) == 2
+
+def test_unknown_input_type_is_rejected():
+    client = EmbeddingClient(CountingBackend())
+    with pytest.raises(ValueError):
+        client.embed(["recursion"], "classification")
+
+def test_backend_without_embed_cannot_be_created():
+    class Incomplete(EmbeddingBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
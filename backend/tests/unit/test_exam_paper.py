@@ -0,0 +1,63 @@
+import asyncio
+import json
+import uuid
+import pytest
+from pydantic import ValidationError
+from src.services.exam_paper import ExamPaperCache, build_paper
+
+def make_questions(prompt="What is inertia?"):
+    return [{"id": uuid.uuid4(), "type": "essay", "prompt": prompt, "options": None, "required": True}]
+
+def test_concurrent_requests_load_the_paper_once():
+    cache = ExamPaperCache()
+    exam_id = uuid.uuid4()
+    questions = make_questions()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return questions
+
+    async def run():
+        return await asyncio.gather(*[cache.get_or_load(exam_id, load) for _ in range(50)])
+
+    papers = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert len({p.etag for p in papers}) == 1
+    assert json.loads(papers[0].body)[0]["prompt"] == "What is inertia?"
+
+def test_invalidate_forces_reload_with_new_etag():
+    cache = ExamPaperCache()
+    exam_id = uuid.uuid4()
+    prompts = iter(["First", "Second"])
+
+    async def load():
+        return make_questions(next(prompts))
+
+    first = asyncio.run(cache.get_or_load(exam_id, load))
+    cache.invalidate(exam_id)
+    second = asyncio.run(cache.get_or_load(exam_id, load))
+
+    assert first.etag != second.etag
+    assert cache.get(exam_id) is second
+
+def test_paper_loaded_before_invalidation_is_not_cached():
+    cache = ExamPaperCache()
+    exam_id = uuid.uuid4()
+
+    async def load():
+        cache.invalidate(exam_id)  # paper changes while the query is in flight
+        return make_questions()
+
+    asyncio.run(cache.get_or_load(exam_id, load))
+
+    assert cache.get(exam_id) is None
+
+def test_paper_is_validated_against_the_schema():
+    paper = build_paper(make_questions())
+
+    assert json.loads(paper.body)[0]["type"] == "essay"
+    with pytest.raises(ValidationError):
+        build_paper([{**make_questions()[0], "type": None}])
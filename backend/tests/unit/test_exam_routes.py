@@ -0,0 +1,143 @@
+import uuid
+import pytest
+from src.utils.exceptions import NotFoundError
+from tests.routing import client_for, load_router_module
+
+exam_routes = load_router_module("exam")
+MISSING = uuid.uuid4()
+
+class FakeAnalyticsService:
+    def __init__(self, db):
+        pass
+
+    def exam_statistics(self, exam_id):
+        if exam_id == MISSING:
+            raise NotFoundError("Exam not found")
+        return {
+            "exam_id": exam_id, "exam_title": "Midterm", "submissions": 4, "graded": 3,
+            "average_score": 60.0, "median_score": 55.0, "stddev_score": 10.0, "min_score": 50.0,
+            "max_score": 75.0, "pass_mark": 50.0, "pass_count": 3, "pass_rate": 100.0,
+            "percentiles": {"p25": 52.5, "p50": 55.0, "p75": 65.0, "p90": 71.0},
+        }
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(exam_routes, "AnalyticsService", FakeAnalyticsService)
+    return client_for(exam_routes.ExamRouter().router)
+
+def test_exam_stats_include_distribution_fields(client):
+    exam_id = uuid.uuid4()
+
+    response = client.get(f"/api/v1/exam/{exam_id}/stats")
+
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["exam_id"] == str(exam_id)
+    assert (stats["median_score"], stats["stddev_score"], stats["pass_mark"]) == (55.0, 10.0, 50.0)
+    assert stats["percentiles"]["p90"] == 71.0
+
+def test_exam_stats_of_unknown_exam_is_not_found(client):
+    assert client.get(f"/api/v1/exam/{MISSING}/stats").status_code == 404
+
+class FakeRollupService:
+    def __init__(self, db):
+        pass
+
+    def exam_summary(self, exam_id):
+        if exam_id == MISSING:
+            raise NotFoundError("Exam not found")
+        return {"exam_id": exam_id, "graded": 3, "average_score": 60.0, "stddev_score": 10.0,
+                "pass_count": 2, "pass_rate": 66.7}
+
+def test_exam_summary_reads_the_rollup(client, monkeypatch):
+    monkeypatch.setattr(exam_routes, "AnalyticsRollupService", FakeRollupService)
+    exam_id = uuid.uuid4()
+
+    response = client.get(f"/api/v1/exam/{exam_id}/summary")
+
+    assert response.status_code == 200
+    assert response.json() == {"exam_id": str(exam_id), "graded": 3, "average_score": 60.0,
+                               "stddev_score": 10.0, "pass_count": 2, "pass_rate": 66.7}
+
+def test_exam_summary_of_unknown_exam_is_not_found(client, monkeypatch):
+    monkeypatch.setattr(exam_routes, "AnalyticsRollupService", FakeRollupService)
+
+    assert client.get(f"/api/v1/exam/{MISSING}/summary").status_code == 404
+
+class FakeItemAnalysisService:
+    def __init__(self, db):
+        pass
+
+    def exam_item_analysis(self, exam_id):
+        if exam_id == MISSING:
+            raise NotFoundError("Exam not found")
+        return {
+            "exam_id": exam_id, "submissions": 3, "average_score": 66.7, "stddev_score": 32.1,
+            "score_distribution": [{"min_score": 90.0, "max_score": 100.0, "count": 1}],
+            "items": [{
+                "question_id": uuid.uuid4(), "question": "Unit of force?", "type": "mcq", "responses": 3,
+                "facility": 0.6667, "discrimination": 0.98,
+                "options": [{"option": "N", "count": 2, "mean_score": 85.0},
+                            {"option": "other", "count": 0, "mean_score": None}],
+            }],
+        }
+
+def test_item_analysis_route(client, monkeypatch):
+    monkeypatch.setattr(exam_routes, "ItemAnalysisService", FakeItemAnalysisService)
+
+    response = client.get(f"/api/v1/exam/{uuid.uuid4()}/item-analysis")
+
+    assert response.status_code == 200
+    item = response.json()["items"][0]
+    assert item["facility"] == 0.6667
+    assert item["options"][1] == {"option": "other", "count": 0, "mean_score": None}
+
+def test_item_analysis_of_unknown_exam_is_not_found(client, monkeypatch):
+    monkeypatch.setattr(exam_routes, "ItemAnalysisService", FakeItemAnalysisService)
+
+    assert client.get(f"/api/v1/exam/{MISSING}/item-analysis").status_code == 404
+
+class FakeExportService:
+    def __init__(self, db):
+        pass
+
+    def export_statement(self, exam_id=None, fmt="csv"):
+        if exam_id == MISSING:
+            raise NotFoundError("Exam not found")
+        return ("statement", exam_id, fmt)
+
+@pytest.fixture
+def export_client(client, monkeypatch):
+    streamed = []
+
+    def fake_stream(statement, fmt="csv"):
+        streamed.append(statement)
+        yield b"submission_id,score\n"
+        yield b"1,50.0\n"
+
+    monkeypatch.setattr(exam_routes, "GradeExportService", FakeExportService)
+    monkeypatch.setattr(exam_routes, "stream_export", fake_stream)
+    client.streamed = streamed
+    return client
+
+def test_export_streams_exam_grades(export_client):
+    exam_id = uuid.uuid4()
+
+    response = export_client.get(f"/api/v1/exam/{exam_id}/grades/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == f'attachment; filename="grades-{exam_id}.csv"'
+    assert response.content == b"submission_id,score\n1,50.0\n"
+    assert export_client.streamed == [("statement", exam_id, "csv")]
+
+def test_export_of_unknown_exam_is_not_found(export_client):
+    response = export_client.get(f"/api/v1/exam/{MISSING}/grades/export")
+
+    assert response.status_code == 404
+    assert export_client.streamed == []
+
+def test_exam_export_rejects_unknown_format(export_client):
+    response = export_client.get(f"/api/v1/exam/{uuid.uuid4()}/grades/export", params={"format": "xlsx"})
+
+    assert response.status_code == 422
@@ -0,0 +1,44 @@
+import csv
+import io
+import uuid
+import pytest
+from datetime import datetime
+from src.services.grade_export import EXPORT_COLUMNS, csv_chunks, parquet_chunks
+
+def make_row(i, user=True):
+    return (
+        uuid.uuid4(), uuid.uuid4(), "CS101-A", "Midterm", uuid.uuid4() if user else None,
+        f"Student {i}" if user else None, f"s{i}@example.com" if user else None,
+        datetime(2025, 10, 1, 9, i), 50.0 + i, uuid.uuid4(), datetime(2025, 10, 2),
+    )
+
+def batches(sizes):
+    for size in sizes:
+        yield [make_row(i, user=i % 2 == 0) for i in range(size)]
+
+def test_csv_export_writes_header_then_one_chunk_per_batch():
+    chunks = list(csv_chunks(batches([3, 2])))
+
+    assert len(chunks) == 2
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+    assert rows[0] == list(EXPORT_COLUMNS)
+    assert len(rows) == 6
+    assert rows[2][5] == ""
+
+def test_csv_export_without_rows_still_has_header():
+    rows = list(csv.reader(io.StringIO(b"".join(csv_chunks(iter([]))).decode())))
+
+    assert rows == [list(EXPORT_COLUMNS)]
+
+def test_parquet_export_streams_a_readable_file():
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    chunks = list(parquet_chunks(batches([4, 3])))
+
+    assert len(chunks) >= 2
+    parquet = pq.ParquetFile(io.BytesIO(b"".join(chunks)))
+    assert parquet.metadata.num_row_groups == 2
+    table = parquet.read()
+    assert table.num_rows == 7
+    assert table.column_names == list(EXPORT_COLUMNS)
+    assert table.column("score").to_pylist()[:2] == [50.0, 51.0]
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from src.utils.exceptions import ValidationError
+from src.utils.grading import DEFAULT_GRADING_SCALE, GradingScale, grade_cohorts
+
+def test_band_uses_lower_bound_inclusive_boundaries():
+    scores = np.array([0, 39.9, 40, 55, 60, 69.99, 70, 100])
+
+    assert DEFAULT_GRADING_SCALE.band(scores).tolist() == ["F", "F", "D", "C", "B", "B", "A", "A"]
+
+def test_gpa_maps_scores_to_points():
+    assert DEFAULT_GRADING_SCALE.gpa([45, 50, 75, 85, 95]).tolist() == [0.0, 1.0, 3.0, 3.7, 4.0]
+
+def test_scalar_scores_are_accepted():
+    assert DEFAULT_GRADING_SCALE.band(72.5).item() == "A"
+
+def test_cumulative_gpa_is_weighted():
+    assert DEFAULT_GRADING_SCALE.cumulative_gpa([95, 55], weights=[3, 1]) == pytest.approx(3.25)
+    assert DEFAULT_GRADING_SCALE.cumulative_gpa([]) == 0.0
+
+def test_scale_round_trips_through_dict():
+    scale = GradingScale.from_dict(DEFAULT_GRADING_SCALE.to_dict())
+
+    scores = np.linspace(0, 100, 201)
+    assert scale.band(scores).tolist() == DEFAULT_GRADING_SCALE.band(scores).tolist()
+    assert scale.gpa(scores).tolist() == DEFAULT_GRADING_SCALE.gpa(scores).tolist()
+
+def test_invalid_scales_are_rejected():
+    with pytest.raises(ValidationError):
+        GradingScale((50, 40), ("F", "P", "D"), (50,), (0.0, 4.0))
+    with pytest.raises(ValidationError):
+        GradingScale((50,), ("F", "P", "D"), (50,), (0.0, 4.0))
+    with pytest.raises(ValidationError):
+        GradingScale.from_dict({"grades": []})
+
+def test_grade_cohorts_applies_each_programs_scale():
+    strict = GradingScale((50,), ("Fail", "Pass"), (50,), (0.0, 4.0))
+    grades, gpa = grade_cohorts([45, 45, 80], ["default", "strict", "strict"], {"strict": strict})
+
+    assert grades.tolist() == ["D", "Fail", "Pass"]
+    assert gpa.tolist() == [0.0, 0.0, 4.0]
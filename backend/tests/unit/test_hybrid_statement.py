@@ -0,0 +1,88 @@
+import asyncio
+import re
+import pytest
+from sqlalchemy.dialects import postgresql
+from src.services import question
+from src.services.question import AsyncQuestionService, QuestionService
+from src.services.vector_index import MAX_EF_SEARCH
+
+@pytest.fixture
+def service():
+    return QuestionService(db_session=None)
+
+def build(service, top_n=5, **kwargs):
+    return service._hybrid_statement("normal form", [0.5, -1.0], kwargs.get("difficulty"),
+                                     kwargs.get("tags"), top_n, kwargs.get("weights"))
+
+@pytest.mark.parametrize("top_n, candidates", [(1, 20), (5, 20), (6, 24), (50, 200)])
+def test_candidate_pool_is_at_least_four_times_top_n(service, top_n, candidates):
+    _, params = build(service, top_n)
+
+    assert params["candidates"] == candidates
+    assert params["limit"] == top_n
+
+def test_fusion_uses_rrf_constant_and_weights(service):
+    sql, params = build(service, weights={"text": 0.7, "semantic": 0.3})
+
+    assert params["rrf_k"] == 60
+    assert (params["text_weight"], params["semantic_weight"]) == (0.7, 0.3)
+    assert params["embedding"] == "[0.5,-1.0]"
+    assert "CAST(:text_weight AS float8) / (CAST(:rrf_k AS integer) + k.keyword_rank)" in sql.text
+    assert "CAST(:semantic_weight AS float8) / (CAST(:rrf_k AS integer) + s.semantic_rank)" in sql.text
+    assert "FULL OUTER JOIN semantic s ON s.id = k.id" in sql.text
+
+def test_results_are_ordered_by_fused_score_and_limited(service):
+    sql, _ = build(service)
+
+    tail = " ".join(sql.text.split()).rsplit("FROM fused f", 1)[1]
+    assert tail.strip().endswith("ORDER BY f.score DESC LIMIT :limit")
+    assert len(re.findall(r"LIMIT :candidates", sql.text)) == 2
+
+def test_filters_apply_to_both_candidate_lists(service):
+    sql, params = build(service, difficulty="easy", tags=["sql"])
+
+    assert sql.text.count("AND difficulty = :difficulty") == 2
+    assert sql.text.count("AND tags @> (:tags)::jsonb") == 2
+    assert params["tags"] == '["sql"]'
+
+def test_statement_compiles_for_postgres(service):
+    sql, params = build(service)
+    compiled = sql.bindparams(**params).compile(dialect=postgresql.dialect())
+
+    assert set(params) <= set(compiled.params)
+
+class RecordingSession:
+    def __init__(self):
+        self.calls = []
+
+    def execute(self, statement, params=None):
+        self.calls.append(params)
+        return self
+
+    def fetchall(self):
+        return []
+
+class AsyncRecordingSession(RecordingSession):
+    async def execute(self, statement, params=None):
+        return super().execute(statement, params)
+
+@pytest.mark.parametrize("recall", ["fast", "balanced", "accurate"])
+@pytest.mark.parametrize("top_n", [5, 30, 240])
+def test_ef_search_covers_the_semantic_candidate_pool(monkeypatch, recall, top_n):
+    monkeypatch.setattr(question, "generate_query_embedding", lambda query: [0.5, -1.0])
+    db = RecordingSession()
+
+    QuestionService(db_session=db).hybrid_search("normal form", top_n=top_n, recall=recall)
+
+    settings, params = db.calls
+    assert int(settings["ef_search"]) >= min(params["candidates"], MAX_EF_SEARCH)
+
+def test_async_ef_search_covers_the_semantic_candidate_pool(monkeypatch):
+    monkeypatch.setattr(question, "generate_query_embedding", lambda query: [0.5, -1.0])
+    db = AsyncRecordingSession()
+
+    asyncio.run(AsyncQuestionService(db).hybrid_search("normal form", top_n=30, recall="balanced"))
+
+    settings, params = db.calls
+    assert params["candidates"] == 120
+    assert settings["ef_search"] == "120"
@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, event
+from sqlalchemy.orm import Session, declarative_base
+from src.utils.identity_loader import IdentityLoader
+
+Base = declarative_base()
+
+class Thing(Base):
+    __tablename__ = "thing"
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+class Other(Base):
+    __tablename__ = "other"
+    id = Column(Integer, primary_key=True)
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all([Thing(id=i, name=f"thing {i}") for i in range(1, 6)] + [Other(id=1)])
+        session.commit()
+        session.statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: session.statements.append(args[2]))
+        yield session
+
+def test_primed_ids_resolve_in_one_query(db):
+    loader = IdentityLoader(db)
+    loader.prime(Thing, [1, 2])
+    loader.prime(Thing, [3, None])
+
+    assert loader.get(Thing, 1).name == "thing 1"
+    assert loader.get(Thing, 3).name == "thing 3"
+    assert len(db.statements) == 1
+
+def test_results_and_misses_are_cached(db):
+    loader = IdentityLoader(db)
+
+    things = loader.get_many(Thing, [2, 2, 99])
+    assert things[2].name == "thing 2"
+    assert things[99] is None
+    loader.get_many(Thing, [2, 99])
+    assert len(db.statements) == 1
+
+def test_one_query_per_model_and_chunk(db):
+    loader = IdentityLoader(db, chunk_size=2)
+    loader.prime(Thing, range(1, 6))
+    loader.prime(Other, [1])
+
+    loader.resolve_all()
+
+    assert len(db.statements) == 4
+    assert loader.get(Other, 1) is not None
+    assert len(db.statements) == 4
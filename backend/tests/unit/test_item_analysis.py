@@ -0,0 +1,81 @@
+import uuid
+import numpy as np
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from src.db.models import Exam
+from src.services.item_analysis import (
+    ItemAnalysisService, chosen_options, item_analysis_cache, item_statistics, option_labels, option_statistics,
+)
+
+def test_item_statistics_match_dense_correlation():
+    rng = np.random.default_rng(7)
+    correct_matrix = rng.random((40, 5)) < 0.6
+    scores = correct_matrix.sum(axis=1) * 20 + rng.normal(0, 5, 40)
+    submission_index, question_index = np.nonzero(np.ones_like(correct_matrix))
+    # drop some answers entirely; unanswered questions count as incorrect
+    keep = rng.random(len(submission_index)) < 0.9
+    correct = correct_matrix[submission_index, question_index] & keep
+    stats = item_statistics(scores, submission_index[keep], question_index[keep], correct[keep], 5)
+
+    dense = np.zeros((40, 5))
+    dense[submission_index[keep & correct], question_index[keep & correct]] = 1
+    assert stats["facility"] == pytest.approx(dense.mean(axis=0))
+    expected = [np.corrcoef(dense[:, j], scores)[0, 1] for j in range(5)]
+    assert stats["discrimination"] == pytest.approx(expected)
+    assert stats["responses"].tolist() == np.bincount(question_index[keep], minlength=5).tolist()
+
+def test_item_everyone_got_right_has_no_discrimination():
+    stats = item_statistics(np.array([10.0, 90.0]), np.array([0, 1]), np.array([0, 0]), np.array([True, True]), 2)
+
+    assert stats["facility"].tolist() == [1.0, 0.0]
+    assert np.isnan(stats["discrimination"]).all()
+
+def test_item_statistics_without_submissions():
+    stats = item_statistics(np.array([]), np.array([], dtype=int), np.array([], dtype=int), np.array([], dtype=bool), 3)
+
+    assert stats["responses"].tolist() == [0, 0, 0]
+    assert np.isnan(stats["facility"]).all()
+
+def test_option_statistics_counts_and_mean_scores():
+    counts, means = option_statistics(
+        np.array([0, 0, 0, 1]), np.array([0, 1, 1, 2]), np.array([80.0, 40.0, 60.0, 10.0]), 2, 3
+    )
+
+    assert counts.tolist() == [[1, 2, 0], [0, 0, 1]]
+    assert means[0, 1] == pytest.approx(50)
+    assert np.isnan(means[0, 2])
+
+def test_option_parsing():
+    assert option_labels(["A", "B"]) == ["A", "B"]
+    assert option_labels({"a": "Paris", "b": "Rome"}) == ["a", "b"]
+    assert option_labels([{"id": "x", "text": "X"}]) == ["x"]
+    assert chosen_options('{"option":"B"}') == ["B"]
+    assert chosen_options('{"selected":["A","C"]}') == ["A", "C"]
+    assert chosen_options("C") == ["C"]
+    assert chosen_options(None) == []
+
+class FakeSession:
+    def __init__(self, rollup):
+        self.rollup = rollup
+
+    def get(self, model, key):
+        if model is Exam:
+            return object()
+        return self.rollup
+
+def test_analysis_is_cached_per_grade_version(monkeypatch):
+    item_analysis_cache.clear()
+    db = FakeSession(SimpleNamespace(graded_count=3, updated_at=datetime(2025, 10, 1)))
+    service = ItemAnalysisService(db)
+    runs = []
+    monkeypatch.setattr(service, "_analyse", lambda exam_id: runs.append(exam_id) or {"run": len(runs)})
+    exam_id = uuid.uuid4()
+
+    assert service.exam_item_analysis(exam_id) == {"run": 1}
+    assert service.exam_item_analysis(exam_id) == {"run": 1}
+
+    # a grade write bumps the exam's rollup, which changes the cache key
+    db.rollup = SimpleNamespace(graded_count=4, updated_at=datetime(2025, 10, 2))
+    assert service.exam_item_analysis(exam_id) == {"run": 2}
+    assert runs == [exam_id, exam_id]
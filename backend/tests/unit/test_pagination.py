@@ -0,0 +1,72 @@
+import uuid
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, Column, Integer, String, DateTime
+from sqlalchemy.orm import declarative_base, sessionmaker
+from src.utils.exceptions import ValidationError
+from src.utils.pagination import encode_cursor, decode_cursor, paginate
+
+Base = declarative_base()
+
+class Row(Base):
+    __tablename__ = "row"
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    created_at = Column(DateTime)
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    sess = sessionmaker(bind=engine)()
+    start = datetime(2025, 1, 1)
+    # pairs of rows share a timestamp so the id tie-breaker matters
+    sess.add_all([Row(id=i, name=f"row {i}", created_at=start + timedelta(days=i // 2)) for i in range(1, 11)])
+    sess.commit()
+    yield sess
+    sess.close()
+
+def collect_pages(session, limit, descending=False):
+    pages, cursor = [], None
+    while True:
+        items, cursor = paginate(session.query(Row), [Row.created_at, Row.id], limit, cursor, descending)
+        pages.append([row.id for row in items])
+        if cursor is None:
+            return pages
+
+def test_cursor_round_trip_preserves_types():
+    values = [datetime(2025, 3, 1, 9, 30), uuid.uuid4(), 7, "x"]
+    assert decode_cursor(encode_cursor(values)) == values
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(ValidationError):
+        decode_cursor("not-a-cursor")
+    with pytest.raises(ValidationError):
+        decode_cursor(encode_cursor([1]), expected_length=2)
+
+def test_pages_cover_every_row_once(session):
+    pages = collect_pages(session, limit=3)
+    assert pages == [[1, 2, 3], [4, 5, 6], [7, 8, 9], [10]]
+
+def test_descending_pages(session):
+    pages = collect_pages(session, limit=4, descending=True)
+    assert pages == [[10, 9, 8, 7], [6, 5, 4, 3], [2, 1]]
+
+def test_exact_final_page_has_no_next_cursor(session):
+    items, cursor = paginate(session.query(Row), [Row.id], 10)
+    assert len(items) == 10
+    assert cursor is None
+
+@pytest.mark.parametrize("payload", [{"a": 1, "b": 2}, "ab", [None, 1], [{"x": 1}, 1], [[1], 2], [True, 1]])
+def test_malformed_cursor_payloads_are_rejected(payload):
+    import base64, json
+    cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    with pytest.raises(ValidationError):
+        decode_cursor(cursor, expected_length=2)
+
+def test_cursor_values_must_match_column_types(session):
+    with pytest.raises(ValidationError):
+        paginate(session.query(Row), [Row.created_at, Row.id], 3, encode_cursor(["yesterday", 4]))
+    with pytest.raises(ValidationError):
+        paginate(session.query(Row), [Row.created_at, Row.id], 3, encode_cursor([datetime(2025, 1, 2), "4"]))
@@ -0,0 +1,54 @@
+import uuid
+import pytest
+from src.db.models import QuestionType
+from src.utils.exceptions import ValidationError
+from tests.routing import client_for, load_router_module
+
+question_routes = load_router_module("question")
+
+def make_question(**fields):
+    return {"id": uuid.uuid4(), "text": "What is inertia?", "tags": ["physics"], "type": QuestionType.ESSAY, **fields}
+
+class FakeQuestionService:
+    def __init__(self, db):
+        pass
+
+    def list_questions(self, limit=20, cursor=None):
+        if cursor == "bad":
+            raise ValidationError("Invalid pagination cursor")
+        return {"items": [make_question()], "next_cursor": "next"}
+
+    def tag_facets(self, tags=None, difficulty=None):
+        return [{"tag": "physics", "count": 3}]
+
+    def get_question_by_id(self, question_id):
+        return make_question(id=question_id)
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(question_routes, "QuestionService", FakeQuestionService)
+    return client_for(question_routes.QuestionRouter().router)
+
+def test_list_is_not_parsed_as_a_question_id(client):
+    response = client.get("/api/v1/question/all/", params={"limit": 10})
+
+    assert response.status_code == 200
+    assert response.json()["next_cursor"] == "next"
+    assert response.json()["items"][0]["type"] == "essay"
+
+def test_list_rejects_invalid_cursor(client):
+    assert client.get("/api/v1/question/all/", params={"cursor": "bad"}).status_code == 400
+
+def test_tag_facets_route(client):
+    response = client.get("/api/v1/question/tags/facets/", params={"tags": ["physics"]})
+
+    assert response.status_code == 200
+    assert response.json() == [{"tag": "physics", "count": 3}]
+
+def test_question_by_id_still_resolves(client):
+    question_id = uuid.uuid4()
+
+    response = client.get(f"/api/v1/question/{question_id}/")
+
+    assert response.status_code == 200
+    assert response.json()["id"] == str(question_id)
@@ -0,0 +1,53 @@
+import uuid
+import pytest
+from src.utils.exceptions import NotFoundError
+from tests.routing import client_for, load_router_module
+
+semester_routes = load_router_module("semester")
+MISSING = uuid.uuid4()
+
+class FakeExportService:
+    def __init__(self, db):
+        pass
+
+    def export_statement(self, semester_id=None, fmt="csv"):
+        if semester_id == MISSING:
+            raise NotFoundError("Semester not found")
+        return ("statement", semester_id, fmt)
+
+@pytest.fixture
+def client(monkeypatch):
+    streamed = []
+
+    def fake_stream(statement, fmt="csv"):
+        streamed.append(statement)
+        yield b"submission_id,score\n"
+        yield b"1,50.0\n"
+
+    monkeypatch.setattr(semester_routes, "GradeExportService", FakeExportService)
+    monkeypatch.setattr(semester_routes, "stream_export", fake_stream)
+    client = client_for(semester_routes.SemesterRouter().router)
+    client.streamed = streamed
+    return client
+
+def test_export_streams_semester_grades(client):
+    semester_id = uuid.uuid4()
+
+    response = client.get(f"/api/v1/semester/{semester_id}/grades/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == f'attachment; filename="grades-{semester_id}.csv"'
+    assert response.content == b"submission_id,score\n1,50.0\n"
+    assert client.streamed == [("statement", semester_id, "csv")]
+
+def test_export_of_unknown_semester_is_not_found(client):
+    response = client.get(f"/api/v1/semester/{MISSING}/grades/export")
+
+    assert response.status_code == 404
+    assert client.streamed == []
+
+def test_export_rejects_unknown_format(client):
+    response = client.get(f"/api/v1/semester/{uuid.uuid4()}/grades/export", params={"format": "xlsx"})
+
+    assert response.status_code == 422
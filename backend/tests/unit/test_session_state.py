@@ -0,0 +1,94 @@
+import asyncio
+import uuid
+import pytest
+from datetime import timedelta
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from src.db.models import ExamStatus
+from src.dependencies import candidate_session
+from src.services.candidate_exam import utcnow
+from src.services.session_state import (
+    InMemorySessionStateCache, RedisSessionStateCache, SessionState, SessionStateCache,
+)
+from src.utils.jwt_handler import JWTHandler
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value.encode() if isinstance(value, str) else value
+        self.expiry[key] = ex
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+class NoDatabase:
+    async def execute(self, *args, **kwargs):
+        raise AssertionError("cached session should not hit the database")
+
+def make_state(status=ExamStatus.IN_PROGRESS, minutes=30):
+    return SessionState(
+        session_id=uuid.uuid4(),
+        exam_id=uuid.uuid4(),
+        submission_id=uuid.uuid4(),
+        status=status,
+        ends_at=utcnow() + timedelta(minutes=minutes),
+    )
+
+def credentials_for(state):
+    token = JWTHandler().create_candidate_jwt(state.session_id, state.submission_id, state.exam_id)
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+@pytest.mark.parametrize("make_cache", [
+    lambda: InMemorySessionStateCache(ttl=30),
+    lambda: RedisSessionStateCache(FakeRedis(), ttl=30),
+])
+def test_cache_round_trip_and_invalidate(make_cache):
+    cache = make_cache()
+    state = make_state()
+
+    asyncio.run(cache.set(state))
+    assert asyncio.run(cache.get(state.session_id)) == state
+
+    asyncio.run(cache.delete(state.session_id))
+    assert asyncio.run(cache.get(state.session_id)) is None
+
+def test_redis_backend_sets_ttl():
+    client = FakeRedis()
+    state = make_state()
+    asyncio.run(RedisSessionStateCache(client, ttl=15).set(state))
+
+    assert client.expiry == {f"candidate_session:{state.session_id}": 15}
+
+def test_dependency_uses_cached_state_without_database(monkeypatch):
+    cache = InMemorySessionStateCache()
+    monkeypatch.setattr(candidate_session, "session_state_cache", cache)
+    state = make_state()
+    asyncio.run(cache.set(state))
+
+    result = asyncio.run(candidate_session.get_current_candidate_session(credentials_for(state), NoDatabase()))
+
+    assert result == state
+
+def test_dependency_rejects_submitted_session(monkeypatch):
+    cache = InMemorySessionStateCache()
+    monkeypatch.setattr(candidate_session, "session_state_cache", cache)
+    state = make_state(status=ExamStatus.SUBMITTED)
+    asyncio.run(cache.set(state))
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(candidate_session.get_current_candidate_session(credentials_for(state), NoDatabase()))
+    assert exc.value.status_code == 403
+
+def test_cache_backend_must_implement_every_method():
+    class GetOnly(SessionStateCache):
+        async def get(self, session_id):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnly()
@@ -0,0 +1,70 @@
+import asyncio
+import uuid
+from src.services import session_sweeper
+from src.services.session_sweeper import SessionSweeper
+from src.services.session_state import InMemorySessionStateCache
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+class FakeDatabase:
+    """Hands out `batches` of expired session ids, one per UPDATE ... RETURNING."""
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.commits = 0
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt):
+        if stmt.is_update and stmt.table.name == "candidate_exam_session":
+            return FakeResult(self.batches.pop(0) if self.batches else [])
+        if stmt.is_select:
+            return FakeResult([uuid.uuid4()])
+        return FakeResult([])
+
+    async def commit(self):
+        self.commits += 1
+
+class RecordingBuffer:
+    def __init__(self):
+        self.flushed = []
+
+    async def flush(self, *submission_ids):
+        self.flushed.append(submission_ids)
+        return 0
+
+def test_sweep_runs_batches_until_a_short_one(monkeypatch):
+    cache = InMemorySessionStateCache()
+    monkeypatch.setattr(session_sweeper, "session_state_cache", cache)
+    batches = [[uuid.uuid4(), uuid.uuid4()], [uuid.uuid4()]]
+    db = FakeDatabase(batches)
+    buffer = RecordingBuffer()
+
+    expired = asyncio.run(SessionSweeper(session_factory=db, buffer=buffer, batch_size=2).sweep())
+
+    assert expired == 3
+    assert db.commits == 2
+    assert len(buffer.flushed) == 2
+
+def test_sweep_with_nothing_overdue_does_no_writes():
+    db = FakeDatabase([])
+    buffer = RecordingBuffer()
+
+    assert asyncio.run(SessionSweeper(session_factory=db, buffer=buffer).sweep()) == 0
+    assert db.commits == 0
+    assert buffer.flushed == []
@@ -0,0 +1,68 @@
+import pytest
+from uuid import uuid4
+from types import SimpleNamespace
+from src.services.question import QuestionService, tag_facet_cache
+
+class FacetSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        self.statements.append((statement, params))
+        return [SimpleNamespace(tag=tag, count=count) for tag, count in self.rows]
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    tag_facet_cache.clear()
+
+def test_facets_are_aggregated_per_tag_in_one_query():
+    db = FacetSession([("algebra", 4), ("calculus", 2)])
+
+    facets = QuestionService(db).tag_facets(tags=["math"], difficulty="easy")
+
+    assert facets == [{"tag": "algebra", "count": 4}, {"tag": "calculus", "count": 2}]
+    (sql, params), = db.statements
+    assert "GROUP BY tag" in sql.text
+    assert params["difficulty"] == "easy"
+
+def test_repeat_requests_are_served_from_the_cache():
+    db = FacetSession([("algebra", 4)])
+    service = QuestionService(db)
+
+    first = service.tag_facets(tags=["math", "exam"])
+    second = service.tag_facets(tags=["exam", "math"])
+
+    assert first == second
+    assert len(db.statements) == 1
+
+def test_changing_a_questions_tags_invalidates_the_cache():
+    question = SimpleNamespace(tags=["math"], difficulty=None, type=None, exam_id=None)
+
+    class UpdateSession(FacetSession):
+        def query(self, model):
+            return self
+
+        def filter_by(self, **kwargs):
+            return self
+
+        def first(self):
+            return question
+
+        def add(self, obj):
+            pass
+
+        def commit(self):
+            self.rows = [("math", 1), ("algebra", 1)]
+
+        def refresh(self, obj):
+            pass
+
+    db = UpdateSession([("math", 1)])
+    service = QuestionService(db)
+    assert service.tag_facets() == [{"tag": "math", "count": 1}]
+
+    service.update_question(uuid4(), tags=["algebra"])
+
+    assert service.tag_facets() == [{"tag": "math", "count": 1}, {"tag": "algebra", "count": 1}]
+    assert len(db.statements) == 2
@@ -0,0 +1,26 @@
+import pytest
+from src.services.vector_index import MAX_EF_SEARCH, RECALL_PROFILES, recall_profile_params
+from src.utils.exceptions import ValidationError
+
+@pytest.mark.parametrize("recall", list(RECALL_PROFILES))
+def test_profiles_map_to_pgvector_settings(recall):
+    params = recall_profile_params(recall)
+
+    assert params == {
+        "ef_search": str(RECALL_PROFILES[recall]["ef_search"]),
+        "probes": str(RECALL_PROFILES[recall]["probes"]),
+    }
+
+def test_default_profile_is_balanced():
+    assert recall_profile_params(None) == recall_profile_params("balanced")
+
+def test_ef_search_covers_the_requested_limit():
+    assert recall_profile_params("fast", top_n=75)["ef_search"] == "75"
+    assert recall_profile_params("accurate", top_n=75)["ef_search"] == "400"
+
+def test_ef_search_is_capped_at_pgvector_maximum():
+    assert recall_profile_params("fast", top_n=5000)["ef_search"] == str(MAX_EF_SEARCH)
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValidationError):
+        recall_profile_params("exhaustive")